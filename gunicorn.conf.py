@@ -0,0 +1,124 @@
+"""
+gunicorn.conf.py
+
+Gunicorn settings, loaded automatically from the working directory.
+
+Workers and threads are sized from the container's CPU quota and memory
+limit (cgroup v2, then v1, then the host), not from the host's core count,
+so a 1-CPU / 512 MB container doesn't start a dozen workers. Every value
+can be pinned through the environment:
+
+    PORT                      listen port (default 8080)
+    SERVER_MODE               wsgi (gthread workers) or asgi (Uvicorn workers)
+    WEB_CONCURRENCY           worker processes
+    GUNICORN_THREADS          threads per worker (wsgi only)
+    GUNICORN_WORKER_MEMORY_MB memory budgeted per worker when sizing (default 150)
+    GUNICORN_MAX_REQUESTS     recycle a worker after this many requests (default 1000, 0 = never)
+    GUNICORN_TIMEOUT          seconds before a silent worker is killed (default 30)
+    FORWARDED_ALLOW_IPS       comma-separated proxy addresses whose X-Forwarded-*
+                              headers are trusted (default 127.0.0.1)
+"""
+import math
+import os
+
+# -----------------------------------------------------------------------------
+# Container limits
+# -----------------------------------------------------------------------------
+
+def _read(path):
+    try:
+        with open(path) as handle:
+            return handle.read().strip()
+    except OSError:
+        return None
+
+
+def cpu_limit():
+    """CPUs this process may use: the cgroup quota if there is one, else its affinity."""
+    available = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    quota, period = None, None
+    cpu_max = _read('/sys/fs/cgroup/cpu.max')  # v2: "<quota|max> <period>"
+    if cpu_max:
+        value, _, period = cpu_max.partition(' ')
+        quota = None if value == 'max' else value
+    else:  # v1
+        quota = _read('/sys/fs/cgroup/cpu/cpu.cfs_quota_us')
+        period = _read('/sys/fs/cgroup/cpu/cpu.cfs_period_us')
+    try:
+        if quota and int(quota) > 0:
+            return max(1, min(available, math.ceil(int(quota) / int(period))))
+    except (TypeError, ValueError, ZeroDivisionError):
+        pass
+    return available
+
+
+def memory_limit():
+    """Bytes this process may use: the cgroup limit if there is one, else physical memory."""
+    physical = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        value = _read(path)
+        # v2 reports "max" and v1 a huge number when unlimited
+        if value and value.isdigit() and int(value) < physical:
+            return int(value)
+    return physical
+
+
+# -----------------------------------------------------------------------------
+# Sizing
+# -----------------------------------------------------------------------------
+
+cpus = cpu_limit()
+worker_memory = int(os.environ.get('GUNICORN_WORKER_MEMORY_MB', 150)) * 1024 * 1024
+# The usual 2 x CPUs + 1, unless the memory limit can't hold that many workers
+workers = int(os.environ.get('WEB_CONCURRENCY') or max(1, min(2 * cpus + 1, memory_limit() // worker_memory)))
+
+if os.environ.get('SERVER_MODE', 'wsgi') == 'asgi':
+    # One event loop per worker serves many requests; threads don't apply
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    threads = 1
+else:
+    # Threads cover what memory took away from the worker count, so a
+    # request blocked on the database or SMTP doesn't idle a whole process
+    worker_class = 'gthread'
+    threads = int(os.environ.get('GUNICORN_THREADS') or min(8, max(2, math.ceil((4 * cpus + 2) / workers))))
+
+# -----------------------------------------------------------------------------
+# Server
+# -----------------------------------------------------------------------------
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+# Import Django and the app once in the master; workers share the pages copy-on-write
+preload_app = True
+# Recycle workers to cap slow leaks; jitter keeps them from restarting together
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = max(1, max_requests // 10)
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+# Heartbeat files on tmpfs: Docker's overlay /tmp can stall workers into timeouts
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+# The platform's proxy terminates TLS (see SECURE_PROXY_SSL_HEADER). Only its
+# forwarded headers may be trusted: with '*' any client that reaches the port
+# could pick its own address (Uvicorn workers take REMOTE_ADDR from
+# X-Forwarded-For) and dodge the rate limits. Set this to the proxy's address
+# or subnet, and keep the port reachable only through the proxy
+forwarded_allow_ips = os.environ.get('FORWARDED_ALLOW_IPS', '127.0.0.1')
+
+
+def pre_fork(server, worker):
+    # Workers must not inherit a socket the master opened
+    from django.db import connections
+    connections.close_all()
+
+
+def worker_exit(server, worker):
+    # Write buffered page/blog view counts before a recycled or stopped worker goes
+    from portfolio import analytics
+    analytics.flush_all()
+
+
+def on_starting(server):
+    server.log.info(
+        "Sizing for %s CPU(s), %d MB: %s worker(s) x %s thread(s), %s",
+        cpus, memory_limit() // (1024 * 1024), workers, threads, worker_class,
+    )
@@ -0,0 +1,219 @@
+"""
+portfolio/analytics.py
+
+Write-behind counters for PortfolioAnalytics and BlogPost.view_count.
+
+Hits are counted in process-local buffers and flushed as aggregated
+deltas once a buffer holds enough hits or enough time has passed, so
+requests never serialise on a hot row. Page views cost one UPDATE per
+date per flush and blog views one CASE UPDATE for all touched posts.
+Buffers are also flushed at interpreter exit so a graceful worker
+shutdown does not lose counts.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, When, F
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+
+from .db import primary_reads
+from .models import PortfolioAnalytics, BlogPost
+
+logger = logging.getLogger(__name__)
+
+VISITOR_COOKIE = 'pf_visit'
+
+
+class DeltaBuffer:
+    """Thread-safe in-memory counters keyed by date, id, etc."""
+
+    def __init__(self, apply, flush_size=100, flush_interval=30):
+        self.apply = apply
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = defaultdict(Counter)
+        self._hits = 0
+        self._last_flush = time.monotonic()
+
+    def _record(self, key, deltas):
+        """Buffer ``deltas``; True when a flush is due."""
+        with self._lock:
+            self._pending[key].update(deltas)
+            self._hits += 1
+            return (
+                self._hits >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+    def add(self, key, **deltas):
+        """Record deltas for ``key`` and flush if a threshold has been reached."""
+        if self._record(key, deltas):
+            self.flush()
+
+    async def aadd(self, key, **deltas):
+        """add() for async code: only a due flush leaves the event loop."""
+        if self._record(key, deltas):
+            await sync_to_async(self.flush)()
+
+    def flush(self):
+        """Apply all buffered deltas in one transaction, keeping them on failure."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(Counter)
+            self._hits = 0
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+
+        committed = False
+
+        def mark_committed():
+            nonlocal committed
+            committed = True
+
+        try:
+            # Flushes can run inside a replica_reads view; derived rows must be computed from the primary
+            with primary_reads(), transaction.atomic():
+                # Runs before the hooks apply() registers, so their errors can't pass for a failed write
+                transaction.on_commit(mark_committed)
+                self.apply(pending)
+        except Exception:
+            if committed:
+                # The deltas are stored; buffering them again would count them twice
+                logger.exception("Flushed %s buffered counters, but a post-commit hook failed", len(pending))
+                return
+            logger.exception("Could not flush %s buffered counters; keeping them", len(pending))
+            with self._lock:
+                for key, deltas in pending.items():
+                    self._pending[key].update(deltas)
+
+    def pending_for(self, key, field):
+        """Buffered (not yet persisted) delta of ``field`` for ``key``."""
+        with self._lock:
+            deltas = self._pending.get(key)
+            return deltas[field] if deltas else 0
+
+    def pending(self):
+        """Snapshot of the buffered deltas, for diagnostics."""
+        with self._lock:
+            return {key: dict(deltas) for key, deltas in self._pending.items()}
+
+
+def _apply_page_views(pending):
+    for date, deltas in pending.items():
+        PortfolioAnalytics.increment(date, **deltas)
+
+
+def _apply_blog_views(pending):
+    BlogPost.objects.filter(pk__in=pending).update(view_count=Case(
+        *[When(pk=pk, then=F('view_count') + deltas['view_count']) for pk, deltas in pending.items()],
+        default=F('view_count'),
+    ))
+
+
+page_views = DeltaBuffer(
+    _apply_page_views,
+    flush_size=getattr(settings, 'ANALYTICS_FLUSH_SIZE', 100),
+    flush_interval=getattr(settings, 'ANALYTICS_FLUSH_INTERVAL', 30),
+)
+blog_views = DeltaBuffer(
+    _apply_blog_views,
+    flush_size=getattr(settings, 'ANALYTICS_FLUSH_SIZE', 100),
+    flush_interval=getattr(settings, 'ANALYTICS_FLUSH_INTERVAL', 30),
+)
+
+
+def flush_all():
+    """Flush every counter buffer (used at exit and by server shutdown hooks)."""
+    page_views.flush()
+    blog_views.flush()
+
+
+atexit.register(flush_all)
+
+
+def counting_enabled():
+    """Analytics can be switched off, e.g. while pre-rendering pages."""
+    return getattr(settings, 'ANALYTICS_ENABLED', True)
+
+
+def record_blog_view(post_id):
+    """Count one view of a blog post without writing the row."""
+    if counting_enabled():
+        blog_views.add(post_id, view_count=1)
+
+
+async def arecord_blog_view(post_id):
+    if counting_enabled():
+        await blog_views.aadd(post_id, view_count=1)
+
+
+def live_view_count(post):
+    """Approximate live count: the persisted value plus this process's pending delta."""
+    return post.view_count + blog_views.pending_for(post.pk, 'view_count')
+
+
+class PageViewMiddleware:
+    """
+    Count successful public page views and daily unique visitors.
+
+    A visitor counts as unique once per day, tracked with a small cookie
+    holding the date of their last counted visit.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.excluded_prefixes = tuple(getattr(settings, 'ANALYTICS_EXCLUDED_PREFIXES', ()))
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.should_count(request, response):
+            is_new_visitor = self.is_new_visitor(request)
+            page_views.add(timezone.localdate(), page_views=1, unique_visitors=int(is_new_visitor))
+            if is_new_visitor:
+                self.set_visitor_cookie(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.should_count(request, response):
+            is_new_visitor = self.is_new_visitor(request)
+            await page_views.aadd(timezone.localdate(), page_views=1, unique_visitors=int(is_new_visitor))
+            if is_new_visitor:
+                self.set_visitor_cookie(request, response)
+        return response
+
+    def is_new_visitor(self, request):
+        return request.COOKIES.get(VISITOR_COOKIE) != timezone.localdate().isoformat()
+
+    def set_visitor_cookie(self, request, response):
+        response.set_cookie(
+            VISITOR_COOKIE, timezone.localdate().isoformat(), max_age=60 * 60 * 24,
+            httponly=True, samesite='Lax', secure=request.is_secure(),
+        )
+        # A shared cache must not store (and replay to everyone) a response carrying
+        # this visitor's cookie; their later, cookie-less responses stay public
+        if 'public' in response.get('Cache-Control', ''):
+            patch_cache_control(response, private=True)
+
+    def should_count(self, request, response):
+        return (
+            counting_enabled()
+            and request.method == 'GET'
+            and response.status_code in (200, 304)
+            and not request.path.startswith(self.excluded_prefixes)
+        )
@@ -0,0 +1,185 @@
+"""
+portfolio/api.py
+
+Read-only JSON content API (v1).
+
+    GET /api/v1/<resource>/?fields=title,slug&limit=25&cursor=...
+    GET /api/v1/<resource>/?format=ndjson        (or Accept: application/x-ndjson)
+
+``fields=`` is turned into ``.values()`` so columns that were not asked
+for (notably ``BlogPost.content``) are never loaded. Pages use keyset
+cursors and carry a strong ETag over the serialized body, so unchanged
+pages revalidate with a 304. NDJSON streams the whole collection through
+``.iterator()`` (``.aiterator()`` under ASGI, which would otherwise read a
+sync iterator to the end before sending anything) without building it in
+memory.
+"""
+import hashlib
+import json
+
+from django.core.files.storage import default_storage
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
+
+from .db import read_alias, replica_reads
+from .models import Project, Skill, Certification, BlogPost
+from .pagination import KeysetPaginator
+
+DEFAULT_LIMIT = 25
+MAX_LIMIT = 100
+STREAM_CHUNK_SIZE = 500
+
+
+class Resource:
+    """How one model is exposed: public rows, ordering and the fields clients may select."""
+
+    def __init__(self, model, ordering, fields, default_fields, queryset=None):
+        self.model = model
+        self.ordering = ordering
+        self.fields = fields
+        self.default_fields = default_fields
+        self._queryset = queryset
+
+    def get_queryset(self):
+        return self._queryset() if self._queryset else self.model.objects.all()
+
+    @property
+    def file_fields(self):
+        return {
+            field.name for field in self.model._meta.get_fields()
+            if isinstance(field, models.FileField)
+        }
+
+
+RESOURCES = {
+    'projects': Resource(
+        Project,
+        # The curated order of the public projects page
+        ordering=['display_order', '-created_at', 'pk'],
+        fields=['id', 'title', 'description', 'technologies', 'image', 'image_variants',
+                'github_link', 'live_demo_link', 'is_featured', 'status', 'display_order',
+                'created_at', 'updated_at'],
+        default_fields=['id', 'title', 'description', 'technologies', 'image',
+                        'github_link', 'live_demo_link', 'is_featured', 'created_at'],
+        queryset=lambda: Project.objects.filter(is_active=True),
+    ),
+    'skills': Resource(
+        Skill,
+        ordering=['category', 'name'],
+        fields=['id', 'name', 'category', 'proficiency', 'icon_class', 'is_featured',
+                'years_experience', 'last_used'],
+        default_fields=['id', 'name', 'category', 'proficiency', 'icon_class', 'years_experience'],
+    ),
+    'certifications': Resource(
+        Certification,
+        ordering=['-issue_date'],
+        fields=['id', 'title', 'issuing_organization', 'issue_date', 'expiry_date',
+                'credential_id', 'credential_url', 'is_verified', 'display_on_homepage'],
+        default_fields=['id', 'title', 'issuing_organization', 'issue_date', 'expiry_date',
+                        'credential_url'],
+    ),
+    'posts': Resource(
+        BlogPost,
+        ordering=['-published_date'],
+        fields=['id', 'title', 'slug', 'excerpt', 'content', 'content_html', 'content_toc',
+                'featured_image', 'featured_image_variants', 'is_featured', 'read_time',
+                'word_count', 'view_count', 'published_date', 'updated_at'],
+        # content and content_html are opt-in: they can be large and listings rarely need them
+        default_fields=['id', 'title', 'slug', 'excerpt', 'featured_image', 'read_time',
+                        'published_date'],
+        queryset=lambda: BlogPost.objects.filter(status='published'),
+    ),
+}
+
+
+def error(message, status=400):
+    return JsonResponse({'success': False, 'message': message}, status=status)
+
+
+def parse_fields(resource, raw):
+    """Validate ``fields=``; returns the selected field names or raises ValueError."""
+    if not raw:
+        return list(resource.default_fields)
+    fields = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in resource.fields]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return fields
+
+
+def serialize(row, fields, file_fields):
+    data = {}
+    for name in fields:
+        value = row[name]
+        if name in file_fields:
+            value = default_storage.url(value) if value else None
+        data[name] = value
+    return data
+
+
+async def aserialize_lines(queryset, fields, file_fields):
+    async for row in queryset.aiterator(chunk_size=STREAM_CHUNK_SIZE):
+        yield json.dumps(serialize(row, fields, file_fields), cls=DjangoJSONEncoder) + '\n'
+
+
+def wants_ndjson(request):
+    return (
+        request.GET.get('format') == 'ndjson'
+        or 'application/x-ndjson' in request.headers.get('Accept', '')
+    )
+
+
+@require_safe
+@replica_reads
+def collection_view(request, resource_name):
+    resource = RESOURCES.get(resource_name)
+    if resource is None:
+        return error('Unknown resource.', status=404)
+
+    try:
+        fields = parse_fields(resource, request.GET.get('fields'))
+    except ValueError as exc:
+        return error(str(exc))
+    try:
+        limit = max(1, min(int(request.GET.get('limit', DEFAULT_LIMIT)), MAX_LIMIT))
+    except ValueError:
+        return error('Invalid limit.')
+
+    # Sort keys are always selected so the cursor can be built from the row
+    paginator = KeysetPaginator(resource.get_queryset(), resource.ordering, per_page=limit)
+    selected = list(dict.fromkeys(fields + paginator.fields))
+    paginator.queryset = paginator.queryset.values(*selected)
+    file_fields = resource.file_fields
+    cursor = request.GET.get('cursor')
+
+    if wants_ndjson(request):
+        # The body is iterated after replica_reads has returned, so pin the alias now
+        rows = paginator.ordered_from(cursor).using(read_alias())
+        if isinstance(request, ASGIRequest):
+            lines = aserialize_lines(rows, fields, file_fields)
+        else:
+            lines = (
+                json.dumps(serialize(row, fields, file_fields), cls=DjangoJSONEncoder) + '\n'
+                for row in rows.iterator(chunk_size=STREAM_CHUNK_SIZE)
+            )
+        return StreamingHttpResponse(lines, content_type='application/x-ndjson')
+
+    page = paginator.page(cursor)
+    body = json.dumps({
+        'results': [serialize(row, fields, file_fields) for row in page],
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
+    }, cls=DjangoJSONEncoder).encode()
+
+    etag = quote_etag(hashlib.md5(body, usedforsecurity=False).hexdigest())
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    return response
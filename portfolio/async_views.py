@@ -0,0 +1,123 @@
+"""
+portfolio/async_views.py
+
+Async versions of the public pages, the contact form and the dashboard.
+
+They replace their views.py counterparts in the URLconf when
+PORTFOLIO_ASYNC_VIEWS is on, which is the default under ASGI (see
+portfolioproject/asgi.py). The rows a page lists are read with the async
+ORM before rendering, and blocking work (the contact form's validation and
+outbox transaction, the page-cache lookup) runs in a thread, so a slow
+database or mail queue holds a coroutine rather than a worker. Templates
+are rendered in a thread too: context processors still read the session,
+the user and SiteSettings synchronously.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.shortcuts import render
+
+from . import search
+from .analytics import arecord_blog_view
+from .caching import cached_public_page
+from .db import replica_reads
+from .models import Project, BlogPost
+from .ratelimit import rate_limit
+from .stats import aget_content_stats
+from .views import (
+    contact_rate_limited, contact_submission, dashboard_context, public_posts_paginator, public_projects_paginator,
+)
+
+
+async def arender(request, template_name, context=None):
+    return await sync_to_async(render)(request, template_name, context)
+
+
+async def aget_or_404(queryset, **lookup):
+    try:
+        return await queryset.aget(**lookup)
+    except queryset.model.DoesNotExist:
+        raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+
+
+# --- Main Page Views ---
+
+@replica_reads
+@cached_public_page
+async def home_view(request):
+    """The main landing page view (Hero and teasers)."""
+    return await arender(request, 'portfolio/index.html')
+
+
+@replica_reads
+@cached_public_page
+async def about_view(request):
+    """The dedicated About Me and Skills page."""
+    return await arender(request, 'portfolio/about.html')
+
+
+@replica_reads
+@cached_public_page
+async def projects_view(request):
+    """The dedicated Projects list page."""
+    page = await public_projects_paginator().page(request.GET.get('cursor')).aload()
+    return await arender(request, 'portfolio/projects.html', {'projects': page, 'page': page})
+
+
+@replica_reads
+@cached_public_page
+async def blogs_view(request):
+    """The dedicated Blogs index page."""
+    page = await public_posts_paginator().page(request.GET.get('cursor')).aload()
+    return await arender(request, 'portfolio/blogs.html', {'posts': page, 'page': page})
+
+
+@replica_reads
+async def search_view(request):
+    """Ranked, highlighted full-text search over blog posts and projects."""
+    query = request.GET.get('q', '').strip()[:200]
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 20)), 50))
+    except ValueError:
+        limit = 20
+
+    results = await sync_to_async(search.search)(query, limit=limit) if query else []
+    return JsonResponse({'query': query, 'count': len(results), 'results': results})
+
+
+# --- Detail Views ---
+
+@replica_reads
+async def project_details_view(request, pk):
+    """Detail page for a specific project."""
+    project = await aget_or_404(Project.objects.all(), pk=pk, is_active=True)
+    return await arender(request, 'portfolio/project_details.html', {'project_id': pk, 'project': project})
+
+
+@replica_reads
+async def blog_details_view(request, pk):
+    """Detail page for a specific blog post."""
+    post = await aget_or_404(BlogPost.objects.defer('content'), pk=pk, status='published')
+    if request.method == 'GET':
+        await arecord_blog_view(pk)
+    return await arender(request, 'portfolio/blog_details.html', {'post': post})
+
+
+@rate_limit('contact', response=contact_rate_limited)
+async def contact_view(request):
+    if request.method == 'POST' and request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        # Validation and the outbox transaction are synchronous
+        return await sync_to_async(contact_submission)(request)
+    return await arender(request, 'portfolio/contact.html')
+
+
+# --- Admin Dashboard ---
+
+@login_required
+async def admin_dashboard(request):
+    """Admin dashboard overview with meaningful metrics"""
+    # login_required already awaited request.auser(); without this the template loads the user again
+    request.user = await request.auser()
+    context = dashboard_context(await aget_content_stats())
+    context['recent_projects'] = [project async for project in context['recent_projects']]
+    return await arender(request, 'admin/dashboard.html', context)
@@ -0,0 +1,132 @@
+"""
+portfolio/caching.py
+
+Conditional GET and rendered-page caching for the public pages.
+
+The validator for every public page is derived from the newest
+``updated_at`` (and the row counts, so deletions are noticed) of the
+content tables, fetched in one query. Clients holding a matching ETag or
+Last-Modified get a 304 without any template work, and everyone else is
+served a body rendered once per content change.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .models import Project, BlogPost, About, SiteSettings
+from .assets import preload_header
+from .sql import table, column, to_datetime, fetch_scalars
+
+FRESHNESS_MODELS = (Project, BlogPost, About, SiteSettings)
+PAGE_CACHE_PREFIX = 'portfolio:page:v2'
+
+
+def freshness_query():
+    """Scalar subqueries for the newest updated_at and row count of each content table."""
+    columns = []
+    for model in FRESHNESS_MODELS:
+        columns.append(f"(SELECT MAX({column(model, 'updated_at')}) FROM {table(model)})")
+        columns.append(f"(SELECT COUNT(*) FROM {table(model)})")
+    return columns
+
+
+def content_freshness():
+    """Return ``(last_modified, fingerprint)`` for the public content in one query."""
+    row = fetch_scalars(freshness_query())
+
+    timestamps = [to_datetime(value) for value in row[0::2]]
+    timestamps = [value for value in timestamps if value is not None]
+    last_modified = max(timestamps) if timestamps else None
+    fingerprint = '|'.join(str(value) for value in row)
+    return last_modified, fingerprint
+
+
+def _lookup(request):
+    """``(etag, timestamp, cache key, response)``; response is a 304 or cached page, or None."""
+    last_modified, fingerprint = content_freshness()
+    digest = hashlib.md5(
+        f"{request.get_full_path()}|{fingerprint}".encode(), usedforsecurity=False
+    ).hexdigest()
+    etag = quote_etag(digest)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    cache_key = f"{PAGE_CACHE_PREFIX}:{digest}"
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        return etag, timestamp, cache_key, response
+
+    cached = cache.get(cache_key)
+    if cached is not None:
+        # Preload hints from {% asset_bundle %} are replayed with the body
+        content, content_type, link = cached
+        response = HttpResponse(content, content_type=content_type)
+        if link:
+            response['Link'] = link
+        response = _validators(response, etag, timestamp)
+    return etag, timestamp, cache_key, response
+
+
+def _store(request, response, cache_key):
+    """Cache a freshly rendered page; returns the (rendered) response, or None if it can't be cached."""
+    if response.status_code != 200 or response.streaming:
+        return None
+    if hasattr(response, 'render') and callable(response.render):
+        response = response.render()
+    cache.set(
+        cache_key,
+        (response.content, response['Content-Type'], preload_header(request)),
+        getattr(settings, 'PORTFOLIO_PAGE_CACHE_TIMEOUT', 60 * 60 * 24),
+    )
+    return response
+
+
+def _validators(response, etag, timestamp):
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    return response
+
+
+def cached_public_page(view_func):
+    """
+    Answer conditional requests with 304 and cache the rendered body.
+
+    Only anonymous-safe pages should use this: the cached body is shared
+    between all visitors. Works on sync and async views; for async views
+    the freshness query and cache lookup run in a thread.
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _wrapped_async_view(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await view_func(request, *args, **kwargs)
+
+            etag, timestamp, cache_key, response = await sync_to_async(_lookup)(request)
+            if response is not None:
+                return response
+            response = await view_func(request, *args, **kwargs)
+            stored = await sync_to_async(_store)(request, response, cache_key)
+            return response if stored is None else _validators(stored, etag, timestamp)
+
+        return _wrapped_async_view
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view_func(request, *args, **kwargs)
+
+        etag, timestamp, cache_key, response = _lookup(request)
+        if response is not None:
+            return response
+        response = view_func(request, *args, **kwargs)
+        stored = _store(request, response, cache_key)
+        return response if stored is None else _validators(stored, etag, timestamp)
+
+    return _wrapped_view
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+
+
+@register(deploy=True)
+def shared_cache_check(app_configs, **kwargs):
+    """Cross-worker invalidation (SiteSettings, fragment caches) needs a shared cache."""
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DEBUG or not backend.endswith('LocMemCache'):
+        return []
+    return [Warning(
+        "The default cache is process-local, so settings edits and fragment invalidations "
+        "only reach the worker that made them; other workers keep serving stale fragments.",
+        hint="Unset CACHE_BACKEND to use the database cache, or point it at Redis or Memcached.",
+        id='portfolio.W001',
+    )]
+
+
+@register()
+def rate_limit_cache_check(app_configs, **kwargs):
+    """Token buckets kept in a per-process cache would give every worker its own allowance."""
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DEBUG or not getattr(settings, 'RATE_LIMIT_ENABLED', True) or not backend.endswith('LocMemCache'):
+        return []
+    return [Error(
+        "Rate limiting is enabled but the default cache is process-local, so each worker "
+        "would keep its own buckets and the limits would multiply with the worker count.",
+        hint="Unset CACHE_BACKEND to use the database cache, point it at Redis or Memcached, "
+             "or set RATE_LIMIT_ENABLED=False.",
+        id='portfolio.E001',
+    )]
@@ -0,0 +1,120 @@
+"""
+portfolio/content.py
+
+Blog post content pipeline, run when a post is saved.
+
+``content`` is written in Markdown. On save it is rendered to HTML,
+sanitised with nh3 (raw HTML in the source is allowed but filtered) and
+stored with a table of contents, a word count, a reading time and, unless
+the author wrote their own, an excerpt. A generated excerpt is recognised
+by matching what the previous HTML would give, so it follows later edits
+to the content while a hand-written one is kept. Pages only output the stored
+results, so nothing is parsed per request. ``reprocess_posts`` re-runs the
+pipeline over existing posts, e.g. after changing the options below.
+"""
+import html as html_lib
+import math
+import re
+
+import markdown
+import nh3
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+MARKDOWN_EXTENSIONS = ['extra', 'sane_lists', 'toc']
+MARKDOWN_EXTENSION_CONFIGS = {
+    'toc': {'permalink': False, 'toc_depth': '2-4'},
+}
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'blockquote', 'br', 'code', 'dd', 'del', 'div', 'dl', 'dt', 'em',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'img', 'li', 'ol', 'p', 'pre', 'strong',
+    'sub', 'sup', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'abbr': {'title'},
+    'code': {'class'},
+    'img': {'src', 'alt', 'title', 'width', 'height'},
+    # Footnote references and notes link to each other by id
+    'li': {'id'},
+    'sup': {'id'},
+    'td': {'align'},
+    'th': {'align'},
+    **{f'h{level}': {'id'} for level in range(1, 7)},
+}
+URL_SCHEMES = {'http', 'https', 'mailto'}
+
+WORDS_PER_MINUTE = 200
+EXCERPT_WORDS = 40
+EXCERPT_MAX_LENGTH = 300  # BlogPost.excerpt max_length
+
+WORD_RE = re.compile(r'\w+(?:[\'’-]\w+)*', re.UNICODE)
+
+
+def render_markdown(text):
+    """Return ``(html, toc)`` for Markdown ``text``; the HTML is sanitised."""
+    md = markdown.Markdown(
+        extensions=MARKDOWN_EXTENSIONS, extension_configs=MARKDOWN_EXTENSION_CONFIGS,
+    )
+    html = md.convert(text or '')
+    html = nh3.clean(
+        html,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        url_schemes=URL_SCHEMES,
+        link_rel='noopener noreferrer',
+    )
+    return html, [toc_entry(token) for token in md.toc_tokens]
+
+
+def toc_entry(token):
+    """Reduce a python-markdown toc token to {level, id, title, children}."""
+    return {
+        'level': token['level'],
+        'id': token['id'],
+        # Plain text; templates escape it when rendering the TOC
+        'title': html_lib.unescape(strip_tags(token['name'])),
+        'children': [toc_entry(child) for child in token['children']],
+    }
+
+
+def plain_text(html):
+    return html_lib.unescape(strip_tags(html))
+
+
+def count_words(html):
+    return len(WORD_RE.findall(plain_text(html)))
+
+
+def reading_time(words):
+    """Minutes to read ``words`` words, at least one."""
+    return max(1, math.ceil(words / WORDS_PER_MINUTE))
+
+
+def make_excerpt(html):
+    text = ' '.join(plain_text(html).split())
+    excerpt = Truncator(text).words(EXCERPT_WORDS, truncate='…')
+    return Truncator(excerpt).chars(EXCERPT_MAX_LENGTH, truncate='…')
+
+
+def has_generated_excerpt(post):
+    """True if ``post.excerpt`` is blank or was generated from its current ``content_html``."""
+    excerpt = (post.excerpt or '').strip()
+    return not excerpt or bool(post.content_html) and excerpt == make_excerpt(post.content_html)
+
+
+def process_post(post):
+    """Fill the derived content fields of ``post`` in place. Returns the names of the fields set."""
+    # Decided before content_html is replaced, while it still holds the HTML the excerpt came from
+    regenerate_excerpt = has_generated_excerpt(post)
+    html, toc = render_markdown(post.content)
+    post.content_html = html
+    post.content_toc = toc
+    post.word_count = count_words(html)
+    post.read_time = reading_time(post.word_count)
+    fields = ['content_html', 'content_toc', 'word_count', 'read_time']
+    if regenerate_excerpt:
+        post.excerpt = make_excerpt(html)
+        fields.append('excerpt')
+    return fields
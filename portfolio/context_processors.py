@@ -0,0 +1,8 @@
+from django.utils.functional import SimpleLazyObject
+
+from .models import SiteSettings
+
+
+def site_settings(request):
+    """Expose ``site_settings`` to templates; nothing is looked up unless a template uses it."""
+    return {'site_settings': SimpleLazyObject(SiteSettings.get_solo)}
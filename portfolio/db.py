@@ -0,0 +1,161 @@
+"""
+portfolio/db.py
+
+Connection tuning, read/write routing and bulk upserts.
+
+New SQLite connections get the pragmas in SQLITE_PRAGMAS (WAL journaling
+by default, so readers don't block behind a writer). Persistent,
+health-checked connections are set up in settings.py.
+
+If a ``replica`` alias is configured, ReplicaRouter sends ORM reads made
+inside a ``replica_reads`` view (the public, read-only pages) to it, for
+the portfolio's own models. All writes go to the primary, and so do all
+other reads: the dashboard, sessions, auth and the analytics flush. That
+way an editor always sees their own changes. Raw SQL reads pick their
+alias with ``read_alias()``.
+
+``bulk_upsert`` inserts rows or updates those that already exist on
+backends with and without a named conflict target.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.db.models import Q
+from django.db.backends.signals import connection_created
+
+REPLICA = 'replica'
+
+_use_replica = ContextVar('portfolio_use_replica', default=False)
+
+
+# -----------------------------------------------------------------------------
+# SQLite tuning
+# -----------------------------------------------------------------------------
+
+def configure_sqlite(sender, connection, **kwargs):
+    """connection_created receiver: apply SQLITE_PRAGMAS to a new SQLite connection."""
+    if connection.vendor != 'sqlite':
+        return
+    if connection.is_in_memory_db():
+        # The shared-cache test database fails with "table is locked" instead of
+        # waiting, so BEGIN IMMEDIATE would only turn waits into errors there
+        connection.transaction_mode = None
+        return
+    for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+        # On the raw connection, so setup doesn't show up in query logs and timings
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+connection_created.connect(configure_sqlite)
+
+
+# -----------------------------------------------------------------------------
+# Read replica
+# -----------------------------------------------------------------------------
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+def read_alias():
+    """Alias for raw reads: the replica inside replica_reads, otherwise the primary."""
+    return REPLICA if _use_replica.get() and replica_configured() else DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def _reads_from(replica):
+    token = _use_replica.set(replica)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def primary_reads():
+    """Read from the primary for the duration, e.g. before writing derived data."""
+    return _reads_from(False)
+
+
+def replica_reads(view_func):
+    """Serve a read-only view's queries from the replica, if there is one (sync or async)."""
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _wrapped_async_view(request, *args, **kwargs):
+            with _reads_from(request.method in ('GET', 'HEAD')):
+                return await view_func(request, *args, **kwargs)
+
+        return _wrapped_async_view
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        with _reads_from(request.method in ('GET', 'HEAD')):
+            return view_func(request, *args, **kwargs)
+
+    return _wrapped_view
+
+
+class ReplicaRouter:
+    """Content reads inside ``replica_reads`` go to the replica; everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        # Sessions and users stay on the primary: a fresh login must not look logged out
+        if model._meta.app_label != 'portfolio':
+            return DEFAULT_DB_ALIAS
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica follows the primary's schema through replication
+        return db != REPLICA
+
+
+# -----------------------------------------------------------------------------
+# Upserts
+# -----------------------------------------------------------------------------
+
+def bulk_upsert(model, instances, unique_fields, update_fields):
+    """
+    Insert ``instances``, updating ``update_fields`` of the rows that already
+    hold their ``unique_fields`` values. Call it inside a transaction.
+
+    Where the backend can name the conflict target this is one
+    ``INSERT ... ON CONFLICT (...) DO UPDATE``. MySQL and MariaDB can't
+    (Django rejects ``unique_fields`` there), so the existing rows are looked
+    up by key, updated with ``bulk_update`` and the rest inserted.
+    """
+    instances = list(instances)
+    if not instances:
+        return
+    if connections[router.db_for_write(model)].features.supports_update_conflicts_with_target:
+        model.objects.bulk_create(
+            instances, update_conflicts=True,
+            unique_fields=unique_fields, update_fields=update_fields,
+        )
+        return
+
+    by_key = {tuple(getattr(instance, name) for name in unique_fields): instance for instance in instances}
+    lookup = Q(*(Q(**dict(zip(unique_fields, values))) for values in by_key), _connector=Q.OR)
+    existing = []
+    for pk, *values in model.objects.filter(lookup).values_list('pk', *unique_fields):
+        instance = by_key.pop(tuple(values))
+        instance.pk = pk
+        existing.append(instance)
+    if existing:
+        # bulk_update, unlike bulk_create, doesn't stamp auto_now fields itself
+        for field in model._meta.concrete_fields:
+            if field.name in update_fields and getattr(field, 'auto_now', False):
+                for instance in existing:
+                    field.pre_save(instance, add=False)
+        model.objects.bulk_update(existing, update_fields)
+    if by_key:
+        model.objects.bulk_create(by_key.values())
@@ -0,0 +1,241 @@
+"""
+portfolio/feeds.py
+
+sitemap.xml and the Atom feed of published posts.
+
+Both are built once per content change and then served from the cache.
+Their cache keys carry the same content fingerprint as the page validators
+(caching.content_freshness), so an edit moves to new keys and the next
+request rebuilds. Each stored document keeps a strong ETag over its bytes,
+and conditional requests get a 304 after the one freshness query. Past
+SITEMAP_MAX_URLS entries (the protocol's limit is 50,000) the sitemap is
+split into ``sitemap-<n>.xml`` shards, and ``sitemap.xml`` becomes their
+index.
+
+Documents are stored gzip-compressed: a full 50,000-URL shard is several
+megabytes of XML, past Memcached's 1 MB item limit, but compresses to a
+fraction of that. Entries the cache refused are logged; the request that
+built them is still answered, and lowering SITEMAP_MAX_URLS makes the
+shards smaller.
+"""
+import gzip
+import hashlib
+import logging
+from datetime import timezone as dt_timezone
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils import feedgenerator
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.utils.xmlutils import SimplerXMLGenerator
+from django.views.decorators.http import require_safe
+
+from .caching import content_freshness
+from .db import replica_reads
+from .models import Project, BlogPost, SiteSettings
+
+FEEDS_CACHE_PREFIX = 'portfolio:feeds:v1'
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+SITEMAP_PROTOCOL_LIMIT = 50000
+FEED_LENGTH = 20
+
+logger = logging.getLogger(__name__)
+
+# Public list pages: (URL name, change frequency)
+STATIC_PAGES = [
+    ('portfolio:home', 'weekly'),
+    ('portfolio:about', 'monthly'),
+    ('portfolio:projects', 'weekly'),
+    ('portfolio:blogs', 'weekly'),
+    ('portfolio:contact', 'yearly'),
+]
+
+
+def max_urls():
+    return min(getattr(settings, 'SITEMAP_MAX_URLS', SITEMAP_PROTOCOL_LIMIT), SITEMAP_PROTOCOL_LIMIT)
+
+
+def w3c_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ') if value else None
+
+
+# -----------------------------------------------------------------------------
+# Builders: return {document name: bytes}
+# -----------------------------------------------------------------------------
+
+def sitemap_entries(last_modified):
+    """``(path, lastmod, changefreq)`` for every public URL, in a stable order."""
+    for name, changefreq in STATIC_PAGES:
+        yield reverse(name), last_modified, changefreq
+    projects = Project.objects.filter(is_active=True).order_by('pk').values_list('pk', 'updated_at')
+    for pk, updated_at in projects.iterator(chunk_size=2000):
+        yield reverse('portfolio:project_details', args=[pk]), updated_at, 'monthly'
+    posts = (
+        BlogPost.objects.filter(status='published').order_by('pk')
+        .values_list('pk', 'updated_at', 'published_date')
+    )
+    for pk, updated_at, published_date in posts.iterator(chunk_size=2000):
+        yield reverse('portfolio:blog_details', args=[pk]), updated_at or published_date, 'monthly'
+
+
+def _xml(write):
+    stream = StringIO()
+    handler = SimplerXMLGenerator(stream, 'utf-8')
+    handler.startDocument()
+    write(handler)
+    handler.endDocument()
+    return stream.getvalue().encode('utf-8')
+
+
+def _urlset(base_url, entries):
+    def write(handler):
+        handler.startElement('urlset', {'xmlns': SITEMAP_NS})
+        for path, lastmod, changefreq in entries:
+            handler.startElement('url', {})
+            handler.addQuickElement('loc', base_url + path)
+            if lastmod:
+                handler.addQuickElement('lastmod', w3c_datetime(lastmod))
+            handler.addQuickElement('changefreq', changefreq)
+            handler.endElement('url')
+        handler.endElement('urlset')
+    return _xml(write)
+
+
+def _sitemap_index(base_url, shards):
+    def write(handler):
+        handler.startElement('sitemapindex', {'xmlns': SITEMAP_NS})
+        for section, lastmod in shards:
+            handler.startElement('sitemap', {})
+            handler.addQuickElement('loc', base_url + reverse('portfolio:sitemap-section', args=[section]))
+            if lastmod:
+                handler.addQuickElement('lastmod', w3c_datetime(lastmod))
+            handler.endElement('sitemap')
+        handler.endElement('sitemapindex')
+    return _xml(write)
+
+
+def build_sitemaps(base_url, last_modified):
+    """``sitemap`` plus one ``sitemap-<n>`` per shard; ``sitemap`` is the index if there are several."""
+    limit = max_urls()
+    documents, shards, chunk = {}, [], []
+
+    def close_shard():
+        section = len(shards) + 1
+        documents[f'sitemap-{section}'] = _urlset(base_url, chunk)
+        shards.append((section, max((lastmod for _, lastmod, _ in chunk if lastmod), default=None)))
+
+    for entry in sitemap_entries(last_modified):
+        chunk.append(entry)
+        if len(chunk) == limit:
+            close_shard()
+            chunk = []
+    if chunk or not shards:
+        close_shard()
+
+    documents['sitemap'] = (
+        documents['sitemap-1'] if len(shards) == 1 else _sitemap_index(base_url, shards)
+    )
+    return documents
+
+
+def build_feed(base_url, last_modified):
+    site = SiteSettings.get_solo()
+    feed = feedgenerator.Atom1Feed(
+        title=site.site_name,
+        link=base_url + reverse('portfolio:blogs'),
+        description=site.site_description,
+        feed_url=base_url + reverse('portfolio:atom-feed'),
+        language=settings.LANGUAGE_CODE,
+    )
+    posts = (
+        BlogPost.objects.filter(status='published')
+        .only('pk', 'title', 'excerpt', 'published_date', 'updated_at')
+        .order_by('-published_date', '-id')[:FEED_LENGTH]
+    )
+    for post in posts:
+        link = base_url + reverse('portfolio:blog_details', args=[post.pk])
+        feed.add_item(
+            title=post.title,
+            link=link,
+            description=post.excerpt,
+            unique_id=link,
+            pubdate=post.published_date,
+            updateddate=post.updated_at,
+        )
+    return {'feed': feed.writeString('utf-8').encode('utf-8')}
+
+
+# -----------------------------------------------------------------------------
+# Storage and serving
+# -----------------------------------------------------------------------------
+
+def stored_document(request, builder, family, name):
+    """
+    ``(body, etag, timestamp)`` of document ``name``, or None if there is no such document.
+
+    ``builder`` makes every document of ``family`` and runs only when the
+    content has changed since they were stored (or one was evicted).
+    """
+    last_modified, fingerprint = content_freshness()
+    base_url = f'{request.scheme}://{request.get_host()}'
+    digest = hashlib.md5(f'{base_url}|{fingerprint}'.encode(), usedforsecurity=False).hexdigest()
+    prefix = f'{FEEDS_CACHE_PREFIX}:{digest}'
+    names_key = f'{prefix}:{family}:names'
+
+    found = cache.get_many([f'{prefix}:{name}', names_key])
+    if f'{prefix}:{name}' in found:
+        compressed, etag, timestamp = found[f'{prefix}:{name}']
+        return gzip.decompress(compressed), etag, timestamp
+    if names_key in found and name not in found[names_key]:
+        # Built for this content and there is no such shard: don't rebuild for junk URLs
+        return None
+
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    documents = builder(base_url, last_modified)
+    built = {
+        f'{prefix}:{doc_name}': (gzip.compress(body), f'"{hashlib.sha256(body).hexdigest()}"', timestamp)
+        for doc_name, body in documents.items()
+    }
+    built[names_key] = set(documents)
+    failed = cache.set_many(built, getattr(settings, 'PORTFOLIO_PAGE_CACHE_TIMEOUT', 60 * 60 * 24))
+    if failed:
+        # Memcached drops items over its size limit; a lower SITEMAP_MAX_URLS shrinks shards
+        logger.warning("The cache refused %s; they are rebuilt on every request", ', '.join(sorted(failed)))
+
+    if name not in documents:
+        return None
+    _compressed, etag, timestamp = built[f'{prefix}:{name}']
+    return documents[name], etag, timestamp
+
+
+def serve(request, document, content_type):
+    if document is None:
+        raise Http404("No such document.")
+    body, etag, timestamp = document
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = HttpResponse(body, content_type=content_type)
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    return response
+
+
+@require_safe
+@replica_reads
+def sitemap_view(request, section=None):
+    name = 'sitemap' if section is None else f'sitemap-{section}'
+    document = stored_document(request, build_sitemaps, 'sitemap', name)
+    return serve(request, document, 'application/xml; charset=utf-8')
+
+
+@require_safe
+@replica_reads
+def atom_feed_view(request):
+    document = stored_document(request, build_feed, 'feed', 'feed')
+    return serve(request, document, 'application/atom+xml; charset=utf-8')
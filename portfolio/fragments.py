@@ -0,0 +1,106 @@
+"""
+portfolio/fragments.py
+
+Generation counters behind the ``{% cachedfragment %}`` template tag.
+
+Each model in TRACKED_MODELS has a counter in the shared cache that is
+bumped after each committed save or delete (see signals.py). A cached
+fragment's key includes the counters of the models it depends on, so an
+edit moves every dependent fragment to a new key and the stale entries
+simply age out. Writes that skip signals (``QuerySet.update()``,
+``bulk_create``) must call ``bump()`` themselves. Fragments can only
+depend on tracked models, so session, analytics and outbox writes never
+touch the counters.
+
+The counters only work if every worker sees the same cache: with a
+per-process LocMemCache a bump reaches one worker and the others serve
+stale fragments until they expire. Outside DEBUG the default cache is the
+database (see settings.py), and portfolio.W001 flags a LocMemCache.
+"""
+import hashlib
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+
+GENERATION_PREFIX = 'portfolio:fragment-gen'
+FRAGMENT_PREFIX = 'portfolio:fragment'
+
+# Models a fragment may depend on: the content edited from the dashboard
+TRACKED_MODELS = frozenset({
+    'portfolio.project',
+    'portfolio.skill',
+    'portfolio.certification',
+    'portfolio.blogpost',
+    'portfolio.about',
+    'portfolio.sitesettings',
+})
+
+
+def model_label(model):
+    return model._meta.label_lower
+
+
+def is_tracked(model):
+    return model_label(model) in TRACKED_MODELS
+
+
+def resolve_model(name, default_app='portfolio'):
+    """``'Skill'`` or ``'auth.User'`` to a model class; raises LookupError if unknown."""
+    if '.' not in name:
+        name = f'{default_app}.{name}'
+    return apps.get_model(name)
+
+
+def generation_key(label):
+    return f'{GENERATION_PREFIX}:{label}'
+
+
+def _seed():
+    # Counters lost from the cache restart from the clock rather than from 1,
+    # so they can't come back to a value an older fragment was stored under
+    return time.time_ns()
+
+
+def generations(labels):
+    """Current counter for each label, in order; missing counters are created."""
+    keys = [generation_key(label) for label in labels]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _seed(), None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def bump(*models):
+    """Invalidate every fragment that depends on ``models``."""
+    for model in models:
+        key = generation_key(model_label(model))
+        try:
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, _seed(), None)
+        except DatabaseError:
+            # No database cache table yet: data migrations save before createcachetable
+            # runs, and nothing can have been cached under the counter either
+            continue
+
+
+def bump_on_commit(model):
+    transaction.on_commit(lambda: bump(model))
+
+
+def fragment_key(name, labels, vary_on=()):
+    """Cache key for fragment ``name`` at the current generations of ``labels``."""
+    parts = [str(value) for value in generations(labels)]
+    parts.extend(str(value) for value in vary_on)
+    digest = hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'{FRAGMENT_PREFIX}:{name}:{digest}'
+
+
+def default_timeout():
+    return getattr(settings, 'PORTFOLIO_FRAGMENT_CACHE_TIMEOUT', 60 * 60 * 24)
@@ -0,0 +1,76 @@
+"""
+portfolio/health.py
+
+Liveness and readiness probes for the orchestrator.
+
+``/healthz`` answers as long as the process can serve a request and never
+touches the database; ``/readyz`` adds one ``SELECT 1``. HealthCheckMiddleware
+sits at the top of the stack and answers both before host validation,
+sessions, auth or instrumentation run: probes arrive with the container's
+IP as Host and would otherwise be rejected by ALLOWED_HOSTS, and they have
+no business in the request logs. The URL routes serve the same views for
+``reverse()`` and the benchmarks.
+"""
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import DatabaseError, connection
+from django.http import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+
+def _no_store(response):
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def healthz(request):
+    """Liveness: the worker is up. No database access."""
+    return _no_store(JsonResponse({'status': 'ok'}))
+
+
+def readyz(request):
+    """Readiness: the worker can reach the database."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except DatabaseError as exc:
+        logger.warning("Readiness check failed: %s", exc)
+        return _no_store(JsonResponse({'status': 'error', 'message': 'Database unavailable'}, status=503))
+    return _no_store(JsonResponse({'status': 'ok'}))
+
+
+PROBES = {
+    '/healthz': healthz,
+    '/readyz': readyz,
+}
+
+
+class HealthCheckMiddleware:
+    """Answer probe requests before the rest of the middleware stack."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        probe = PROBES.get(request.path_info)
+        if probe is not None and request.method in ('GET', 'HEAD'):
+            return probe(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        probe = PROBES.get(request.path_info)
+        if probe is not None and request.method in ('GET', 'HEAD'):
+            if probe is healthz:
+                return probe(request)
+            return await sync_to_async(probe)(request)
+        return await self.get_response(request)
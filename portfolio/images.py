@@ -0,0 +1,191 @@
+"""
+portfolio/images.py
+
+Responsive image derivatives for uploaded images.
+
+When an image is uploaded, resized WebP and JPEG copies are written next
+to it under ``derivatives/`` at each configured width that does not exceed
+the original. Their names and dimensions are stored in a JSON field on the
+owning model so the ``responsive_image`` template tag can build
+``srcset``/``sizes`` without touching storage or the database.
+
+Encoding takes a while, so saves don't wait for it: ``schedule_build``
+hands the row to a background thread once the transaction commits, and
+pages use the original image until the manifest is in place. Anything
+lost to a restart is picked up by ``manage.py build_image_derivatives``.
+When an image is replaced, the old image's derivatives are deleted.
+"""
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+from . import fragments
+
+logger = logging.getLogger(__name__)
+
+# Image field -> JSON field holding its derivatives, per model label
+IMAGE_FIELDS = {
+    'portfolio.project': ('image', 'image_variants'),
+    'portfolio.blogpost': ('featured_image', 'featured_image_variants'),
+    'portfolio.about': ('profile_image', 'profile_image_variants'),
+}
+
+FORMATS = {
+    'webp': 'WEBP',
+    'jpeg': 'JPEG',
+}
+
+
+def derivative_widths():
+    return sorted(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', [320, 640, 960, 1280, 1920]))
+
+
+def derivative_name(source_name, width, fmt):
+    directory, filename = posixpath.split(source_name)
+    stem = posixpath.splitext(filename)[0]
+    extension = 'jpg' if fmt == 'jpeg' else fmt
+    return posixpath.join('derivatives', directory, f"{stem}-{width}w.{extension}")
+
+
+def _encode(image, fmt):
+    if fmt == 'jpeg' and image.mode == 'RGBA':
+        # JPEG has no alpha channel: flatten onto white
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+
+    output = BytesIO()
+    image.save(
+        output,
+        FORMATS[fmt],
+        quality=getattr(settings, 'IMAGE_DERIVATIVE_QUALITY', 80),
+        optimize=True,
+        **({'progressive': True} if fmt == 'jpeg' else {'method': 6}),
+    )
+    return output.getvalue()
+
+
+def generate_derivatives(field_file):
+    """
+    Write resized WebP and JPEG copies of ``field_file`` and return their manifest.
+
+    The manifest records the source name and size plus one entry per
+    derivative: ``{"width", "height", "name"}`` grouped by format.
+    """
+    storage = field_file.storage
+    with storage.open(field_file.name, 'rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    if image.mode not in ('RGB', 'RGBA'):
+        has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    original_width, original_height = image.size
+    widths = [width for width in derivative_widths() if width < original_width]
+    widths.append(min(original_width, derivative_widths()[-1]))
+
+    manifest = {
+        'source': field_file.name,
+        'width': original_width,
+        'height': original_height,
+        **{fmt: [] for fmt in FORMATS},
+    }
+    for width in sorted(set(widths)):
+        height = max(1, round(original_height * width / original_width))
+        resized = image if width == original_width else image.resize((width, height), Image.LANCZOS)
+        for fmt in FORMATS:
+            name = derivative_name(field_file.name, width, fmt)
+            if storage.exists(name):
+                storage.delete(name)
+            saved_name = storage.save(name, ContentFile(_encode(resized, fmt)))
+            manifest[fmt].append({'width': width, 'height': height, 'name': saved_name})
+    return manifest
+
+
+def needs_derivatives(instance, force=False):
+    """True if the instance's image has no up-to-date derivatives."""
+    image_field, variants_field = IMAGE_FIELDS[instance._meta.label_lower]
+    field_file = getattr(instance, image_field)
+    if not field_file:
+        return False
+    variants = getattr(instance, variants_field) or {}
+    return force or variants.get('source') != field_file.name
+
+
+def build_for_instance(instance, force=False):
+    """Generate derivatives for one instance and store the manifest with a plain UPDATE."""
+    if not needs_derivatives(instance, force=force):
+        return False
+    image_field, variants_field = IMAGE_FIELDS[instance._meta.label_lower]
+    field_file = getattr(instance, image_field)
+    previous = getattr(instance, variants_field) or {}
+    manifest = generate_derivatives(field_file)
+    # update() skips save() and its signals, and leaves updated_at alone
+    type(instance).objects.filter(pk=instance.pk).update(**{variants_field: manifest})
+    fragments.bump_on_commit(type(instance))
+    setattr(instance, variants_field, manifest)
+    delete_derivatives(field_file.storage, previous, keep=manifest)
+    return True
+
+
+def _names(manifest):
+    return {entry['name'] for fmt in FORMATS for entry in (manifest or {}).get(fmt, [])}
+
+
+def delete_derivatives(storage, manifest, keep=None):
+    """Delete the files listed in ``manifest`` that ``keep`` doesn't also list."""
+    for name in _names(manifest) - _names(keep):
+        try:
+            storage.delete(name)
+        except OSError:
+            logger.warning("Could not delete image derivative %s", name)
+
+
+# -----------------------------------------------------------------------------
+# Background builds
+# -----------------------------------------------------------------------------
+
+_executor = None
+
+
+def _background_executor():
+    # Created on first use, so each forked worker gets its own thread
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-derivatives')
+    return _executor
+
+
+def _build(label, pk):
+    close_old_connections()
+    try:
+        instance = apps.get_model(label).objects.filter(pk=pk).first()
+        if instance is not None:
+            build_for_instance(instance)
+    except Exception:
+        # The original image is still served; build_image_derivatives can retry later
+        logger.exception("Could not build image derivatives for %s %s", label, pk)
+    finally:
+        close_old_connections()
+
+
+def schedule_build(instance):
+    """Build ``instance``'s derivatives after the current transaction commits, off the request path."""
+    label, pk = instance._meta.label_lower, instance.pk
+
+    def submit():
+        if getattr(settings, 'IMAGE_DERIVATIVES_IN_BACKGROUND', True):
+            _background_executor().submit(_build, label, pk)
+        else:
+            _build(label, pk)
+
+    transaction.on_commit(submit)
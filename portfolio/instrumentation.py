@@ -0,0 +1,316 @@
+"""
+portfolio/instrumentation.py
+
+Per-request timing: SQL, template rendering, view and total time.
+
+``InstrumentationMiddleware`` counts and times every query through an
+execute wrapper installed on each database connection (including those
+async views open in worker threads) and picks up template render time from
+``InstrumentedDjangoTemplates`` (the template backend configured in
+settings). The figures go out as a ``Server-Timing`` header, visible in
+the browser's network panel, and as one JSON log line per request on the
+``portfolio.instrumentation`` logger. Entries overlap: ``view`` includes
+the templates and queries it triggered.
+
+With INSTRUMENTATION_PROFILING on, a request can also be profiled, either
+by sampling or on demand with ``?_profile=<token>`` (tokens come from
+``python manage.py profile_token``). Profiles are written to
+INSTRUMENTATION_PROFILE_DIR and named in the ``X-Profile`` header.
+"""
+import cProfile
+import contextvars
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PARAM = '_profile'
+PROFILE_SALT = 'portfolio.instrumentation.profile'
+
+# Timings of the request being handled, if it is instrumented
+_current = contextvars.ContextVar('portfolio_request_timings', default=None)
+
+
+def enabled():
+    return getattr(settings, 'INSTRUMENTATION_ENABLED', True)
+
+
+class RequestTimings:
+    """Accumulated durations (seconds) and query count for one request."""
+
+    def __init__(self):
+        self.durations = Counter()
+        self.queries = 0
+        self._depth = Counter()
+
+    @contextmanager
+    def timer(self, name):
+        # Only the outermost timer counts, so nested templates aren't added twice
+        self._depth[name] += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth[name] -= 1
+            if not self._depth[name]:
+                self.durations[name] += time.perf_counter() - started
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        self.queries += 1
+        with self.timer('db'):
+            return execute(sql, params, many, context)
+
+    def milliseconds(self, name):
+        return round(self.durations[name] * 1000, 2)
+
+
+def record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.execute_wrapper(execute, sql, params, many, context)
+
+
+def install_query_timer(connection, **kwargs):
+    """Route ``connection``'s queries through record_query() (idempotent)."""
+    if record_query not in connection.execute_wrappers:
+        # First in the list, so callers' own execute_wrapper() blocks still pop their wrapper
+        connection.execute_wrappers.insert(0, record_query)
+
+
+# Connections are per thread; async views query from sync_to_async threads
+connection_created.connect(install_query_timer)
+
+
+# -----------------------------------------------------------------------------
+# Template timing
+# -----------------------------------------------------------------------------
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return super().render(context, request)
+        with timings.timer('template'):
+            return super().render(context, request)
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, with render time recorded for the current request."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+# -----------------------------------------------------------------------------
+# Profiling
+# -----------------------------------------------------------------------------
+
+def profile_token():
+    """A signed value for ``?_profile=``; valid for INSTRUMENTATION_PROFILE_TOKEN_MAX_AGE seconds."""
+    return signing.TimestampSigner(salt=PROFILE_SALT).sign('profile')
+
+
+def requested_profile(request):
+    token = request.GET.get(PROFILE_PARAM)
+    if not token:
+        return False
+    try:
+        signing.TimestampSigner(salt=PROFILE_SALT).unsign(
+            token, max_age=getattr(settings, 'INSTRUMENTATION_PROFILE_TOKEN_MAX_AGE', 60 * 60),
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def should_profile(request):
+    if not getattr(settings, 'INSTRUMENTATION_PROFILING', False):
+        return False
+    if requested_profile(request):
+        return True
+    return random.random() < getattr(settings, 'INSTRUMENTATION_PROFILE_SAMPLE_RATE', 0.0)
+
+
+class CProfileProfiler:
+    suffix = '.prof'
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+
+    def save(self, path):
+        self.profiler.dump_stats(path)
+
+
+class PyinstrumentProfiler:
+    suffix = '.html'
+
+    def __init__(self):
+        from pyinstrument import Profiler  # Optional dependency
+        self.profiler = Profiler()
+
+    def start(self):
+        self.profiler.start()
+
+    def stop(self):
+        self.profiler.stop()
+
+    def save(self, path):
+        Path(path).write_text(self.profiler.output_html(), encoding='utf-8')
+
+
+PROFILERS = {
+    'cprofile': CProfileProfiler,
+    'pyinstrument': PyinstrumentProfiler,
+}
+
+
+def profile_path(request, suffix):
+    directory = Path(getattr(settings, 'INSTRUMENTATION_PROFILE_DIR', Path(settings.BASE_DIR) / 'profiles'))
+    directory.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r'[^\w-]+', '-', request.path).strip('-') or 'root'
+    stamp = timezone.now().strftime('%Y%m%dT%H%M%S%f')
+    return directory / f"{stamp}-{request.method.lower()}-{slug}{suffix}"
+
+
+# -----------------------------------------------------------------------------
+# Middleware
+# -----------------------------------------------------------------------------
+
+def server_timing(timings):
+    entries = [
+        f'db;dur={timings.milliseconds("db")};desc="{timings.queries} queries"',
+        f'tpl;dur={timings.milliseconds("template")}',
+        f'view;dur={timings.milliseconds("view")}',
+        f'total;dur={timings.milliseconds("total")}',
+    ]
+    return ', '.join(entries)
+
+
+class InstrumentationMiddleware:
+    """Time each request and report it in ``Server-Timing`` and a structured log line."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # A sync process_view would be run through a thread by the async handler
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not enabled():
+            return self.get_response(request)
+
+        timings, profiler = self.start(request)
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            finished = time.perf_counter()
+            if profiler is not None:
+                profiler.stop()
+            _current.reset(token)
+        return self.finish(request, response, timings, profiler, started, finished)
+
+    async def __acall__(self, request):
+        if not enabled():
+            return await self.get_response(request)
+
+        # Under ASGI a profile also catches whatever else the event loop ran meanwhile
+        timings, profiler = self.start(request)
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            finished = time.perf_counter()
+            if profiler is not None:
+                profiler.stop()
+            _current.reset(token)
+        return self.finish(request, response, timings, profiler, started, finished)
+
+    def start(self, request):
+        """Timings for ``request`` and its profiler, already running (or None)."""
+        for connection in connections.all(initialized_only=True):
+            # Opened before this module was imported, so missed connection_created
+            install_query_timer(connection)
+        timings = RequestTimings()
+        profiler = None
+        if should_profile(request):
+            profiler = PROFILERS[getattr(settings, 'INSTRUMENTATION_PROFILER', 'cprofile')]()
+            profiler.start()
+        return timings, profiler
+
+    def finish(self, request, response, timings, profiler, started, finished):
+        timings.durations['total'] = finished - started
+        view_started = getattr(request, '_instrumentation_view_started', None)
+        if view_started is not None:
+            # Up to the response coming back out through the inner middleware
+            timings.durations['view'] = finished - view_started
+
+        profile_name = None
+        if profiler is not None:
+            path = profile_path(request, profiler.suffix)
+            profiler.save(path)
+            profile_name = path.name
+            response['X-Profile'] = profile_name
+
+        if getattr(settings, 'INSTRUMENTATION_SERVER_TIMING', True):
+            response['Server-Timing'] = server_timing(timings)
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': timings.milliseconds('total'),
+            'view_ms': timings.milliseconds('view'),
+            'db_ms': timings.milliseconds('db'),
+            'db_queries': timings.queries,
+            'template_ms': timings.milliseconds('template'),
+            'profile': profile_name,
+        }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self.mark_view_started(request)
+        return None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        self.mark_view_started(request)
+        return None
+
+    def mark_view_started(self, request):
+        if _current.get() is not None:
+            request._instrumentation_view_started = time.perf_counter()
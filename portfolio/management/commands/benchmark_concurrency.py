@@ -0,0 +1,231 @@
+"""
+Compare sync (WSGI) and async (ASGI) throughput when the database is slow.
+
+    python manage.py benchmark_concurrency                         # 10 ms per query
+    python manage.py benchmark_concurrency --latency-ms 50 --requests 400
+    python manage.py benchmark_concurrency --workers 4 --concurrency 100
+
+Every query is delayed by ``--latency-ms`` to stand in for a remote or
+overloaded database (or any other blocking I/O). Each route that has an
+async version is then hit ``--requests`` times through Django's real
+handlers: the sync views through ``WSGIHandler`` with ``--workers``
+requests in flight (one per Gunicorn sync worker), and the async views
+through ``ASGIHandler`` on one event loop with ``--concurrency`` requests
+in flight. Like ``benchmark_routes`` this uses a throwaway test database
+seeded with ``--rows`` rows per model, and with DEBUG off needs
+``build_assets`` to have been run first.
+"""
+import asyncio
+import logging
+import statistics
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test import Client, RequestFactory
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import include, path
+
+from portfolio import analytics, async_views, views
+from portfolio.urls import build_urlpatterns
+
+from .benchmark_routes import ROUTES, percentile, seed_site, seed_to
+
+# Routes served by portfolio.async_views under ASGI
+ASYNC_ROUTES = {'home', 'about', 'projects', 'blogs', 'contact', 'search',
+                'project_details', 'blog_details', 'admin-dashboard'}
+
+
+def urlconf(pages):
+    """A root URLconf serving the portfolio app with its page views from ``pages``."""
+    module = types.ModuleType(f'benchmark_urls_{pages.__name__.rsplit(".", 1)[-1]}')
+    module.urlpatterns = [path('', include((build_urlpatterns(pages), 'portfolio')))]
+    return module
+
+
+class Latency:
+    """Execute wrapper that sleeps before every query, on every connection in every thread."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        time.sleep(self.seconds)
+        return execute(sql, params, many, context)
+
+    def install(self, connection, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def __enter__(self):
+        connection_created.connect(self.install)
+        for conn in connections.all(initialized_only=True):
+            self.install(conn)
+        return self
+
+    def __exit__(self, *exc_info):
+        connection_created.disconnect(self.install)
+        for conn in connections.all(initialized_only=True):
+            if self in conn.execute_wrappers:
+                conn.execute_wrappers.remove(self)
+
+
+# -----------------------------------------------------------------------------
+# Drivers: run ``total`` requests for ``path``, return per-request latencies (s)
+# -----------------------------------------------------------------------------
+
+def run_sync(path, query, cookie, total, workers):
+    handler = WSGIHandler()
+    factory = RequestFactory()
+
+    def one(_):
+        environ = factory.get(path, query, HTTP_COOKIE=cookie).environ
+        started = time.perf_counter()
+        status = []
+        body = handler(environ, lambda code, headers, exc_info=None: status.append(code))
+        for _chunk in body:
+            pass
+        getattr(body, 'close', lambda: None)()
+        return time.perf_counter() - started, int(status[0].split()[0])
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(one, range(total)))
+
+
+def run_async(path, query, cookie, total, concurrency):
+    handler = ASGIHandler()
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': urlencode(query).encode(),
+        'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'cookie', cookie.encode())],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    }
+
+    async def one(limit):
+        async with limit:
+            done = asyncio.Event()
+            state = {'body_sent': False, 'status': None}
+
+            async def receive():
+                if not state['body_sent']:
+                    state['body_sent'] = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                # Django listens for a disconnect while the view runs
+                await done.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    state['status'] = message['status']
+
+            started = time.perf_counter()
+            await handler(dict(scope), receive, send)
+            done.set()
+            return time.perf_counter() - started, state['status']
+
+    async def main():
+        limit = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(one(limit) for _ in range(total)))
+
+    return asyncio.run(main())
+
+
+def summarise(samples, elapsed):
+    latencies = sorted(seconds * 1000 for seconds, _status in samples)
+    return {
+        'status': statistics.mode(status for _seconds, status in samples),
+        'rps': len(samples) / elapsed,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark sync views under WSGI against async views under ASGI with injected database latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--latency-ms', type=float, default=10.0,
+                            help="Delay added to every database query (default: 10).")
+        parser.add_argument('--requests', type=int, default=200,
+                            help="Requests per route and mode.")
+        parser.add_argument('--workers', type=int, default=4,
+                            help="Concurrent sync requests, i.e. Gunicorn sync workers (default: 4).")
+        parser.add_argument('--concurrency', type=int, default=64,
+                            help="Concurrent requests on the ASGI event loop (default: 64).")
+        parser.add_argument('--rows', type=int, default=1000,
+                            help="Rows per model to seed.")
+
+    def handle(self, *args, **options):
+        # One JSON line per request would bury the results table
+        logging.getLogger('portfolio.instrumentation').setLevel(logging.WARNING)
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.run(options)
+        finally:
+            analytics.flush_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def run(self, options):
+        user = seed_site()
+        seed_to(options['rows'])
+        client = Client()
+        client.force_login(user)
+        cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+        routes = [route for route in ROUTES if route.name in ASYNC_ROUTES]
+        total = options['requests']
+
+        self.stdout.write(
+            f"{options['latency_ms']:g} ms per query, {total} requests per route: "
+            f"sync with {options['workers']} workers, async with {options['concurrency']} in flight"
+        )
+        self.stdout.write(f"{'route':<18}{'status':>8}{'sync rps':>10}{'async rps':>11}"
+                          f"{'sync p50':>10}{'async p50':>11}{'sync p95':>10}{'async p95':>11}")
+        totals = {'sync': [0, 0.0], 'async': [0, 0.0]}
+        with Latency(options['latency_ms'] / 1000):
+            for route in routes:
+                path = route.url()
+                result = {}
+                for mode, pages, runner, width in (
+                    ('sync', views, run_sync, options['workers']),
+                    ('async', async_views, run_async, options['concurrency']),
+                ):
+                    with override_settings(ROOT_URLCONF=urlconf(pages)):
+                        cache.clear()
+                        started = time.perf_counter()
+                        samples = runner(path, route.query, cookie if route.login else '', total, width)
+                        elapsed = time.perf_counter() - started
+                    result[mode] = summarise(samples, elapsed)
+                    totals[mode][0] += total
+                    totals[mode][1] += elapsed
+
+                sync, async_ = result['sync'], result['async']
+                status = sync['status'] if sync['status'] == async_['status'] else f"{sync['status']}/{async_['status']}"
+                self.stdout.write(
+                    f"{route.label:<18}{status:>8}{sync['rps']:>10.1f}{async_['rps']:>11.1f}"
+                    f"{sync['p50_ms']:>10.1f}{async_['p50_ms']:>11.1f}"
+                    f"{sync['p95_ms']:>10.1f}{async_['p95_ms']:>11.1f}"
+                )
+
+        sync_rps = totals['sync'][0] / totals['sync'][1]
+        async_rps = totals['async'][0] / totals['async'][1]
+        self.stdout.write(self.style.SUCCESS(
+            f"Overall: sync {sync_rps:.1f} req/s, async {async_rps:.1f} req/s ({async_rps / sync_rps:.1f}x)"
+        ))
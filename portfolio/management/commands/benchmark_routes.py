@@ -0,0 +1,401 @@
+"""
+Benchmark every named route against synthetic data at increasing volumes.
+
+    python manage.py benchmark_routes                          # 1k, 10k and 100k rows, compare with the baseline
+    python manage.py benchmark_routes --scales 1000 --requests 50
+    python manage.py benchmark_routes --save-baseline          # record the current numbers
+    python manage.py benchmark_routes --cold                   # clear the cache before every request
+
+Like ``manage.py test``, this runs against a throwaway test database. It
+is seeded with ``bulk_create`` up to each scale in turn (N rows each of
+Project, Skill, Certification, BlogPost and PortfolioAnalytics), then
+every route in ``portfolio/urls.py`` is requested through the test client,
+dashboard routes as a logged-in superuser. Latency percentiles, query
+counts and response bytes are compared with the stored baseline and the
+command fails if any route regresses beyond ``--threshold``.
+
+Pages render with the configured static storage, so with DEBUG off run
+``build_assets`` first. Baselines are machine-specific: record one on the
+machine (or CI runner) that will do the comparing.
+"""
+import functools
+import io
+import json
+import logging
+import statistics
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from portfolio import analytics, search, stats, rollups
+from portfolio.content import process_post
+from portfolio.models import (
+    Project, Skill, Certification, BlogPost, About, SiteSettings, PortfolioAnalytics,
+)
+from portfolio.urls import urlpatterns
+
+DEFAULT_SCALES = [1_000, 10_000, 100_000]
+SEED_BATCH_SIZE = 1_000
+BENCH_USERNAME = 'benchmark'
+BENCH_PASSWORD = 'benchmark'
+
+LOREM = (
+    "Django keeps the data layer close to the views, which makes it easy to "
+    "measure how each page behaves as the tables behind it grow. "
+)
+
+
+# -----------------------------------------------------------------------------
+# Routes
+# -----------------------------------------------------------------------------
+
+class Route:
+    """One benchmarked request: a named URL, its arguments and whether it needs a login."""
+
+    def __init__(self, name, label=None, kwargs=None, query=None, login=False, logs_out=False):
+        self.name = name
+        self.label = label or name
+        self.kwargs = kwargs
+        self.query = query or {}
+        self.login = login
+        self.logs_out = logs_out
+
+    def url(self):
+        kwargs = self.kwargs() if callable(self.kwargs) else self.kwargs
+        return reverse(f'portfolio:{self.name}', kwargs=kwargs)
+
+
+def _newest_pk(queryset):
+    return {'pk': queryset.order_by('-pk').values_list('pk', flat=True).first()}
+
+
+ROUTES = [
+    Route('home'),
+    Route('about'),
+    Route('projects'),
+    Route('blogs'),
+    Route('contact'),
+    Route('search', query={'q': 'measure pages'}),
+    Route('sitemap'),
+    Route('sitemap-section', kwargs={'section': 1}),
+    Route('atom-feed'),
+    Route('healthz'),
+    Route('readyz'),
+    Route('project_details', kwargs=lambda: _newest_pk(Project.objects.filter(is_active=True))),
+    Route('blog_details', kwargs=lambda: _newest_pk(BlogPost.objects.filter(status='published'))),
+    Route('api-collection', label='api-collection:projects', kwargs={'resource_name': 'projects'}),
+    Route('api-collection', label='api-collection:skills', kwargs={'resource_name': 'skills'}),
+    Route('api-collection', label='api-collection:certifications', kwargs={'resource_name': 'certifications'}),
+    Route('api-collection', label='api-collection:posts', kwargs={'resource_name': 'posts'}),
+    Route('admin-login'),
+    Route('admin-dashboard', login=True),
+    Route('manage-projects', login=True),
+    Route('manage-skills', login=True),
+    Route('manage-blog', login=True),
+    Route('manage-about', login=True),
+    Route('manage-certifications', login=True),
+    Route('analytics-series', login=True),
+    Route('analytics-series', label='analytics-series:5y', login=True,
+          query={'start': (date.today() - timedelta(days=5 * 365)).isoformat()}),
+    Route('admin-logout', login=True, logs_out=True),
+]
+
+
+def check_route_coverage():
+    """Fail loudly when a route is added to urls.py without a benchmark entry."""
+    named = {pattern.name for pattern in urlpatterns if pattern.name}
+    missing = named - {route.name for route in ROUTES}
+    if missing:
+        raise CommandError(f"No benchmark entry for route(s): {', '.join(sorted(missing))}")
+
+
+# -----------------------------------------------------------------------------
+# Synthetic data
+# -----------------------------------------------------------------------------
+
+def _project(i, now):
+    return Project(
+        title=f"Benchmark project {i}",
+        description=LOREM * 4,
+        technologies="Python, Django, SQLite",
+        image='projects/benchmark.jpg',
+        is_featured=i % 10 == 0,
+        is_active=i % 7 != 0,
+        status='published',
+        display_order=i % 50,
+        created_at=now - timedelta(minutes=i),
+    )
+
+
+def _skill(i, now):
+    categories = [value for value, _label in Skill.CATEGORY_CHOICES]
+    return Skill(
+        name=f"Skill {i}",
+        category=categories[i % len(categories)],
+        proficiency=1 + i % 100,
+        is_featured=i % 20 == 0,
+        years_experience=1 + i % 9,
+        last_used=(now - timedelta(days=i % 365)).date(),
+    )
+
+
+def _certification(i, now):
+    return Certification(
+        title=f"Certification {i}",
+        issuing_organization="Benchmark Institute",
+        issue_date=(now - timedelta(days=i)).date(),
+        credential_url='https://example.com/credential',
+    )
+
+
+BLOG_CONTENT = "## Overview\n\n" + LOREM * 6 + "\n\n## Details\n\n" + LOREM * 6
+
+
+@functools.cache
+def _blog_derived():
+    # bulk_create skips save(); every post has the same content, so process it once
+    post = BlogPost(content=BLOG_CONTENT, excerpt=LOREM)
+    return {name: getattr(post, name) for name in process_post(post)}
+
+
+def _blog_post(i, now):
+    return BlogPost(
+        title=f"Benchmark post {i}",
+        content=BLOG_CONTENT,
+        excerpt=LOREM,
+        featured_image='blog/benchmark.jpg',
+        slug=f"benchmark-post-{i}",
+        status='published' if i % 5 else 'draft',
+        is_featured=i % 25 == 0,
+        published_date=now - timedelta(minutes=i),
+        **_blog_derived(),
+    )
+
+
+def _analytics(i, now):
+    return PortfolioAnalytics(
+        date=(now - timedelta(days=i)).date(),
+        page_views=100 + i % 400,
+        unique_visitors=20 + i % 80,
+        contact_form_submissions=i % 3,
+        resume_downloads=i % 5,
+    )
+
+
+SEEDERS = [
+    (Project, _project),
+    (Skill, _skill),
+    (Certification, _certification),
+    (BlogPost, _blog_post),
+    (PortfolioAnalytics, _analytics),
+]
+
+
+def seed_to(rows):
+    """Top every seeded model up to ``rows`` rows, building objects one batch at a time."""
+    now = timezone.now()
+    for model, build in SEEDERS:
+        existing = model.objects.count()
+        for start in range(existing, rows, SEED_BATCH_SIZE):
+            stop = min(start + SEED_BATCH_SIZE, rows)
+            with transaction.atomic():
+                # Conflicts only arise when a kept database is topped up on a later day
+                model.objects.bulk_create([build(i, now) for i in range(start, stop)], ignore_conflicts=True)
+
+    # bulk_create skips the signals that maintain these
+    if search.is_supported():
+        call_command('rebuild_search_index', stdout=io.StringIO())
+    stats.refresh_snapshot()
+    rollups.rebuild()
+
+
+def seed_site():
+    About.objects.get_or_create(
+        pk=1,
+        defaults={
+            'full_name': "Benchmark Author", 'job_title': "Developer", 'bio': LOREM,
+            'short_bio': LOREM, 'email': 'bench@example.com', 'location': "Lusaka",
+        },
+    )
+    SiteSettings.objects.get_or_create(pk=1)
+    user_model = get_user_model()
+    user = user_model.objects.filter(username=BENCH_USERNAME).first()
+    if user is None:
+        user = user_model.objects.create_superuser(BENCH_USERNAME, 'bench@example.com', BENCH_PASSWORD)
+    return user
+
+
+# -----------------------------------------------------------------------------
+# Measurement
+# -----------------------------------------------------------------------------
+
+def percentile(samples, pct):
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method='inclusive')[pct - 1]
+
+
+def response_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def measure(route, client, user, requests, cold):
+    """Request ``route`` ``requests`` times after one warm-up; returns the result dict."""
+    url = route.url()
+    timings, queries, status, size = [], [], None, 0
+    for attempt in range(requests + 1):
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url, route.query)
+            size = response_size(response)
+            elapsed = (time.perf_counter() - started) * 1000
+        status = response.status_code
+        if route.logs_out:
+            client.force_login(user)
+        if attempt == 0:
+            continue  # warm-up: fills caches and per-process state
+        timings.append(elapsed)
+        queries.append(len(captured))
+    return {
+        'status': status,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        # Median: an occasional analytics flush shouldn't count as a regression
+        'queries': statistics.median_low(queries),
+        'bytes': size,
+    }
+
+
+def regressions(result, baseline, threshold, min_delta_ms):
+    """Human-readable list of the ways ``result`` is worse than ``baseline``."""
+    found = []
+    if result['p95_ms'] > baseline['p95_ms'] * (1 + threshold) + min_delta_ms:
+        found.append(f"p95 {baseline['p95_ms']:.1f} -> {result['p95_ms']:.1f} ms")
+    if result['queries'] > baseline['queries']:
+        found.append(f"queries {baseline['queries']} -> {result['queries']}")
+    if result['bytes'] > baseline['bytes'] * (1 + threshold):
+        found.append(f"bytes {baseline['bytes']} -> {result['bytes']}")
+    return found
+
+
+class Command(BaseCommand):
+    help = "Seed synthetic data at several volumes and benchmark every route against a stored baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                            help="Rows per model to benchmark at (default: 1000 10000 100000).")
+        parser.add_argument('--requests', type=int, default=30,
+                            help="Timed requests per route and scale.")
+        parser.add_argument('--cold', action='store_true',
+                            help="Clear the cache before every request (measures uncached rendering).")
+        parser.add_argument('--baseline', default=str(Path(settings.BASE_DIR) / 'benchmarks' / 'routes.json'),
+                            help="Baseline JSON file.")
+        parser.add_argument('--save-baseline', action='store_true',
+                            help="Write this run's results as the new baseline instead of comparing.")
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help="Allowed relative growth in p95 latency and bytes (default: 0.25).")
+        parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                            help="Latency slack added to the threshold, so fast routes don't flap.")
+        parser.add_argument('--keepdb', action='store_true',
+                            help="Keep the seeded test database between runs.")
+
+    def handle(self, *args, **options):
+        check_route_coverage()
+        scales = sorted(set(options['scales']))
+        baseline_path = Path(options['baseline'])
+        baseline = {}
+        if not options['save_baseline'] and baseline_path.exists():
+            baseline = json.loads(baseline_path.read_text())
+
+        # One JSON line per request would bury the results table
+        logging.getLogger('portfolio.instrumentation').setLevel(logging.WARNING)
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False, keepdb=options['keepdb'],
+        )
+        try:
+            results = self.run(scales, options)
+        finally:
+            analytics.flush_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        if options['save_baseline']:
+            errors = [
+                f"{scale} rows, {label}: HTTP {result['status']}"
+                for scale, routes in results.items() for label, result in routes.items()
+                if result['status'] >= 400
+            ]
+            if errors:
+                raise CommandError("Not saving a baseline with failing routes:\n" + '\n'.join(errors))
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {baseline_path}"))
+            return
+
+        if not baseline:
+            self.stdout.write(self.style.WARNING(
+                f"No baseline at {baseline_path}; run with --save-baseline to record one."
+            ))
+            return
+        self.compare(results, baseline, options)
+
+    def run(self, scales, options):
+        user = seed_site()
+        anonymous, logged_in = Client(), Client()
+        logged_in.force_login(user)
+
+        results = {}
+        for scale in scales:
+            self.stdout.write(f"Seeding {scale} rows per model...")
+            seed_to(scale)
+            cache.clear()
+
+            self.stdout.write(f"{'route':<34}{'status':>7}{'p50 ms':>10}{'p95 ms':>10}"
+                              f"{'p99 ms':>10}{'queries':>9}{'bytes':>10}")
+            results[str(scale)] = {}
+            for route in ROUTES:
+                client = logged_in if route.login else anonymous
+                result = measure(route, client, user, options['requests'], options['cold'])
+                results[str(scale)][route.label] = result
+                self.stdout.write(
+                    f"{route.label:<34}{result['status']:>7}{result['p50_ms']:>10.2f}"
+                    f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+                    f"{result['queries']:>9}{result['bytes']:>10}"
+                )
+        return results
+
+    def compare(self, results, baseline, options):
+        failures = []
+        for scale, routes in results.items():
+            for label, result in routes.items():
+                if result['status'] >= 400:
+                    failures.append(f"{scale} rows, {label}: HTTP {result['status']}")
+                    continue
+                previous = baseline.get(scale, {}).get(label)
+                if previous is None:
+                    continue
+                for problem in regressions(result, previous, options['threshold'], options['min_delta_ms']):
+                    failures.append(f"{scale} rows, {label}: {problem}")
+
+        if failures:
+            for failure in failures:
+                self.stderr.write(failure)
+            raise CommandError(f"{len(failures)} regressions against {options['baseline']}.")
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
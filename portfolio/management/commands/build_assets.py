@@ -0,0 +1,25 @@
+"""
+Build the CSS/JS bundles and collect static files.
+
+    python manage.py build_assets               # bundle, then collectstatic --noinput
+    python manage.py build_assets --no-collect  # bundle only
+"""
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from portfolio import assets
+
+
+class Command(BaseCommand):
+    help = "Concatenate and minify ASSET_BUNDLES, then run collectstatic to fingerprint and precompress them."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-collect', action='store_true',
+                            help="Only build the bundles, skip collectstatic.")
+
+    def handle(self, *args, **options):
+        for name, (raw, minified) in assets.build_all().items():
+            self.stdout.write(f"{name}: {raw} -> {minified} bytes")
+
+        if not options['no_collect']:
+            call_command('collectstatic', interactive=False, verbosity=options['verbosity'])
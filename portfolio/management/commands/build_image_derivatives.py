@@ -0,0 +1,64 @@
+"""
+Backfill responsive image derivatives for existing uploads.
+
+    python manage.py build_image_derivatives --workers 4
+    python manage.py build_image_derivatives --force    # rebuild everything
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from portfolio import images
+
+
+def _build(label, pk, force):
+    """Worker entry point: build derivatives for one row."""
+    model = apps.get_model(label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return False
+    try:
+        return images.build_for_instance(instance, force=force)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Generate WebP/JPEG derivatives for existing Project, BlogPost and About images in parallel."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Worker processes (default: CPU count).")
+        parser.add_argument('--force', action='store_true',
+                            help="Rebuild derivatives even when they are up to date.")
+
+    def handle(self, *args, **options):
+        force = options['force']
+        jobs = []
+        for label, (image_field, variants_field) in images.IMAGE_FIELDS.items():
+            model = apps.get_model(label)
+            rows = model.objects.exclude(**{image_field: ''}).values_list('pk', image_field, variants_field)
+            for pk, name, variants in rows.iterator():
+                if force or (variants or {}).get('source') != name:
+                    jobs.append((label, pk))
+
+        if not jobs:
+            self.stdout.write("All image derivatives are up to date.")
+            return
+
+        # Forked workers must not share the parent's DB connections
+        connections.close_all()
+        built = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            futures = {pool.submit(_build, label, pk, force): (label, pk) for label, pk in jobs}
+            for future in as_completed(futures):
+                label, pk = futures[future]
+                try:
+                    built += bool(future.result())
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f"{label} {pk}: {exc}")
+
+        self.stdout.write(self.style.SUCCESS(f"Built derivatives for {built} images ({failed} failed)."))
@@ -0,0 +1,254 @@
+"""
+Run EXPLAIN for every query the routes issue and flag full table scans.
+
+    python manage.py explain_queries            # report
+    python manage.py explain_queries --strict   # exit non-zero on an unexpected scan (CI)
+    python manage.py explain_queries --plans    # print each plan in full
+
+Like benchmark_routes, this seeds a throwaway test database (``--rows``
+per model) and requests every route in ``portfolio/urls.py`` through the
+test client, with the cache switched off so each view runs all of its
+queries. Every distinct SELECT captured is EXPLAINed, together with the
+queries routes don't reach: background jobs and the second page of each
+keyset-paginated list.
+
+Works on SQLite (EXPLAIN QUERY PLAN) and MySQL (EXPLAIN FORMAT=JSON).
+"""
+import json
+import logging
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from portfolio import analytics, rollups
+from portfolio.management.commands.benchmark_routes import ROUTES, check_route_coverage, seed_site, seed_to
+from portfolio.models import (
+    Project, Skill, Certification, BlogPost, PortfolioAnalytics, OutboxEmail,
+)
+from portfolio.pagination import KeysetPaginator
+from portfolio.stats import content_stats_query
+from portfolio.views import DASHBOARD_PAGE_SIZE, PROJECT_ORDERING, PUBLIC_PAGE_SIZE
+
+SQLITE_SCAN_RE = re.compile(r'^SCAN (?!CONSTANT ROW)(\w+)\b(?! USING (?:COVERING )?INDEX)')
+# Literals, so the same query with other values is only explained once
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+# Reading these whole is as cheap as any index lookup
+SINGLE_ROW_TABLES = {'portfolio_about', 'portfolio_sitesettings', 'portfolio_contentstats'}
+# Captured queries whose scans or sorts are expected: (pattern, why)
+EXPECTED_PLANS = [
+    (re.compile(r'\bMATCH\b'), "full-text matches are ranked by score"),
+]
+# Routes whose every query may scan or sort: route label -> why
+EXPECTED_ROUTES = {
+    'sitemap': "lists every public row, once per content change",
+    'sitemap-section': "lists every public row, once per content change",
+}
+
+
+def _sample_row(paginator):
+    """Plausible sort-key values, used to build a page-2 cursor without real data."""
+    row = {}
+    for name in paginator.fields:
+        field = paginator._model_field(name)
+        if isinstance(field, models.DateTimeField):
+            row[name] = timezone.now()
+        elif isinstance(field, models.DateField):
+            row[name] = timezone.localdate()
+        elif isinstance(field, (models.IntegerField, models.AutoField)):
+            row[name] = 1
+        else:
+            row[name] = 'm'
+    return row
+
+
+def _keyset_pages(label, queryset, ordering, per_page):
+    paginator = KeysetPaginator(queryset, ordering, per_page=per_page)
+    second = paginator.encode_cursor(_sample_row(paginator), 'next')
+    return [
+        (f"{label} (first page)", paginator.page(None).queryset, None),
+        (f"{label} (next page)", paginator.page(second).queryset, None),
+    ]
+
+
+def _scalars(columns, params=()):
+    return f"SELECT {', '.join(columns)}", list(params)
+
+
+def background_queries():
+    """``(label, queryset or (sql, params), expected)`` for queries no route runs."""
+    today = timezone.localdate()
+    queries = [
+        ('stats snapshot refresh', _scalars(*content_stats_query()), "COUNT(*) over a whole table"),
+        ('analytics flush', PortfolioAnalytics.objects.filter(date=today), None),
+        ('rollup refresh', PortfolioAnalytics.objects.filter(date__range=(today, today))
+            .annotate(period=rollups.TRUNCATE['week']('date')).values('period')
+            .annotate(days=Count('pk')).order_by(), "groups a month of daily rows at most"),
+        ('outbox claim', OutboxEmail.objects.filter(
+            status__in=['pending', 'sending'], next_attempt_at__lte=timezone.now(),
+        ).order_by('next_attempt_at')[:50], "merges the due pending and sending rows"),
+    ]
+    queries += _keyset_pages('manage_projects', Project.objects.all(), ['-created_at'], DASHBOARD_PAGE_SIZE)
+    queries += _keyset_pages('manage_skills', Skill.objects.all(), ['category', 'name'], DASHBOARD_PAGE_SIZE)
+    queries += _keyset_pages('manage_blog', BlogPost.objects.all(), ['-published_date'], DASHBOARD_PAGE_SIZE)
+    queries += _keyset_pages('manage_certifications', Certification.objects.all(), ['-issue_date'], DASHBOARD_PAGE_SIZE)
+    queries += _keyset_pages('projects_view', Project.objects.filter(is_active=True), PROJECT_ORDERING, PUBLIC_PAGE_SIZE)
+    queries += _keyset_pages('blogs_view', BlogPost.objects.filter(status='published'), ['-published_date'], PUBLIC_PAGE_SIZE)
+    return queries
+
+
+def route_queries(user):
+    """``(label, (sql, params), expected)`` for each distinct SELECT the routes run."""
+    anonymous, logged_in = Client(), Client()
+    logged_in.force_login(user)
+    seen, queries = set(), []
+    for route in ROUTES:
+        client = logged_in if route.login else anonymous
+        url = route.url()
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url, route.query)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        if route.logs_out:
+            client.force_login(user)
+        for query in captured.captured_queries:
+            sql = query['sql']
+            shape = LITERAL_RE.sub('?', sql)
+            if not sql.lstrip().upper().startswith('SELECT') or shape in seen:
+                continue
+            seen.add(shape)
+            expected = EXPECTED_ROUTES.get(route.label) or next(
+                (why for pattern, why in EXPECTED_PLANS if pattern.search(sql)), None
+            )
+            queries.append((f"{route.label}: {_summary(sql)}", (sql, []), expected))
+    return queries
+
+
+def _summary(sql, width=70):
+    sql = ' '.join(sql.split())
+    return sql if len(sql) <= width else sql[:width - 1] + '…'
+
+
+# -----------------------------------------------------------------------------
+# Backend-specific EXPLAIN
+# -----------------------------------------------------------------------------
+
+def explain_sqlite(cursor, sql, params):
+    cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+    lines = [row[-1] for row in cursor.fetchall()]
+    scans = [match.group(1) for line in lines if (match := SQLITE_SCAN_RE.match(line))]
+    sorts = [line for line in lines if 'TEMP B-TREE' in line]
+    return lines, scans, sorts
+
+
+def _walk_mysql_plan(node, scans, sorts):
+    if isinstance(node, dict):
+        if node.get('access_type') == 'ALL':
+            scans.append(node.get('table_name', '?'))
+        if node.get('using_filesort'):
+            sorts.append('filesort')
+        for value in node.values():
+            _walk_mysql_plan(value, scans, sorts)
+    elif isinstance(node, list):
+        for value in node:
+            _walk_mysql_plan(value, scans, sorts)
+
+
+def explain_mysql(cursor, sql, params):
+    cursor.execute(f"EXPLAIN FORMAT=JSON {sql}", params)
+    plan = json.loads(cursor.fetchone()[0])
+    scans, sorts = [], []
+    _walk_mysql_plan(plan, scans, sorts)
+    return json.dumps(plan, indent=2).splitlines(), scans, sorts
+
+
+EXPLAINERS = {
+    'sqlite': explain_sqlite,
+    'mysql': explain_mysql,
+}
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN every view query and flag full table scans and temporary sorts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--strict', action='store_true',
+                            help="Fail if any query has an unexpected full scan or sort.")
+        parser.add_argument('--plans', action='store_true',
+                            help="Print every plan in full.")
+        parser.add_argument('--rows', type=int, default=1000,
+                            help="Synthetic rows per model to seed (default: 1000).")
+
+    def handle(self, *args, **options):
+        explain = EXPLAINERS.get(connection.vendor)
+        if explain is None:
+            raise CommandError(f"explain_queries supports SQLite and MySQL, not {connection.vendor}.")
+        check_route_coverage()
+
+        logging.getLogger('portfolio.instrumentation').setLevel(logging.WARNING)
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            user = seed_site()
+            seed_to(options['rows'])
+            # No cache, so every view runs all of its queries; no page-view counting;
+            # unhashed static files, so nothing has to be built first
+            with override_settings(
+                CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+                ANALYTICS_ENABLED=False,
+                ASSET_BUNDLES_ENABLED=False,
+                STORAGES={
+                    **settings.STORAGES,
+                    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+                },
+            ):
+                queries = route_queries(user) + background_queries()
+            problems = self.report(explain, queries, options)
+        finally:
+            analytics.flush_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if problems:
+            message = f"{problems} queries need attention."
+            if options['strict']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"No unexpected scans or sorts in {len(queries)} queries."))
+
+    def report(self, explain, queries, options):
+        problems = 0
+        with connection.cursor() as cursor:
+            for label, query, expected in queries:
+                if isinstance(query, tuple):
+                    sql, params = query
+                else:
+                    sql, params = query.query.sql_with_params()
+                lines, scans, sorts = explain(cursor, sql, list(params))
+                scans = [table for table in scans if table not in SINGLE_ROW_TABLES]
+
+                details = []
+                if scans:
+                    details.append(f"full scan of {', '.join(sorted(set(scans)))}")
+                if sorts:
+                    details.append("temporary sort")
+                flagged = bool(details) and not expected
+                if flagged:
+                    problems += 1
+                    self.stdout.write(self.style.WARNING(f"FLAG  {label}: {'; '.join(details)}"))
+                elif details:
+                    self.stdout.write(f"ok    {label} ({'; '.join(details)}: {expected})")
+                else:
+                    self.stdout.write(f"ok    {label}")
+
+                if options['plans'] or flagged:
+                    for line in lines:
+                        self.stdout.write(f"        {line}")
+        return problems
@@ -0,0 +1,254 @@
+"""
+Stream portfolio content from NDJSON or CSV into the database.
+
+    python manage.py import_content skill skills.csv
+    python manage.py import_content blogpost posts.ndjson --chunk-size 500
+    zcat analytics.jsonl.gz | python manage.py import_content analytics - --format ndjson
+    python manage.py import_content project projects.csv --dry-run
+
+Rows are read one at a time and validated with the model's own field
+validation (``full_clean``), then written with ``bulk_create`` one chunk
+per transaction, so memory stays flat however large the input is. Blog
+posts are upserted on ``slug`` and analytics on ``date``; other models are
+inserted. Invalid rows are reported by line and skipped (``--strict``
+stops at the first one instead). Bulk writes skip the model signals, so
+analytics rollups are refreshed per chunk and the search index and
+dashboard statistics are rebuilt once at the end.
+"""
+import csv
+import json
+import sys
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+
+from portfolio import search, stats, rollups, fragments
+from portfolio.content import process_post
+from portfolio.db import bulk_upsert
+from portfolio.models import Project, Skill, Certification, BlogPost, PortfolioAnalytics
+
+MODELS = {
+    'project': Project,
+    'skill': Skill,
+    'certification': Certification,
+    'blogpost': BlogPost,
+    'post': BlogPost,
+    'analytics': PortfolioAnalytics,
+    'portfolioanalytics': PortfolioAnalytics,
+}
+
+# Upserted on these fields; other models are insert-only
+NATURAL_KEYS = {
+    BlogPost: ['slug'],
+    PortfolioAnalytics: ['date'],
+}
+
+MAX_REPORTED_ERRORS = 50
+
+# CSV spellings accepted for boolean columns
+BOOLEAN_STRINGS = {
+    'true': True, 'yes': True, 'y': True, 't': True, '1': True,
+    'false': False, 'no': False, 'n': False, 'f': False, '0': False,
+}
+
+
+# -----------------------------------------------------------------------------
+# Readers: yield (line number, row dict)
+# -----------------------------------------------------------------------------
+
+def read_ndjson(stream):
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield number, exc
+            continue
+        yield number, row if isinstance(row, dict) else ValueError("Each line must be a JSON object.")
+
+
+def read_csv(stream):
+    # Line 1 is the header
+    for number, row in enumerate(csv.DictReader(stream), start=2):
+        yield number, row
+
+
+READERS = {
+    'ndjson': read_ndjson,
+    'csv': read_csv,
+}
+
+
+def detect_format(path):
+    return 'csv' if path.lower().endswith('.csv') else 'ndjson'
+
+
+# -----------------------------------------------------------------------------
+# Row validation
+# -----------------------------------------------------------------------------
+
+class RowBuilder:
+    """Turn input rows into validated, unsaved model instances."""
+
+    def __init__(self, model):
+        self.model = model
+        self.fields = {
+            field.name: field for field in model._meta.concrete_fields
+        }
+
+    def normalise(self, row):
+        """Map CSV-style strings: empty to NULL or the field default, 'yes'/'no' etc. to booleans."""
+        values = {}
+        for name, value in row.items():
+            field = self.fields.get(name)
+            if value == '' and field is not None:
+                if field.null:
+                    value = None
+                elif field.has_default():
+                    continue
+            elif isinstance(value, str) and isinstance(field, models.BooleanField):
+                value = BOOLEAN_STRINGS.get(value.strip().lower(), value)
+            values[name] = value
+        return values
+
+    def build(self, row):
+        """Return ``(instance, names of the fields the row sets)``."""
+        unknown = sorted(name for name in row if name not in self.fields)
+        if unknown:
+            raise ValidationError({name: "Unknown field." for name in unknown})
+        values = self.normalise(row)
+        instance = self.model(**values)
+        # Uniqueness is left to the database: natural keys are upserted
+        instance.full_clean(validate_unique=False, validate_constraints=False)
+        provided = set(values)
+        if self.model is BlogPost:
+            provided.update(process_post(instance))
+        provided.update(
+            name for name, field in self.fields.items() if getattr(field, 'auto_now', False)
+        )
+        return instance, frozenset(provided)
+
+
+def format_error(error):
+    if isinstance(error, ValidationError) and hasattr(error, 'message_dict'):
+        return '; '.join(f"{field}: {' '.join(messages)}" for field, messages in error.message_dict.items())
+    if isinstance(error, ValidationError):
+        return ' '.join(error.messages)
+    return str(error)
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = "Stream NDJSON or CSV rows into Project, Skill, Certification, BlogPost or PortfolioAnalytics."
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(MODELS))
+        parser.add_argument('path', help="Input file, or - for stdin.")
+        parser.add_argument('--format', choices=sorted(READERS), default=None,
+                            help="Input format (default: from the file extension, else ndjson).")
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help="Rows per bulk_create and transaction.")
+        parser.add_argument('--strict', action='store_true',
+                            help="Stop at the first invalid row instead of skipping it.")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Validate every row without writing anything.")
+
+    def handle(self, *args, **options):
+        model = MODELS[options['model']]
+        path = options['path']
+        reader = READERS[options['format'] or detect_format(path)]
+
+        if path == '-':
+            self.load(model, reader(sys.stdin), options)
+        else:
+            try:
+                with open(path, encoding='utf-8', newline='') as stream:
+                    self.load(model, reader(stream), options)
+            except OSError as exc:
+                raise CommandError(f"Cannot read {path}: {exc}")
+
+    def load(self, model, rows, options):
+        builder = RowBuilder(model)
+        natural_key = NATURAL_KEYS.get(model)
+
+        written = invalid = 0
+        for chunk in chunks(rows, options['chunk_size']):
+            instances = {}
+            for number, row in chunk:
+                try:
+                    if isinstance(row, Exception):
+                        raise row
+                    instance, provided = builder.build(row)
+                except (ValidationError, ValueError, TypeError) as exc:
+                    invalid += 1
+                    if options['strict']:
+                        raise CommandError(f"Line {number}: {format_error(exc)}")
+                    if invalid <= MAX_REPORTED_ERRORS:
+                        self.stderr.write(f"Line {number}: {format_error(exc)}")
+                    continue
+                # A later row for the same natural key wins (one upsert per key per statement)
+                key = tuple(getattr(instance, name) for name in natural_key) if natural_key else number
+                instances[key] = (instance, provided)
+
+            if options['dry_run'] or not instances:
+                written += len(instances)
+                continue
+            with transaction.atomic():
+                if natural_key:
+                    self.upsert(model, natural_key, instances.values())
+                else:
+                    model.objects.bulk_create(instance for instance, _provided in instances.values())
+                if model is PortfolioAnalytics:
+                    rollups.schedule_refresh(date for (date,) in instances)
+            written += len(instances)
+            if options['verbosity'] > 1:
+                self.stdout.write(f"{written} rows written")
+
+        if invalid > MAX_REPORTED_ERRORS:
+            self.stderr.write(f"... and {invalid - MAX_REPORTED_ERRORS} more invalid rows")
+
+        if written and not options['dry_run']:
+            self.refresh_derived(model)
+
+        verb = "validated" if options['dry_run'] else "imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{written} {model._meta.verbose_name_plural} {verb}, {invalid} invalid rows skipped."
+        ))
+
+    def upsert(self, model, natural_key, rows):
+        """
+        Insert ``rows`` or update the existing row with the same natural key.
+
+        Only the fields present in the input are overwritten, so e.g. a
+        post's view_count survives a re-import that doesn't mention it.
+        """
+        groups = {}
+        for instance, provided in rows:
+            groups.setdefault(provided, []).append(instance)
+        for provided, instances in groups.items():
+            update_fields = sorted(provided - set(natural_key) - {model._meta.pk.name})
+            if not update_fields:
+                model.objects.bulk_create(instances, ignore_conflicts=True)
+                continue
+            bulk_upsert(model, instances, natural_key, update_fields)
+
+    def refresh_derived(self, model):
+        """Redo what the skipped post_save signals would have done."""
+        if fragments.is_tracked(model):
+            fragments.bump(model)
+        if model in (Project, BlogPost) and search.is_supported():
+            call_command('rebuild_search_index', stdout=self.stdout)
+        if model in (Project, Skill, Certification, BlogPost) and stats.snapshot_enabled():
+            stats.refresh_snapshot()
+        if model in (Project, BlogPost):
+            self.stdout.write("Run build_image_derivatives to create responsive images for new uploads.")
@@ -0,0 +1,36 @@
+"""
+Drain the email outbox.
+
+    python manage.py process_outbox            # run forever
+    python manage.py process_outbox --once     # drain what is due and exit
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio.outbox import deliver_batch
+
+
+class Command(BaseCommand):
+    help = "Send queued outbox emails in batches, reusing one SMTP connection per batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help="Seconds to sleep when nothing is due.")
+        parser.add_argument('--once', action='store_true',
+                            help="Exit once no more emails are due.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        try:
+            while True:
+                sent, failed = deliver_batch(batch_size)
+                if sent or failed:
+                    self.stdout.write(f"Outbox batch: {sent} sent, {failed} failed")
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Outbox worker stopped.")
@@ -0,0 +1,22 @@
+"""
+Print a token that profiles a single request.
+
+    python manage.py profile_token
+    curl 'https://example.com/dashboard/?_profile=<token>'
+
+Needs INSTRUMENTATION_PROFILING on; the token expires after
+INSTRUMENTATION_PROFILE_TOKEN_MAX_AGE seconds.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from portfolio import instrumentation
+
+
+class Command(BaseCommand):
+    help = "Print a signed ?_profile= token for on-demand request profiling."
+
+    def handle(self, *args, **options):
+        if not settings.INSTRUMENTATION_PROFILING:
+            self.stderr.write(self.style.WARNING("INSTRUMENTATION_PROFILING is off; the token will be ignored."))
+        self.stdout.write(f"?{instrumentation.PROFILE_PARAM}={instrumentation.profile_token()}")
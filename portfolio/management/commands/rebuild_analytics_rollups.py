@@ -0,0 +1,19 @@
+"""
+Recompute the weekly and monthly analytics rollups from the daily rows.
+
+    python manage.py rebuild_analytics_rollups
+
+Rollups are kept current as daily rows change; this is for repairs, e.g.
+after editing PortfolioAnalytics directly in the database.
+"""
+from django.core.management.base import BaseCommand
+
+from portfolio import rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the AnalyticsRollup table from PortfolioAnalytics."
+
+    def handle(self, *args, **options):
+        count = rollups.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} rollup rows."))
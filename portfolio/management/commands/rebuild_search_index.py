@@ -0,0 +1,48 @@
+"""
+Rebuild the full-text search index from scratch.
+
+    python manage.py rebuild_search_index
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from portfolio import search
+from portfolio.models import BlogPost, Project
+
+
+class Command(BaseCommand):
+    help = "Repopulate the portfolio_search full-text index from published posts and active projects."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            raise CommandError("Full-text search needs SQLite (FTS5) or MySQL.")
+
+        chunk_size = options['chunk_size']
+        sources = [
+            BlogPost.objects.filter(status='published')
+            .only('pk', 'status', 'title', 'content_html', 'excerpt'),
+            Project.objects.filter(is_active=True)
+            .only('pk', 'is_active', 'title', 'description', 'technologies'),
+        ]
+
+        total = 0
+        with transaction.atomic():
+            search.clear_index()
+            for queryset in sources:
+                chunk = []
+                for instance in queryset.order_by('pk').iterator(chunk_size=chunk_size):
+                    kind, title, body, extra = search.document_for(instance)
+                    chunk.append((kind, instance.pk, title, body, extra))
+                    if len(chunk) >= chunk_size:
+                        search.insert_documents(chunk)
+                        total += len(chunk)
+                        chunk = []
+                if chunk:
+                    search.insert_documents(chunk)
+                    total += len(chunk)
+        search.optimize_index()
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} documents."))
@@ -0,0 +1,191 @@
+"""
+Pre-render the public portfolio into a static HTML tree.
+
+    python manage.py render_static                      # incremental build into STATIC_SITE_ROOT
+    python manage.py render_static --force --workers 8  # re-render everything
+
+Every public URL (home, about, projects, blogs and one detail page per
+active Project and published BlogPost) is rendered through the Django test
+client in worker processes and written as ``<path>/index.html``. The
+paginated lists are followed page by page: page ``n`` of ``/projects/`` is
+written to ``/projects/page/<n>/`` and its previous/next links are rewritten
+to those paths, since a static server ignores ``?cursor=``. A
+manifest records what each page was rendered from, so later runs only
+re-render pages whose source rows changed and delete pages whose rows are
+gone. Set SERVE_STATIC_SITE=True to let WhiteNoise serve the tree.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Max
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from portfolio.caching import content_freshness
+from portfolio.models import Project, BlogPost, About, SiteSettings
+from portfolio.views import public_posts_paginator, public_projects_paginator
+
+MANIFEST_NAME = '.render-manifest.json'
+
+# Paginated public lists: URL name -> the paginator its view pages with
+LIST_PAGES = {
+    'projects': public_projects_paginator,
+    'blogs': public_posts_paginator,
+}
+# Previous/next links rendered by portfolio/partials/pagination.html
+PAGE_LINK_RE = re.compile(r'href="\?cursor=[^"]*" rel="(prev|next)"')
+
+_client = None
+
+
+def _init_worker(host):
+    global _client
+    # Rendering for the export must not count as visits
+    override_settings(ANALYTICS_ENABLED=False).enable()
+    _client = Client(HTTP_HOST=host)
+
+
+def _render(job):
+    """Worker: render one page and write it to disk. Returns (path, status)."""
+    path, url, links, target = job
+    response = _client.get(url)
+    if response.status_code == 200:
+        content = response.content
+        if links:
+            content = PAGE_LINK_RE.sub(
+                lambda match: f'href="{links[match.group(1)]}" rel="{match.group(1)}"', content.decode()
+            ).encode()
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + '.tmp')
+        tmp.write_bytes(content)
+        os.replace(tmp, target)
+    return path, response.status_code
+
+
+def output_path(root, url):
+    return root / url.strip('/') / 'index.html'
+
+
+def layout_fingerprint():
+    """Changes to site-wide rows and templates invalidate every page."""
+    stamps = [
+        About.objects.aggregate(m=Max('updated_at'))['m'],
+        SiteSettings.objects.aggregate(m=Max('updated_at'))['m'],
+    ]
+    digest = hashlib.md5(usedforsecurity=False)
+    for stamp in stamps:
+        digest.update(str(stamp).encode())
+    templates = Path(settings.BASE_DIR) / 'portfolio' / 'templates' / 'portfolio'
+    for template in sorted(templates.rglob('*.html')):
+        digest.update(template.read_bytes())
+    return digest.hexdigest()
+
+
+def list_pages(name):
+    """``[(path, url to render, {rel: path} of its page links)]`` for every page of a paginated list."""
+    base = reverse(f'portfolio:{name}')
+    paths, urls = [base], [base]
+    page = LIST_PAGES[name]().page()
+    while page.has_next:
+        cursor = page.next_cursor
+        paths.append(f"{base}page/{len(paths) + 1}/")
+        urls.append(f"{base}?cursor={quote(cursor)}")
+        page = LIST_PAGES[name]().page(cursor)
+    pages = []
+    for index, (path, url) in enumerate(zip(paths, urls)):
+        links = {
+            'prev': paths[index - 1] if index > 0 else None,
+            'next': paths[index + 1] if index + 1 < len(paths) else None,
+        }
+        pages.append((path, url, links))
+    return pages
+
+
+def collect_pages():
+    """Return {path: (url to render, page links, source fingerprint)} for every public page."""
+    layout = layout_fingerprint()
+    _last_modified, content = content_freshness()
+    pages = {}
+    for name in ('home', 'about'):
+        pages[reverse(f'portfolio:{name}')] = (reverse(f'portfolio:{name}'), None, f"{layout}|{content}")
+    for name in LIST_PAGES:
+        for path, url, links in list_pages(name):
+            pages[path] = (url, links, f"{layout}|{content}")
+    for pk, updated_at in Project.objects.filter(is_active=True).values_list('pk', 'updated_at').iterator():
+        url = reverse('portfolio:project_details', args=[pk])
+        pages[url] = (url, None, f"{layout}|{updated_at}")
+    for pk, updated_at in BlogPost.objects.filter(status='published').values_list('pk', 'updated_at').iterator():
+        url = reverse('portfolio:blog_details', args=[pk])
+        pages[url] = (url, None, f"{layout}|{updated_at}")
+    return pages
+
+
+class Command(BaseCommand):
+    help = "Render every public page to static HTML, re-rendering only pages whose content changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None,
+                            help="Output directory (default: STATIC_SITE_ROOT).")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Worker processes (default: CPU count).")
+        parser.add_argument('--force', action='store_true',
+                            help="Re-render every page, ignoring the manifest.")
+        parser.add_argument('--host', default=None,
+                            help="Host header to render with (default: first ALLOWED_HOSTS entry).")
+
+    def handle(self, *args, **options):
+        root = Path(options['output'] or settings.STATIC_SITE_ROOT)
+        host = options['host'] or (settings.ALLOWED_HOSTS or ['localhost'])[0]
+        root.mkdir(parents=True, exist_ok=True)
+        manifest_path = root / MANIFEST_NAME
+
+        previous = {}
+        if manifest_path.exists() and not options['force']:
+            previous = json.loads(manifest_path.read_text())
+
+        pages = collect_pages()
+        jobs = [
+            (path, url, links, str(output_path(root, path)))
+            for path, (url, links, fingerprint) in pages.items()
+            if previous.get(path) != fingerprint or not output_path(root, path).exists()
+        ]
+
+        # Pages whose rows were deleted or unpublished, and list pages past the new last one
+        removed = [path for path in previous if path not in pages]
+        for path in removed:
+            page_dir = output_path(root, path).parent
+            if page_dir != root:
+                shutil.rmtree(page_dir, ignore_errors=True)
+
+        failed = []
+        if jobs:
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=options['workers'], initializer=_init_worker, initargs=(host,)
+            ) as pool:
+                for path, status in pool.map(_render, jobs, chunksize=8):
+                    if status != 200:
+                        failed.append(path)
+                        self.stderr.write(f"{path}: HTTP {status}")
+
+        # Failed pages are left out of the manifest so the next run retries them
+        manifest = {path: fingerprint for path, (_url, _links, fingerprint) in pages.items() if path not in failed}
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered {len(jobs) - len(failed)} of {len(pages)} pages "
+            f"({len(pages) - len(jobs)} unchanged, {len(removed)} removed) into {root}"
+        ))
+        if failed:
+            raise CommandError(f"{len(failed)} pages failed to render.")
@@ -0,0 +1,56 @@
+"""
+Re-run the Markdown content pipeline over existing blog posts.
+
+    python manage.py reprocess_posts
+    python manage.py reprocess_posts --batch-size 500
+
+Needed after changing the pipeline (portfolio/content.py); saving a post
+processes it automatically. Only posts whose output changed are written,
+and their updated_at is bumped so cached pages are refreshed.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from portfolio import fragments
+from portfolio.content import process_post
+from portfolio.models import BlogPost
+
+DERIVED_FIELDS = ['content_html', 'content_toc', 'word_count', 'read_time', 'excerpt']
+
+
+class Command(BaseCommand):
+    help = "Re-render Markdown, TOC, word count, read time and generated excerpts for every blog post."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = BlogPost.objects.only('pk', 'content', *DERIVED_FIELDS).order_by('pk')
+        seen = changed = 0
+        batch = []
+
+        def write(batch):
+            with transaction.atomic():
+                BlogPost.objects.bulk_update(batch, DERIVED_FIELDS + ['updated_at'])
+
+        for post in queryset.iterator(chunk_size=batch_size):
+            seen += 1
+            before = [getattr(post, name) for name in DERIVED_FIELDS]
+            process_post(post)
+            if [getattr(post, name) for name in DERIVED_FIELDS] == before:
+                continue
+            post.updated_at = timezone.now()
+            batch.append(post)
+            if len(batch) >= batch_size:
+                write(batch)
+                changed += len(batch)
+                batch = []
+        if batch:
+            write(batch)
+            changed += len(batch)
+        if changed:
+            fragments.bump(BlogPost)
+
+        self.stdout.write(self.style.SUCCESS(f"Reprocessed {seen} posts, {changed} changed."))
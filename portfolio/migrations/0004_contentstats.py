@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0003_about_portfolioanalytics_sitesettings_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('projects_count', models.IntegerField(default=0)),
+                ('featured_projects_count', models.IntegerField(default=0)),
+                ('blog_count', models.IntegerField(default=0)),
+                ('skills_count', models.IntegerField(default=0)),
+                ('certifications_count', models.IntegerField(default=0)),
+                ('skill_category_counts', models.JSONField(blank=True, default=dict)),
+                ('last_update', models.DateTimeField(blank=True, null=True)),
+                ('about_complete', models.BooleanField(default=False)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Content Stats',
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:44
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count
+
+COUNTER_FIELDS = ['page_views', 'unique_visitors', 'contact_form_submissions', 'resume_downloads']
+
+
+def merge_duplicate_dates(apps, schema_editor):
+    """Fold rows sharing a date into the oldest one, so the unique index can be built."""
+    PortfolioAnalytics = apps.get_model('portfolio', 'PortfolioAnalytics')
+    duplicated = (
+        PortfolioAnalytics.objects.values('date').annotate(rows=Count('pk')).filter(rows__gt=1)
+        .order_by().values_list('date', flat=True)
+    )
+    for date in list(duplicated):
+        keep, *extra = PortfolioAnalytics.objects.filter(date=date).order_by('pk')
+        for row in extra:
+            for field in COUNTER_FIELDS:
+                setattr(keep, field, getattr(keep, field) + getattr(row, field))
+        keep.save(update_fields=COUNTER_FIELDS)
+        PortfolioAnalytics.objects.filter(pk__in=[row.pk for row in extra]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0005_outboxemail'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_dates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='portfolioanalytics',
+            name='date',
+            field=models.DateField(default=django.utils.timezone.now, unique=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0006_portfolioanalytics_unique_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='about',
+            name='profile_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized copies of profile_image'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='featured_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized copies of featured_image'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized copies of image'),
+        ),
+    ]
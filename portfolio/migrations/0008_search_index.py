@@ -0,0 +1,53 @@
+from django.db import migrations
+
+
+def create_search_table(apps, schema_editor):
+    from portfolio.search import BACKENDS
+
+    backend = BACKENDS.get(schema_editor.connection.vendor)
+    if backend is None:
+        return
+    for statement in backend.create_sql:
+        schema_editor.execute(statement)
+
+
+def drop_search_table(apps, schema_editor):
+    from portfolio.search import BACKENDS
+
+    backend = BACKENDS.get(schema_editor.connection.vendor)
+    if backend is None:
+        return
+    for statement in backend.drop_sql:
+        schema_editor.execute(statement)
+
+
+def populate_search_table(apps, schema_editor):
+    from portfolio.search import BACKENDS
+
+    backend = BACKENDS.get(schema_editor.connection.vendor)
+    if backend is None:
+        return
+    BlogPost = apps.get_model('portfolio', 'BlogPost')
+    Project = apps.get_model('portfolio', 'Project')
+    rows = [
+        ('blog', post.pk, post.title, post.content, post.excerpt)
+        for post in BlogPost.objects.filter(status='published')
+    ] + [
+        ('project', project.pk, project.title, project.description, project.technologies)
+        for project in Project.objects.filter(is_active=True)
+    ]
+    if rows:
+        with schema_editor.connection.cursor() as cursor:
+            backend().insert(cursor, rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0007_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+        migrations.RunPython(populate_search_table, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:01
+
+import html as html_lib
+import math
+import re
+
+import markdown
+import nh3
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+# A frozen copy of portfolio.content as of this migration, so later changes to
+# the pipeline don't change what this migration does. reprocess_posts applies
+# the current pipeline.
+ALLOWED_TAGS = {
+    'a', 'abbr', 'blockquote', 'br', 'code', 'dd', 'del', 'div', 'dl', 'dt', 'em',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'img', 'li', 'ol', 'p', 'pre', 'strong',
+    'sub', 'sup', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'abbr': {'title'},
+    'code': {'class'},
+    'img': {'src', 'alt', 'title', 'width', 'height'},
+    'li': {'id'},
+    'sup': {'id'},
+    'td': {'align'},
+    'th': {'align'},
+    **{f'h{level}': {'id'} for level in range(1, 7)},
+}
+WORD_RE = re.compile(r'\w+(?:[\'’-]\w+)*', re.UNICODE)
+
+
+def toc_entry(token):
+    return {
+        'level': token['level'],
+        'id': token['id'],
+        'title': html_lib.unescape(strip_tags(token['name'])),
+        'children': [toc_entry(child) for child in token['children']],
+    }
+
+
+def process_post(post):
+    md = markdown.Markdown(
+        extensions=['extra', 'sane_lists', 'toc'],
+        extension_configs={'toc': {'permalink': False, 'toc_depth': '2-4'}},
+    )
+    html = nh3.clean(
+        md.convert(post.content or ''),
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        url_schemes={'http', 'https', 'mailto'},
+        link_rel='noopener noreferrer',
+    )
+    text = html_lib.unescape(strip_tags(html))
+    post.content_html = html
+    post.content_toc = [toc_entry(token) for token in md.toc_tokens]
+    post.word_count = len(WORD_RE.findall(text))
+    post.read_time = max(1, math.ceil(post.word_count / 200))
+    if not (post.excerpt or '').strip():
+        excerpt = Truncator(' '.join(text.split())).words(40, truncate='…')
+        post.excerpt = Truncator(excerpt).chars(300, truncate='…')
+
+
+def process_existing_posts(apps, schema_editor):
+    BlogPost = apps.get_model('portfolio', 'BlogPost')
+    batch = []
+    for post in BlogPost.objects.order_by('pk').iterator(chunk_size=200):
+        process_post(post)
+        batch.append(post)
+        if len(batch) >= 200:
+            BlogPost.objects.bulk_update(batch, ['content_html', 'content_toc', 'word_count', 'read_time', 'excerpt'])
+            batch = []
+    if batch:
+        BlogPost.objects.bulk_update(batch, ['content_html', 'content_toc', 'word_count', 'read_time', 'excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0009_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='content_toc',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='blogpost',
+            name='content',
+            field=models.TextField(help_text='Markdown'),
+        ),
+        migrations.AlterField(
+            model_name='blogpost',
+            name='excerpt',
+            field=models.TextField(blank=True, help_text='Leave blank to use the opening of the post', max_length=300),
+        ),
+        migrations.AlterField(
+            model_name='blogpost',
+            name='read_time',
+            field=models.IntegerField(default=5, editable=False, help_text='Estimated reading time in minutes, computed from content'),
+        ),
+        migrations.RunPython(process_existing_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:05
+
+from django.db import migrations, models
+
+
+def backfill_rollups(apps, schema_editor):
+    from portfolio.rollups import rebuild
+
+    rebuild(apps.get_model('portfolio', 'PortfolioAnalytics'), apps.get_model('portfolio', 'AnalyticsRollup'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0010_blogpost_content_pipeline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('week', 'ISO week'), ('month', 'Month')], max_length=10)),
+                ('period_start', models.DateField(help_text='Monday of the ISO week, or the first of the month')),
+                ('page_views', models.IntegerField(default=0)),
+                ('unique_visitors', models.IntegerField(default=0, help_text='Sum of the daily unique visitor counts')),
+                ('contact_form_submissions', models.IntegerField(default=0)),
+                ('resume_downloads', models.IntegerField(default=0)),
+                ('days', models.IntegerField(default=0, help_text='Daily rows included')),
+            ],
+            options={
+                'verbose_name_plural': 'Analytics Rollups',
+                'ordering': ['granularity', 'period_start'],
+                'constraints': [models.UniqueConstraint(fields=('granularity', 'period_start'), name='analytics_rollup_period_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 21:00
+
+from html import unescape
+
+from django.db import migrations
+from django.utils.html import strip_tags
+
+
+def reindex_posts_as_text(apps, schema_editor):
+    """Replace the Markdown indexed for published posts with the text of their rendered HTML."""
+    from portfolio.search import BACKENDS
+
+    backend = BACKENDS.get(schema_editor.connection.vendor)
+    if backend is None:
+        return
+    backend = backend()
+    BlogPost = apps.get_model('portfolio', 'BlogPost')
+    posts = BlogPost.objects.filter(status='published').only('pk', 'title', 'content_html', 'excerpt')
+    with schema_editor.connection.cursor() as cursor:
+        for post in posts.iterator(chunk_size=500):
+            backend.delete(cursor, 'blog', post.pk)
+            backend.insert(cursor, [('blog', post.pk, post.title, unescape(strip_tags(post.content_html)), post.excerpt)])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0012_outbox_sending_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(reindex_posts_as_text, migrations.RunPython.noop),
+    ]
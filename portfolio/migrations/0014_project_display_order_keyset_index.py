@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-18 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0013_search_index_plain_text'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='project',
+            name='project_active_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['is_active', 'display_order', '-created_at', 'id'], name='project_active_order_idx'),
+        ),
+    ]
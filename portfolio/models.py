@@ -1,8 +1,15 @@
 # portfolio/models.py
-from django.db import models
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction, IntegrityError
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+from .content import process_post
+
 class Project(models.Model):
     PROJECT_STATUS = [
         ('draft', 'Draft'),
@@ -14,6 +21,7 @@ class Project(models.Model):
     description = models.TextField()
     technologies = models.CharField(max_length=200)
     image = models.ImageField(upload_to='projects/')
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized copies of image")
     github_link = models.URLField(blank=True)
     live_demo_link = models.URLField(blank=True)
     
@@ -28,6 +36,18 @@ class Project(models.Model):
 
     class Meta:
         ordering = ['display_order', '-created_at']
+        indexes = [
+            # Default ordering
+            models.Index(fields=['display_order', '-created_at'], name='project_display_order_idx'),
+            # Public list / API: active projects in display order (id: the keyset tie-breaker)
+            models.Index(fields=['is_active', 'display_order', '-created_at', 'id'], name='project_active_order_idx'),
+            # manage_projects pages (id: the keyset tie-breaker)
+            models.Index(fields=['created_at', 'id'], name='project_created_idx'),
+            # Dashboard recent projects and MAX(updated_at) validators
+            models.Index(fields=['updated_at'], name='project_updated_idx'),
+            # Featured count on the dashboard (partial: featured rows only)
+            models.Index(fields=['is_featured'], condition=models.Q(is_featured=True), name='project_featured_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -62,6 +82,12 @@ class Skill(models.Model):
     
     class Meta:
         ordering = ['category', '-proficiency', 'name']
+        indexes = [
+            # Default ordering; also serves per-category counts
+            models.Index(fields=['category', '-proficiency', 'name'], name='skill_category_prof_idx'),
+            # manage_skills pages and the skills API
+            models.Index(fields=['category', 'name', 'id'], name='skill_category_name_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -80,6 +106,9 @@ class Certification(models.Model):
     
     class Meta:
         ordering = ['-issue_date']
+        indexes = [
+            models.Index(fields=['issue_date', 'id'], name='cert_issue_date_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -98,15 +127,20 @@ class BlogPost(models.Model):
     ]
     
     title = models.CharField(max_length=200)
-    content = models.TextField()
-    excerpt = models.TextField(max_length=300)
+    content = models.TextField(help_text="Markdown")
+    excerpt = models.TextField(max_length=300, blank=True, help_text="Leave blank to use the opening of the post")
+    # Derived from content on save (portfolio/content.py)
+    content_html = models.TextField(blank=True, editable=False)
+    content_toc = models.JSONField(default=list, blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
     featured_image = models.ImageField(upload_to='blog/')
+    featured_image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized copies of featured_image")
     slug = models.SlugField(unique=True)
     
     # Enhanced fields for dashboard
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
     is_featured = models.BooleanField(default=False, help_text="Feature this post on the homepage")
-    read_time = models.IntegerField(default=5, help_text="Estimated reading time in minutes")
+    read_time = models.IntegerField(default=5, editable=False, help_text="Estimated reading time in minutes, computed from content")
     view_count = models.IntegerField(default=0, help_text="Number of times this post has been viewed")
     
     published_date = models.DateTimeField(default=timezone.now)
@@ -114,10 +148,35 @@ class BlogPost(models.Model):
     
     class Meta:
         ordering = ['-published_date']
+        indexes = [
+            # Default ordering and manage_blog pages
+            models.Index(fields=['published_date', 'id'], name='blog_published_idx'),
+            # Public list / API: published posts, newest first
+            models.Index(fields=['status', 'published_date', 'id'], name='blog_status_published_idx'),
+            # MAX(updated_at) validators
+            models.Index(fields=['updated_at'], name='blog_updated_idx'),
+            # Featured posts (partial: featured rows only)
+            models.Index(fields=['published_date'], condition=models.Q(is_featured=True), name='blog_featured_idx'),
+        ]
     
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # Render Markdown once here so pages never parse it per request
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields or 'excerpt' in update_fields:
+            derived = process_post(self)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | set(derived)
+        return super().save(*args, **kwargs)
+
+    @property
+    def live_view_count(self):
+        """View count including views still buffered in this process"""
+        from .analytics import live_view_count  # Import here to avoid circular imports
+        return live_view_count(self)
+
 # New model for About section management
 class About(models.Model):
     full_name = models.CharField(max_length=200)
@@ -130,6 +189,7 @@ class About(models.Model):
     location = models.CharField(max_length=100)
     
     profile_image = models.ImageField(upload_to='about/', blank=True)
+    profile_image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized copies of profile_image")
     resume = models.FileField(upload_to='resumes/', blank=True, help_text="Upload your CV/Resume")
     
     # Social links
@@ -162,7 +222,7 @@ class About(models.Model):
 
 # New model for tracking portfolio analytics
 class PortfolioAnalytics(models.Model):
-    date = models.DateField(default=timezone.now)
+    date = models.DateField(default=timezone.now, unique=True)
     page_views = models.IntegerField(default=0)
     unique_visitors = models.IntegerField(default=0)
     contact_form_submissions = models.IntegerField(default=0)
@@ -175,6 +235,25 @@ class PortfolioAnalytics(models.Model):
     def __str__(self):
         return f"Analytics - {self.date}"
 
+    @classmethod
+    def increment(cls, date=None, **deltas):
+        """Add ``deltas`` to the counters of ``date`` with a single UPDATE, creating the row if needed."""
+        from .rollups import schedule_refresh  # Import here to avoid circular imports
+
+        date = date or timezone.now().date()
+        updates = {field: models.F(field) + amount for field, amount in deltas.items()}
+        if cls.objects.filter(date=date).update(**updates):
+            # .update() sends no post_save, so the rollups are refreshed here
+            schedule_refresh([date])
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(date=date, **deltas)
+        except IntegrityError:
+            # Another worker created today's row first
+            cls.objects.filter(date=date).update(**updates)
+            schedule_refresh([date])
+
 # New model for site settings
 class SiteSettings(models.Model):
     site_name = models.CharField(max_length=100, default="Jonas Portfolio")
@@ -192,12 +271,138 @@ class SiteSettings(models.Model):
     
     def save(self, *args, **kwargs):
         # Ensure only one settings instance exists
-        if not self.pk and SiteSettings.objects.exists():
-            # Update the existing instance instead of creating new one
-            existing = SiteSettings.objects.first()
-            existing.site_name = self.site_name
-            existing.site_description = self.site_description
-            existing.maintenance_mode = self.maintenance_mode
-            existing.google_analytics_id = self.google_analytics_id
-            return existing.save(*args, **kwargs)
-        return super().save(*args, **kwargs)
\ No newline at end of file
+        if not self.pk:
+            existing_pk = SiteSettings.objects.values_list('pk', flat=True).first()
+            if existing_pk is not None:
+                # Update the existing instance instead of creating new one
+                self.pk = existing_pk
+                self._state.adding = False
+                kwargs.pop('force_insert', None)
+        return super().save(*args, **kwargs)
+
+    @classmethod
+    def get_solo(cls):
+        """
+        Return the site settings, read from this process's memory.
+
+        A version token in the shared cache is checked at most once every
+        SITE_SETTINGS_CHECK_INTERVAL seconds; any save or delete replaces
+        it, so other workers reload within that interval of an edit and the
+        worker that made it reloads at once. Between checks no query runs,
+        which matters when the shared cache is itself the database.
+        """
+        now = time.monotonic()
+        cached_version, instance, checked_at = _site_settings_cache
+        if instance is not None and now - checked_at < getattr(settings, 'SITE_SETTINGS_CHECK_INTERVAL', 5):
+            return instance
+
+        version = cache.get(SITE_SETTINGS_VERSION_KEY)
+        if version is None:
+            cache.add(SITE_SETTINGS_VERSION_KEY, uuid.uuid4().hex, None)
+            version = cache.get(SITE_SETTINGS_VERSION_KEY)
+
+        if instance is None or cached_version != version:
+            instance = cls.objects.order_by('pk').first() or cls()
+        _site_settings_cache[:] = [version, instance, now]
+        return instance
+
+    @classmethod
+    def invalidate_cache(cls):
+        cache.set(SITE_SETTINGS_VERSION_KEY, uuid.uuid4().hex, None)
+        _site_settings_cache[:] = [None, None, 0.0]
+
+
+SITE_SETTINGS_VERSION_KEY = 'portfolio:site-settings:version'
+# [version, instance, monotonic time of the last version check] held per process by SiteSettings.get_solo()
+_site_settings_cache = [None, None, 0.0]
+
+# Snapshot of the dashboard statistics, kept current by signals
+class ContentStats(models.Model):
+    SINGLETON_ID = 1
+
+    projects_count = models.IntegerField(default=0)
+    featured_projects_count = models.IntegerField(default=0)
+    blog_count = models.IntegerField(default=0)
+    skills_count = models.IntegerField(default=0)
+    certifications_count = models.IntegerField(default=0)
+    skill_category_counts = models.JSONField(default=dict, blank=True)
+    last_update = models.DateTimeField(null=True, blank=True)
+    about_complete = models.BooleanField(default=False)
+
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Content Stats"
+
+    def __str__(self):
+        return f"Content Stats - {self.refreshed_at}"
+
+    def as_dict(self):
+        return {
+            'projects_count': self.projects_count,
+            'featured_projects_count': self.featured_projects_count,
+            'blog_count': self.blog_count,
+            'skills_count': self.skills_count,
+            'certifications_count': self.certifications_count,
+            'skill_category_counts': self.skill_category_counts,
+            'last_update': self.last_update,
+            'about_complete': self.about_complete,
+        }
+
+
+# Outgoing mail queued by the contact form and drained by process_outbox
+class OutboxEmail(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),  # claimed by a worker until next_attempt_at
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = models.JSONField(default=list)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = "Outbox Emails"
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)}"
+
+# Weekly and monthly sums of PortfolioAnalytics, kept current by portfolio/rollups.py
+class AnalyticsRollup(models.Model):
+    GRANULARITY_CHOICES = [
+        ('week', 'ISO week'),
+        ('month', 'Month'),
+    ]
+
+    granularity = models.CharField(max_length=10, choices=GRANULARITY_CHOICES)
+    period_start = models.DateField(help_text="Monday of the ISO week, or the first of the month")
+    page_views = models.IntegerField(default=0)
+    unique_visitors = models.IntegerField(default=0, help_text="Sum of the daily unique visitor counts")
+    contact_form_submissions = models.IntegerField(default=0)
+    resume_downloads = models.IntegerField(default=0)
+    days = models.IntegerField(default=0, help_text="Daily rows included")
+
+    class Meta:
+        verbose_name_plural = "Analytics Rollups"
+        ordering = ['granularity', 'period_start']
+        constraints = [
+            models.UniqueConstraint(fields=['granularity', 'period_start'], name='analytics_rollup_period_unique'),
+        ]
+
+    def __str__(self):
+        return f"Analytics {self.granularity} of {self.period_start}"
@@ -0,0 +1,129 @@
+"""
+portfolio/outbox.py
+
+Database-backed outbox for outgoing email.
+
+Views call ``enqueue_mail`` (same arguments as ``send_mail``) which only
+writes a row, so no SMTP work happens on the request path. The
+``process_outbox`` management command drains pending rows in batches,
+sending each batch over a single SMTP connection and retrying failures
+with exponential backoff. A claimed batch is marked ``sending`` with a
+lease long enough to send every message in it at the SMTP timeout; only a
+batch whose worker died (lease expired) is claimed again.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_mail(subject, message, from_email, recipient_list):
+    """
+    Queue an email for delivery by the outbox worker.
+
+    Headers are validated now (raising ``BadHeaderError``) so bad input is
+    reported to the caller rather than failing later in the worker. Subjects
+    longer than the column are truncated.
+    """
+    subject = subject[:OutboxEmail._meta.get_field('subject').max_length]
+    EmailMessage(subject, message, from_email, recipient_list).message()
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipient_list),
+    )
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt: base * 2^(attempts - 1), capped."""
+    base = getattr(settings, 'OUTBOX_RETRY_BASE_SECONDS', 30)
+    cap = getattr(settings, 'OUTBOX_RETRY_MAX_SECONDS', 60 * 60)
+    return timedelta(seconds=min(cap, base * 2 ** max(attempts - 1, 0)))
+
+
+def lease_duration(batch_size):
+    """How long a worker may hold a batch: connecting plus every send taking the full SMTP timeout."""
+    timeout = getattr(settings, 'EMAIL_TIMEOUT', None) or 30
+    return timedelta(seconds=timeout * (batch_size + 1) + 60)
+
+
+def claim_batch(batch_size):
+    """
+    Return the next due emails, marked ``sending`` so other workers skip them.
+
+    Due means pending and past ``next_attempt_at``, or still ``sending``
+    after the lease ran out (the worker holding it died).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status__in=['pending', 'sending'], next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        if batch:
+            OutboxEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+                status='sending', next_attempt_at=now + lease_duration(len(batch))
+            )
+    return batch
+
+
+def _record_failure(email, exc, max_attempts):
+    logger.warning("Outbox email %s failed (attempt %s): %s", email.pk, email.attempts, exc)
+    email.last_error = str(exc)
+    if email.attempts >= max_attempts:
+        email.status = 'failed'
+    else:
+        email.status = 'pending'
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+
+
+def deliver_batch(batch_size=50):
+    """Send one batch of due emails over a single connection. Returns (sent, failed)."""
+    batch = claim_batch(batch_size)
+    if not batch:
+        return 0, 0
+
+    max_attempts = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5)
+    update_fields = ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:
+        # Relay unreachable: count it as an attempt for the whole batch
+        for email in batch:
+            email.attempts += 1
+            _record_failure(email, exc, max_attempts)
+        OutboxEmail.objects.bulk_update(batch, update_fields)
+        return 0, len(batch)
+
+    sent = failed = 0
+    try:
+        for email in batch:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email, email.recipients,
+                connection=connection,
+            )
+            email.attempts += 1
+            try:
+                message.send()
+            except Exception as exc:
+                _record_failure(email, exc, max_attempts)
+                failed += 1
+            else:
+                email.status = 'sent'
+                email.sent_at = timezone.now()
+                email.last_error = ''
+                sent += 1
+            email.save(update_fields=update_fields)
+    finally:
+        connection.close()
+    return sent, failed
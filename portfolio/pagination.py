@@ -0,0 +1,172 @@
+"""
+portfolio/pagination.py
+
+Keyset (cursor) pagination.
+
+Instead of OFFSET, each page is fetched with a WHERE clause that continues
+from the sort key of the last row shown, so every page costs the same no
+matter how deep it is. Cursors are signed, opaque strings encoding that
+sort key and the direction of travel.
+
+    page = KeysetPaginator(Project.objects.all(), ['-created_at']).page(request.GET.get('cursor'))
+    page.object_list, page.next_cursor, page.previous_cursor
+"""
+from functools import cached_property
+
+from django.core import signing
+from django.db.models import Q
+
+CURSOR_SALT = 'portfolio.pagination'
+
+
+class KeysetPaginator:
+    """Paginate ``queryset`` by ``ordering`` (field names, ``-`` for descending); pk breaks ties."""
+
+    def __init__(self, queryset, ordering, per_page=25):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = list(ordering)
+        if not any(name.lstrip('-') in ('pk', 'id') for name in self.ordering):
+            # Same direction as the last key so the order stays a single index walk
+            last_desc = self.ordering[-1].startswith('-')
+            self.ordering.append('-pk' if last_desc else 'pk')
+        self.fields = [name.lstrip('-') for name in self.ordering]
+
+    # -- cursors ---------------------------------------------------------------
+
+    def _model_field(self, name):
+        meta = self.queryset.model._meta
+        return meta.pk if name == 'pk' else meta.get_field(name)
+
+    def encode_cursor(self, instance, direction):
+        values = []
+        for name in self.fields:
+            if isinstance(instance, dict):
+                # Rows from .values(): keyed by the ordering field names
+                value = instance[name]
+            else:
+                value = getattr(instance, 'pk' if name == 'pk' else self._model_field(name).attname)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return signing.dumps({'k': values, 'd': direction}, salt=CURSOR_SALT, compress=True)
+
+    def decode_cursor(self, cursor):
+        """Return ``(values, direction)``, or ``(None, 'next')`` for a missing or tampered cursor."""
+        if not cursor:
+            return None, 'next'
+        try:
+            data = signing.loads(cursor, salt=CURSOR_SALT)
+            values = [
+                self._model_field(name).to_python(value)
+                for name, value in zip(self.fields, data['k'], strict=True)
+            ]
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            return None, 'next'
+        return values, 'previous' if data.get('d') == 'previous' else 'next'
+
+    # -- queries ---------------------------------------------------------------
+
+    def _after(self, values, reverse=False):
+        """Q matching rows that sort strictly after ``values`` (or before, if ``reverse``)."""
+        condition = Q()
+        equal = Q()
+        for name, field, value in zip(self.ordering, self.fields, values):
+            descending = name.startswith('-') != reverse
+            lookup = 'lt' if descending else 'gt'
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        if len(values) > 1:
+            # Redundant bound on the leading key: lets the database range-scan
+            # the index instead of expanding the OR into separate lookups
+            descending = self.ordering[0].startswith('-') != reverse
+            condition &= Q(**{f"{self.fields[0]}__{'lte' if descending else 'gte'}": values[0]})
+        return condition
+
+    def page(self, cursor=None):
+        values, direction = self.decode_cursor(cursor)
+        return KeysetPage(self, values, direction)
+
+    def ordered_from(self, cursor=None):
+        """The whole ordered queryset continuing forwards from ``cursor``, for streaming."""
+        values, _direction = self.decode_cursor(cursor)
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._after(values))
+        return queryset.order_by(*self.ordering)
+
+
+class KeysetPage:
+    """One page of results; rows are only fetched when first accessed."""
+
+    def __init__(self, paginator, values, direction):
+        self.paginator = paginator
+        self.values = values
+        self.direction = direction
+
+    @property
+    def queryset(self):
+        """The query this page runs (one extra row tells whether more exist)."""
+        paginator = self.paginator
+        backwards = self.direction == 'previous'
+        queryset = paginator.queryset
+        if self.values is not None:
+            queryset = queryset.filter(paginator._after(self.values, reverse=backwards))
+        ordering = paginator.ordering
+        if backwards:
+            ordering = [name[1:] if name.startswith('-') else f"-{name}" for name in ordering]
+        return queryset.order_by(*ordering)[:paginator.per_page + 1]
+
+    def _split(self, rows):
+        per_page = self.paginator.per_page
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        if self.direction == 'previous':
+            rows.reverse()
+        return rows, has_more
+
+    @cached_property
+    def _rows(self):
+        return self._split(list(self.queryset))
+
+    async def aload(self):
+        """Fetch the rows with the async ORM now, so later access runs no query."""
+        if '_rows' not in self.__dict__:
+            self.__dict__['_rows'] = self._split([row async for row in self.queryset])
+        return self
+
+    @property
+    def object_list(self):
+        return self._rows[0]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    @property
+    def has_next(self):
+        rows, has_more = self._rows
+        # Arriving backwards means a next page exists: the one we came from
+        return bool(rows) and (has_more if self.direction == 'next' else True)
+
+    @property
+    def has_previous(self):
+        rows, has_more = self._rows
+        if self.direction == 'previous':
+            return has_more
+        return self.values is not None and bool(rows)
+
+    @property
+    def next_cursor(self):
+        if not self.has_next:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], 'next')
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], 'previous')
@@ -0,0 +1,158 @@
+"""
+portfolio/ratelimit.py
+
+Token-bucket rate limiting for expensive POSTs (login, contact form).
+
+Each limited view has buckets per client IP and for the route as a whole,
+configured in RATE_LIMITS as ``"<tokens>/<period>"``. A bucket refills
+continuously over its period. It is stored in the shared cache as one
+counter per period, taken with an atomic ``incr``; the previous period's
+counter is weighted by how much of it still overlaps, so no
+read-modify-write is needed. A request that finds any bucket empty gets a
+429 with ``Retry-After`` before the view runs, so no password hashing or
+mail work starts, and the tokens it took are handed back.
+
+The buckets must be shared by every worker, so outside DEBUG a process-local
+cache is refused (portfolio.E001). ``incr`` is atomic on Redis and
+Memcached; on the database cache it is a read and a write, so concurrent
+requests can occasionally be counted once.
+"""
+import math
+import re
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+RATE_LIMIT_PREFIX = 'portfolio:ratelimit'
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+RATE_RE = re.compile(r'^(\d+)/(\d*)([smhd])$')
+
+
+def parse_rate(rate):
+    """``'10/5m'`` -> ``(10, 300)``: tokens per period in seconds."""
+    match = RATE_RE.match(rate.replace(' ', ''))
+    if not match:
+        raise ImproperlyConfigured(f"Invalid rate {rate!r}; expected e.g. '10/m' or '5/10m'.")
+    tokens, multiplier, unit = match.groups()
+    return int(tokens), int(multiplier or 1) * PERIODS[unit]
+
+
+def client_ip(request):
+    """The client address, skipping RATE_LIMIT_PROXY_COUNT trusted proxies in X-Forwarded-For."""
+    proxies = getattr(settings, 'RATE_LIMIT_PROXY_COUNT', 0)
+    if proxies:
+        # Only the entries our own proxies appended can be trusted, so count from the right
+        forwarded = [part.strip() for part in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if part.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+class Bucket:
+    def __init__(self, key, rate):
+        self.key = key
+        self.tokens, self.period = parse_rate(rate)
+
+    def _counter(self, window):
+        return f'{self.key}:{window}'
+
+    def take(self, now):
+        """Take a token. Returns ``(counter key, seconds until one is free or 0)``."""
+        window, offset = divmod(now, self.period)
+        current_key = self._counter(int(window))
+        # Kept for two periods: it is read back as the previous counter
+        cache.add(current_key, 0, self.period * 2)
+        try:
+            used = cache.incr(current_key)
+        except ValueError:  # evicted between add() and incr()
+            cache.add(current_key, 1, self.period * 2)
+            used = 1
+        previous = cache.get(self._counter(int(window) - 1), 0)
+        elapsed = offset / self.period
+        if previous * (1 - elapsed) + used <= self.tokens:
+            return current_key, 0
+        return current_key, self.retry_after(elapsed, previous, used - 1)
+
+    def retry_after(self, elapsed, previous, used):
+        """Seconds until ``previous * (1 - elapsed) + used + 1 <= tokens``."""
+        room = self.tokens - used - 1
+        if room >= 0 and previous:
+            # Within this period, once enough of the previous one has drained
+            return max(1, math.ceil((1 - room / previous - elapsed) * self.period))
+        # In the next period this one's count becomes the previous one
+        drain = max(0.0, 1 - (self.tokens - 1) / used) if used else 0.0
+        return max(1, math.ceil((1 - elapsed + drain) * self.period))
+
+
+def buckets_for(name, request):
+    limits = getattr(settings, 'RATE_LIMITS', {}).get(name, {})
+    buckets = []
+    if 'ip' in limits:
+        buckets.append(Bucket(f'{RATE_LIMIT_PREFIX}:{name}:ip:{client_ip(request)}', limits['ip']))
+    if 'route' in limits:
+        buckets.append(Bucket(f'{RATE_LIMIT_PREFIX}:{name}:route', limits['route']))
+    return buckets
+
+
+def check(name, request):
+    """Take a token from each of ``name``'s buckets; seconds to wait if one was empty, else 0."""
+    now = time.time()
+    taken = []
+    for bucket in buckets_for(name, request):
+        key, wait = bucket.take(now)
+        taken.append(key)
+        if wait:
+            # A refused request doesn't use up the caller's allowance
+            for key in taken:
+                try:
+                    cache.decr(key)
+                except ValueError:
+                    pass
+            return wait
+    return 0
+
+
+def rate_limit(name, response, methods=('POST',)):
+    """
+    Limit ``methods`` requests to a view with the RATE_LIMITS[name] buckets.
+
+    ``response(request)`` builds the body for a refused request in the
+    shape the view's callers expect; it is sent as a 429 with Retry-After.
+    Works on sync and async views.
+    """
+    def limited(request, wait):
+        refused = response(request)
+        refused.status_code = 429
+        refused['Retry-After'] = str(wait)
+        return refused
+
+    def enabled(request):
+        return request.method in methods and getattr(settings, 'RATE_LIMIT_ENABLED', True)
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _wrapped_async_view(request, *args, **kwargs):
+                if enabled(request):
+                    wait = await sync_to_async(check)(name, request)
+                    if wait:
+                        return await sync_to_async(limited)(request, wait)
+                return await view_func(request, *args, **kwargs)
+
+            return _wrapped_async_view
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if enabled(request):
+                wait = check(name, request)
+                if wait:
+                    return limited(request, wait)
+            return view_func(request, *args, **kwargs)
+
+        return _wrapped_view
+
+    return decorator
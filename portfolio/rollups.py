@@ -0,0 +1,184 @@
+"""
+portfolio/rollups.py
+
+Weekly and monthly rollups of PortfolioAnalytics for the dashboard charts.
+
+``AnalyticsRollup`` holds one row per ISO week and per calendar month with
+the summed daily counters. Whenever daily rows change (counter flushes,
+edits, imports) only the buckets containing those dates are recomputed,
+each from its own handful of daily rows, after the write commits.
+``time_series()`` then answers a date range from the coarsest table that
+still gives enough points, so a chart over several years reads a few dozen
+month rows instead of every day.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+
+from .db import bulk_upsert, primary_reads
+from .models import PortfolioAnalytics, AnalyticsRollup
+
+COUNTER_FIELDS = ['page_views', 'unique_visitors', 'contact_form_submissions', 'resume_downloads']
+GRANULARITIES = ('week', 'month')
+TRUNCATE = {'week': TruncWeek, 'month': TruncMonth}
+
+
+def max_points():
+    return getattr(settings, 'ANALYTICS_SERIES_MAX_POINTS', 62)
+
+
+# -----------------------------------------------------------------------------
+# Buckets
+# -----------------------------------------------------------------------------
+
+def bucket_start(granularity, day):
+    if granularity == 'day':
+        return day
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def bucket_end(granularity, start):
+    if granularity == 'day':
+        return start
+    if granularity == 'week':
+        return start + timedelta(days=6)
+    next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def contiguous_runs(granularity, starts):
+    """Group sorted bucket starts into runs of adjacent buckets: [(first start, last end), ...]."""
+    runs = []
+    for start in sorted(starts):
+        if runs and runs[-1][1] + timedelta(days=1) == start:
+            runs[-1][1] = bucket_end(granularity, start)
+        else:
+            runs.append([start, bucket_end(granularity, start)])
+    return runs
+
+
+def _aggregate(analytics_model, granularity, first, last):
+    """{period_start: totals} over the daily rows between ``first`` and ``last``."""
+    rows = (
+        analytics_model.objects.filter(date__range=(first, last))
+        .annotate(period=TRUNCATE[granularity]('date'))
+        .values('period')
+        .annotate(days=Count('pk'), **{field: Sum(field) for field in COUNTER_FIELDS})
+        .order_by()
+    )
+    return {row.pop('period'): row for row in rows}
+
+
+def refresh_buckets(dates, analytics_model=PortfolioAnalytics, rollup_model=AnalyticsRollup):
+    """Recompute the week and month buckets containing ``dates``: one query per run of adjacent buckets."""
+    for granularity in GRANULARITIES:
+        starts = {bucket_start(granularity, day) for day in dates}
+        # Sum and upsert in one transaction on the primary, so the rollup
+        # can't be overwritten with totals read before a concurrent change
+        with primary_reads(), transaction.atomic():
+            totals = {}
+            for first, last in contiguous_runs(granularity, starts):
+                totals.update(_aggregate(analytics_model, granularity, first, last))
+
+            bulk_upsert(
+                rollup_model,
+                [
+                    rollup_model(granularity=granularity, period_start=start, **values)
+                    for start, values in totals.items()
+                ],
+                unique_fields=['granularity', 'period_start'],
+                update_fields=['days', *COUNTER_FIELDS],
+            )
+            # Buckets whose daily rows were all deleted
+            emptied = starts - set(totals)
+            if emptied:
+                rollup_model.objects.filter(granularity=granularity, period_start__in=emptied).delete()
+
+
+def schedule_refresh(dates):
+    """
+    Refresh the buckets of ``dates`` once the current transaction commits.
+
+    The daily rows are already committed by then, so a failed refresh is
+    only logged: it must not undo the caller's write or fail its request.
+    The next change to those weeks or ``rebuild_analytics_rollups`` repairs them.
+    """
+    dates = set(dates)
+    transaction.on_commit(lambda: refresh_buckets(dates), robust=True)
+
+
+def rebuild(analytics_model=PortfolioAnalytics, rollup_model=AnalyticsRollup):
+    """Recompute every bucket from scratch. Returns the number of rollup rows."""
+    with transaction.atomic():
+        rollup_model.objects.all().delete()
+        for granularity in GRANULARITIES:
+            totals = (
+                analytics_model.objects.annotate(period=TRUNCATE[granularity]('date'))
+                .values('period')
+                .annotate(days=Count('pk'), **{field: Sum(field) for field in COUNTER_FIELDS})
+                .order_by('period')
+            )
+            rollup_model.objects.bulk_create(
+                (
+                    rollup_model(granularity=granularity, period_start=row.pop('period'), **row)
+                    for row in totals.iterator()
+                ),
+                batch_size=500,
+            )
+    return rollup_model.objects.count()
+
+
+# -----------------------------------------------------------------------------
+# Time series
+# -----------------------------------------------------------------------------
+
+def choose_granularity(start, end):
+    """The finest of day / week / month that covers ``start``..``end`` in at most max_points() points."""
+    limit = max_points()
+    for granularity in ('day', 'week'):
+        if len(period_starts(granularity, start, end)) <= limit:
+            return granularity
+    return 'month'
+
+
+def period_starts(granularity, start, end):
+    starts = []
+    current = bucket_start(granularity, start)
+    while current <= end:
+        starts.append(current)
+        current = bucket_end(granularity, current) + timedelta(days=1)
+    return starts
+
+
+def time_series(start, end, granularity=None):
+    """
+    Counter totals per period from ``start`` to ``end``, zero-filled.
+
+    The range is widened to whole buckets, so the first and last points
+    are complete weeks or months; the returned dict says which dates it covers.
+    """
+    granularity = granularity or choose_granularity(start, end)
+    starts = period_starts(granularity, start, end)
+    first, last = starts[0], bucket_end(granularity, starts[-1])
+
+    if granularity == 'day':
+        rows = PortfolioAnalytics.objects.filter(date__range=(first, last)).values('date', *COUNTER_FIELDS)
+        found = {row.pop('date'): row for row in rows}
+    else:
+        rows = AnalyticsRollup.objects.filter(
+            granularity=granularity, period_start__range=(first, last),
+        ).values('period_start', *COUNTER_FIELDS)
+        found = {row.pop('period_start'): row for row in rows}
+
+    zero = dict.fromkeys(COUNTER_FIELDS, 0)
+    return {
+        'granularity': granularity,
+        'start': first,
+        'end': last,
+        'points': [{'period': period, **found.get(period, zero)} for period in starts],
+    }
@@ -0,0 +1,321 @@
+"""
+portfolio/search.py
+
+Indexed full-text search over published blog posts and active projects.
+
+The index lives in the ``portfolio_search`` table, created by migration
+0008 as an FTS5 virtual table on SQLite and as an InnoDB table with
+FULLTEXT indexes on MySQL. Signals keep it in sync with content edits and
+``rebuild_search_index`` repopulates it in bulk. Queries are ranked by the
+backend (bm25 / MATCH score, with titles weighted higher) and returned with
+HTML-escaped, ``<mark>``-highlighted titles and snippets. Blog posts are
+indexed by the plain text of their rendered HTML, so snippets show what
+readers see rather than Markdown syntax.
+
+Other databases have no index: ``search`` falls back to unindexed
+``icontains`` queries over the content tables, ranked and highlighted in
+Python, and logs once that it is doing so.
+"""
+import logging
+import re
+from functools import cache
+
+from django.db import connection, connections
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.html import escape
+
+from .content import plain_text
+from .db import read_alias
+from .models import BlogPost, Project
+
+SEARCH_TABLE = 'portfolio_search'
+
+# Control characters used as highlight markers before escaping
+MARK_START, MARK_END = '\x02', '\x03'
+SNIPPET_WORDS = 24
+MAX_QUERY_TERMS = 8
+
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+KINDS = ('blog', 'project')
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------------------------------------------------------
+# What gets indexed
+# -----------------------------------------------------------------------------
+
+def document_for(instance):
+    """Return ``(kind, title, body, extra)`` for an indexable instance, or None if it should not be listed."""
+    if isinstance(instance, BlogPost):
+        if instance.status != 'published':
+            return None
+        return 'blog', instance.title, plain_text(instance.content_html), instance.excerpt
+    if isinstance(instance, Project):
+        if not instance.is_active:
+            return None
+        return 'project', instance.title, instance.description, instance.technologies
+    return None
+
+
+def result_url(kind, object_id):
+    if kind == 'blog':
+        return reverse('portfolio:blog_details', args=[object_id])
+    return reverse('portfolio:project_details', args=[object_id])
+
+
+def query_terms(query):
+    """Split user input into at most MAX_QUERY_TERMS plain word terms."""
+    return TERM_RE.findall(query.lower())[:MAX_QUERY_TERMS]
+
+
+def render_highlight(text):
+    """Escape backend output and turn the highlight markers into <mark> tags."""
+    return escape(text).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+# -----------------------------------------------------------------------------
+# Backends
+# -----------------------------------------------------------------------------
+
+class SQLiteSearchBackend:
+    """FTS5 virtual table: (kind UNINDEXED, object_id UNINDEXED, title, body, extra)."""
+
+    create_sql = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        "kind UNINDEXED, object_id UNINDEXED, title, body, extra, "
+        "tokenize = 'porter unicode61 remove_diacritics 2')",
+    ]
+    drop_sql = [f"DROP TABLE IF EXISTS {SEARCH_TABLE}"]
+
+    @staticmethod
+    def docid(kind, object_id):
+        # Derived rowid, so updates and deletes are rowid lookups rather than scans
+        return object_id * len(KINDS) + KINDS.index(kind)
+
+    def delete(self, cursor, kind, object_id):
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [self.docid(kind, object_id)])
+
+    def insert(self, cursor, rows):
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, kind, object_id, title, body, extra) "
+            f"VALUES (%s, %s, %s, %s, %s, %s)",
+            [(self.docid(row[0], row[1]), *row) for row in rows],
+        )
+
+    def build_query(self, terms):
+        # Quote every term so user input can't use FTS5 operators; prefix-match the last
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += '*'
+        return ' '.join(quoted)
+
+    def search(self, cursor, terms, limit):
+        cursor.execute(
+            f"SELECT kind, object_id, "
+            f"highlight({SEARCH_TABLE}, 2, %s, %s), "
+            f"snippet({SEARCH_TABLE}, 3, %s, %s, '…', {SNIPPET_WORDS}), "
+            f"bm25({SEARCH_TABLE}, 0, 0, 10.0, 1.0, 4.0) AS score "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s "
+            f"ORDER BY score LIMIT %s",
+            [MARK_START, MARK_END, MARK_START, MARK_END, self.build_query(terms), limit],
+        )
+        return [
+            (kind, int(object_id), title, snippet, -score)
+            for kind, object_id, title, snippet, score in cursor.fetchall()
+        ]
+
+    def optimize(self, cursor):
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+
+
+class MySQLSearchBackend:
+    """InnoDB table with FULLTEXT indexes on title and on all text columns."""
+
+    create_sql = [
+        f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+        "kind VARCHAR(20) NOT NULL, "
+        "object_id BIGINT NOT NULL, "
+        "title VARCHAR(200) NOT NULL, "
+        "body LONGTEXT NOT NULL, "
+        "extra TEXT NOT NULL, "
+        "PRIMARY KEY (kind, object_id), "
+        "FULLTEXT KEY portfolio_search_title_ft (title), "
+        "FULLTEXT KEY portfolio_search_all_ft (title, body, extra)"
+        ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4",
+    ]
+    drop_sql = [f"DROP TABLE IF EXISTS {SEARCH_TABLE}"]
+
+    def delete(self, cursor, kind, object_id):
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE kind = %s AND object_id = %s", [kind, object_id]
+        )
+
+    def insert(self, cursor, rows):
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (kind, object_id, title, body, extra) "
+            f"VALUES (%s, %s, %s, %s, %s)",
+            rows,
+        )
+
+    def build_query(self, terms):
+        return ' '.join(f"+{term}*" for term in terms)
+
+    def search(self, cursor, terms, limit):
+        query = self.build_query(terms)
+        cursor.execute(
+            f"SELECT kind, object_id, title, body, "
+            f"3 * MATCH(title) AGAINST (%s IN BOOLEAN MODE) "
+            f"+ MATCH(title, body, extra) AGAINST (%s IN BOOLEAN MODE) AS score "
+            f"FROM {SEARCH_TABLE} "
+            f"WHERE MATCH(title, body, extra) AGAINST (%s IN BOOLEAN MODE) "
+            f"ORDER BY score DESC LIMIT %s",
+            [query, query, query, limit],
+        )
+        return [
+            (kind, object_id, highlight_terms(title, terms), make_snippet(body, terms), score)
+            for kind, object_id, title, body, score in cursor.fetchall()
+        ]
+
+    def optimize(self, cursor):
+        cursor.execute(f"OPTIMIZE TABLE {SEARCH_TABLE}")
+
+
+def highlight_terms(text, terms):
+    """Wrap words starting with any of ``terms`` in highlight markers (MySQL has no highlight())."""
+    pattern = re.compile(r'\b(' + '|'.join(re.escape(term) for term in terms) + r')\w*', re.IGNORECASE)
+    return pattern.sub(lambda match: f"{MARK_START}{match.group(0)}{MARK_END}", text)
+
+
+def make_snippet(text, terms):
+    """Window of SNIPPET_WORDS words around the first matching term, highlighted."""
+    words = text.split()
+    prefixes = tuple(terms)
+    first = next((i for i, word in enumerate(words) if word.lower().startswith(prefixes)), 0)
+    start = max(0, first - SNIPPET_WORDS // 3)
+    window = ' '.join(words[start:start + SNIPPET_WORDS])
+    if start > 0:
+        window = '…' + window
+    if start + SNIPPET_WORDS < len(words):
+        window += '…'
+    return highlight_terms(window, terms)
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'mysql': MySQLSearchBackend,
+}
+
+
+# -----------------------------------------------------------------------------
+# Fallback for databases without a backend
+# -----------------------------------------------------------------------------
+
+def fallback_sources():
+    """``(queryset, fields matched)`` searched when there is no index."""
+    return [
+        (BlogPost.objects.filter(status='published').defer('content'), ('title', 'content', 'excerpt')),
+        (Project.objects.filter(is_active=True), ('title', 'description', 'technologies')),
+    ]
+
+
+@cache
+def _warn_unindexed(vendor):
+    logger.warning("Full-text search is not supported on %s; using unindexed icontains queries", vendor)
+
+
+def fallback_search(terms, limit, using=None):
+    """Rows like a backend's ``search``, from ``icontains`` matches of every term."""
+    _warn_unindexed((using or connection).vendor)
+    rows = []
+    for queryset, fields in fallback_sources():
+        # Every term must appear in at least one of the fields
+        matches = Q()
+        for term in terms:
+            in_any_field = Q()
+            for field in fields:
+                in_any_field |= Q(**{f'{field}__icontains': term})
+            matches &= in_any_field
+        for instance in queryset.filter(matches).order_by('-pk')[:limit]:
+            # Scored and quoted from the same text the index would hold
+            kind, title, body, extra = document_for(instance)
+            # Title hits count like the backends' title weighting
+            score = sum(
+                3 * title.lower().count(term) + body.lower().count(term) + extra.lower().count(term)
+                for term in terms
+            )
+            rows.append((kind, instance.pk, highlight_terms(title, terms), make_snippet(body, terms), score))
+    rows.sort(key=lambda row: row[4], reverse=True)
+    return rows[:limit]
+
+
+def get_backend(using=None):
+    vendor = (using or connection).vendor
+    try:
+        return BACKENDS[vendor]()
+    except KeyError:
+        raise NotImplementedError(f"Full-text search is not supported on {vendor}")
+
+
+# -----------------------------------------------------------------------------
+# Index maintenance and queries
+# -----------------------------------------------------------------------------
+
+def remove_document(kind, object_id):
+    with connection.cursor() as cursor:
+        get_backend().delete(cursor, kind, object_id)
+
+
+def clear_index():
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+
+def insert_documents(rows):
+    """Bulk insert ``(kind, object_id, title, body, extra)`` rows."""
+    with connection.cursor() as cursor:
+        get_backend().insert(cursor, rows)
+
+
+def optimize_index():
+    with connection.cursor() as cursor:
+        get_backend().optimize(cursor)
+
+
+def update_instance(instance):
+    """Add, refresh or drop the index entry for a saved BlogPost or Project."""
+    kind = 'blog' if isinstance(instance, BlogPost) else 'project'
+    remove_document(kind, instance.pk)
+    document = document_for(instance)
+    if document is not None:
+        kind, title, body, extra = document
+        insert_documents([(kind, instance.pk, title, body, extra)])
+
+
+def is_supported(using=None):
+    return (using or connection).vendor in BACKENDS
+
+
+def search(query, limit=20):
+    """Return ranked, highlighted results for ``query``."""
+    terms = query_terms(query)
+    if not terms:
+        return []
+    using = connections[read_alias()]
+    if not is_supported(using):
+        rows = fallback_search(terms, limit, using)
+    else:
+        with using.cursor() as cursor:
+            rows = get_backend(using).search(cursor, terms, limit)
+    return [
+        {
+            'type': kind,
+            'id': object_id,
+            'title': render_highlight(title),
+            'snippet': render_highlight(snippet),
+            'score': float(score),
+            'url': result_url(kind, object_id),
+        }
+        for kind, object_id, title, snippet, score in rows
+    ]
@@ -0,0 +1,58 @@
+"""
+portfolio/sessions.py
+
+Session, authentication and message middleware that only run where they
+are needed.
+
+Sessions and logins only matter under SESSION_PATH_PREFIXES (the
+dashboard). Everywhere else (public pages, the API, probes, media) these
+drop-in replacements for Django's three middlewares pass the request
+straight through. ``request.user`` is an AnonymousUser there, and there
+is no ``request.session`` or message storage. Public pages are cached and
+shared between visitors anyway, so they must not depend on who is asking.
+Under ASGI this also saves the thread hop each of Django's MiddlewareMixin
+middlewares costs per request.
+"""
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware as BaseAuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.middleware import MessageMiddleware as BaseMessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware as BaseSessionMiddleware
+
+
+def uses_session(request):
+    """True if ``request``'s path needs sessions, auth and messages."""
+    return request.path_info.startswith(tuple(getattr(settings, 'SESSION_PATH_PREFIXES', ['/'])))
+
+
+class PathScopedMiddlewareMixin:
+    """Skip the wrapped MiddlewareMixin middleware entirely outside SESSION_PATH_PREFIXES."""
+
+    def __call__(self, request):
+        if uses_session(request):
+            return super().__call__(request)
+        self.skipped(request)
+        # In async mode this is the downstream coroutine, awaited by the caller
+        return self.get_response(request)
+
+    def skipped(self, request):
+        pass
+
+
+class SessionMiddleware(PathScopedMiddlewareMixin, BaseSessionMiddleware):
+    pass
+
+
+class AuthenticationMiddleware(PathScopedMiddlewareMixin, BaseAuthenticationMiddleware):
+    def skipped(self, request):
+        user = AnonymousUser()
+        request.user = user
+
+        async def auser():
+            return user
+
+        request.auser = auser
+
+
+class MessageMiddleware(PathScopedMiddlewareMixin, BaseMessageMiddleware):
+    pass
@@ -0,0 +1,69 @@
+"""
+portfolio/signals.py
+
+Signal handlers that keep derived data in step with content edits.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Project, Skill, BlogPost, Certification, About, SiteSettings, PortfolioAnalytics
+from . import stats, images, search, rollups, fragments
+
+STATS_MODELS = (Project, Skill, BlogPost, Certification, About)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def refresh_content_stats(sender, **kwargs):
+    """Refresh the ContentStats snapshot once the write has committed."""
+    if sender not in STATS_MODELS or not stats.snapshot_enabled():
+        return
+    transaction.on_commit(stats.refresh_snapshot)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=About)
+def build_image_derivatives(sender, instance, raw=False, **kwargs):
+    """Queue responsive derivatives when an image is uploaded or replaced."""
+    if raw or not images.needs_derivatives(instance):
+        return
+    images.schedule_build(instance)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=BlogPost)
+def update_search_index(sender, instance, **kwargs):
+    """Keep the full-text index in step with published content."""
+    if search.is_supported():
+        search.update_instance(instance)
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=BlogPost)
+def remove_from_search_index(sender, instance, **kwargs):
+    if search.is_supported():
+        search.remove_document('blog' if sender is BlogPost else 'project', instance.pk)
+
+
+@receiver(post_save, sender=SiteSettings)
+@receiver(post_delete, sender=SiteSettings)
+def invalidate_site_settings(sender, **kwargs):
+    """Make every worker reload SiteSettings on its next request."""
+    transaction.on_commit(SiteSettings.invalidate_cache)
+
+
+@receiver(post_save, sender=PortfolioAnalytics)
+@receiver(post_delete, sender=PortfolioAnalytics)
+def refresh_analytics_rollups(sender, instance, **kwargs):
+    """Recompute the week and month containing the changed day."""
+    rollups.schedule_refresh([instance.date])
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_fragment_generation(sender, **kwargs):
+    """Move {% cachedfragment %} blocks that depend on ``sender`` to fresh keys."""
+    if fragments.is_tracked(sender):
+        fragments.bump_on_commit(sender)
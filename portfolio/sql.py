@@ -0,0 +1,42 @@
+"""
+portfolio/sql.py
+
+Small helpers for the hand-built single-statement queries used by the
+dashboard stats and the page validators.
+"""
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .db import read_alias
+
+
+def table(model):
+    """Quoted table name for a model."""
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def column(model, field_name):
+    """Quoted column name for a model field."""
+    return connection.ops.quote_name(model._meta.get_field(field_name).column)
+
+
+def to_datetime(value):
+    """Normalise a raw datetime value from a scalar subquery to an aware datetime."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if settings.USE_TZ and timezone.is_naive(value):
+        value = timezone.make_aware(value, dt_timezone.utc)
+    return value
+
+
+def fetch_scalars(columns, params=()):
+    """Run ``SELECT <col>, <col>, ...`` for a list of scalar subqueries and return the row."""
+    with connections[read_alias()].cursor() as cursor:
+        cursor.execute(f"SELECT {', '.join(columns)}", list(params))
+        return cursor.fetchone()
@@ -0,0 +1,122 @@
+"""
+portfolio/stats.py
+
+Content statistics for the admin dashboard.
+
+Everything the dashboard overview needs (counts, featured counts, skill
+counts per category, last update and About completeness) is fetched in a
+single statement built from scalar subqueries, so the cost per hit stays
+constant no matter how many rows the tables hold. The result can also be
+kept in a ``ContentStats`` snapshot row that signals refresh on every write.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .models import Project, Skill, BlogPost, Certification, About, ContentStats
+from .sql import table, column, to_datetime, fetch_scalars
+
+
+def snapshot_enabled():
+    """Whether the dashboard should read from the ContentStats snapshot row."""
+    return getattr(settings, 'PORTFOLIO_STATS_SNAPSHOT', True)
+
+
+def content_stats_query():
+    """The scalar-subquery columns and params behind compute_content_stats()."""
+    project, skill = table(Project), table(Skill)
+    about = table(About)
+
+    columns = [
+        f"(SELECT COUNT(*) FROM {project})",
+        f"(SELECT COUNT(*) FROM {project} WHERE {column(Project, 'is_featured')} = %s)",
+        f"(SELECT MAX({column(Project, 'updated_at')}) FROM {project})",
+        f"(SELECT COUNT(*) FROM {table(BlogPost)})",
+        f"(SELECT COUNT(*) FROM {table(Certification)})",
+        f"(SELECT COUNT(*) FROM {skill})",
+    ]
+    params = [True]
+
+    # One conditional count per category instead of a query per category
+    category = column(Skill, 'category')
+    for value, _label in Skill.CATEGORY_CHOICES:
+        columns.append(f"(SELECT COUNT(*) FROM {skill} WHERE {category} = %s)")
+        params.append(value)
+
+    # Mirrors About.is_complete for the first About row
+    essential = ['full_name', 'job_title', 'bio', 'email', 'location', 'profile_image']
+    checks = ' AND '.join(f"{column(About, name)} <> ''" for name in essential)
+    columns.append(
+        f"(SELECT CASE WHEN {checks} THEN 1 ELSE 0 END FROM {about} "
+        f"ORDER BY {column(About, 'id')} LIMIT 1)"
+    )
+
+    return columns, params
+
+
+def compute_content_stats():
+    """Return the raw dashboard statistics using one database query."""
+    columns, params = content_stats_query()
+    row = fetch_scalars(columns, params)
+
+    projects_count, featured_projects_count, last_update, blog_count, \
+        certifications_count, skills_count = row[:6]
+    category_counts = {
+        value: count
+        for (value, _label), count in zip(Skill.CATEGORY_CHOICES, row[6:-1])
+    }
+
+    return {
+        'projects_count': projects_count,
+        'featured_projects_count': featured_projects_count,
+        'blog_count': blog_count,
+        'skills_count': skills_count,
+        'certifications_count': certifications_count,
+        'skill_category_counts': category_counts,
+        'last_update': to_datetime(last_update),
+        'about_complete': bool(row[-1]),
+    }
+
+
+def refresh_snapshot():
+    """Recompute the statistics and store them in the ContentStats row."""
+    stats = compute_content_stats()
+    ContentStats.objects.update_or_create(pk=ContentStats.SINGLETON_ID, defaults=stats)
+    return stats
+
+
+def get_content_stats():
+    """
+    Return the dashboard statistics.
+
+    Reads the snapshot row when enabled (falling back to building it on the
+    first call), otherwise computes the figures live.
+    """
+    if not snapshot_enabled():
+        return compute_content_stats()
+
+    snapshot = ContentStats.objects.filter(pk=ContentStats.SINGLETON_ID).first()
+    if snapshot is None:
+        return refresh_snapshot()
+    return snapshot.as_dict()
+
+
+async def aget_content_stats():
+    """Async get_content_stats(): the snapshot row is read with the async ORM."""
+    if not snapshot_enabled():
+        return await sync_to_async(compute_content_stats)()
+
+    snapshot = await ContentStats.objects.filter(pk=ContentStats.SINGLETON_ID).afirst()
+    if snapshot is None:
+        return await sync_to_async(refresh_snapshot)()
+    return snapshot.as_dict()
+
+
+def portfolio_score(stats):
+    """Portfolio score (0-100) weighted across the content sections."""
+    return int(min(100, (
+        (min(stats['projects_count'], 5) / 5 * 25) +  # Projects weight: 25%
+        (min(stats['blog_count'], 3) / 3 * 20) +      # Blog weight: 20%
+        (min(stats['skills_count'], 10) / 10 * 20) +  # Skills weight: 20%
+        (min(stats['certifications_count'], 3) / 3 * 15) +  # Certs weight: 15%
+        (1 if stats['about_complete'] else 0) * 20    # About weight: 20%
+    )))
@@ -0,0 +1,36 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+from portfolio import assets
+
+register = template.Library()
+
+TAGS = {
+    '.css': ('<link rel="stylesheet" href="{}">', 'style'),
+    '.js': ('<script src="{}"></script>', 'script'),
+}
+
+
+@register.simple_tag(takes_context=True)
+def asset_bundle(context, name):
+    """
+    Reference a bundle from ASSET_BUNDLES and ask for it to be preloaded.
+
+    Usage: {% asset_bundle 'public.css' %}
+    Outside of bundled mode (DEBUG) the individual source files are emitted.
+    """
+    html, preload_as = TAGS[name[name.rfind('.'):]]
+    if assets.bundles_enabled():
+        urls = [static(assets.bundle_path(name))]
+    else:
+        urls = [static(source) for source in assets.bundles()[name]]
+
+    request = context.get('request')
+    if request is not None:
+        # Sent as Link: rel=preload by PreloadLinkMiddleware
+        if not hasattr(request, 'preload_links'):
+            request.preload_links = []
+        request.preload_links.extend((url, preload_as) for url in urls)
+
+    return format_html_join('\n', html, ((url,) for url in urls))
@@ -0,0 +1,73 @@
+from django import template
+from django.core.cache import cache
+
+from portfolio import fragments
+
+register = template.Library()
+
+
+class CachedFragmentNode(template.Node):
+    def __init__(self, nodelist, name, labels, vary_on, timeout):
+        self.nodelist = nodelist
+        self.name = name
+        self.labels = labels
+        self.vary_on = vary_on
+        self.timeout = timeout
+
+    def render(self, context):
+        vary_on = [expression.resolve(context) for expression in self.vary_on]
+        key = fragments.fragment_key(self.name, self.labels, vary_on)
+        content = cache.get(key)
+        if content is None:
+            content = self.nodelist.render(context)
+            timeout = self.timeout.resolve(context) if self.timeout else fragments.default_timeout()
+            cache.set(key, content, int(timeout))
+        return content
+
+
+@register.tag
+def cachedfragment(parser, token):
+    """
+    Cache a block until any of the models it depends on is saved or deleted.
+
+    Usage: {% cachedfragment recent_projects Project %}...{% endcachedfragment %}
+           {% cachedfragment skills Skill Certification vary_on request.user.pk timeout=600 %}
+    Models are portfolio model names or app_label.Model, and must be listed
+    in fragments.TRACKED_MODELS. ``vary_on`` adds context values to the key;
+    ``timeout`` (seconds) bounds content that also changes with time, such
+    as ``timesince`` output.
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' needs a fragment name and at least one model."
+        )
+    tag_name, name, *rest = bits
+
+    timeout = None
+    if rest and rest[-1].startswith('timeout='):
+        timeout = parser.compile_filter(rest.pop()[len('timeout='):])
+
+    vary_on = []
+    if 'vary_on' in rest:
+        index = rest.index('vary_on')
+        vary_on = [parser.compile_filter(bit) for bit in rest[index + 1:]]
+        rest = rest[:index]
+
+    if not rest:
+        raise template.TemplateSyntaxError(f"'{tag_name}' needs at least one model.")
+    labels = []
+    for model_name in rest:
+        try:
+            model = fragments.resolve_model(model_name)
+        except (LookupError, ValueError):
+            raise template.TemplateSyntaxError(f"'{tag_name}': unknown model '{model_name}'.")
+        if not fragments.is_tracked(model):
+            raise template.TemplateSyntaxError(
+                f"'{tag_name}': edits to '{model_name}' aren't tracked; add it to fragments.TRACKED_MODELS."
+            )
+        labels.append(fragments.model_label(model))
+
+    nodelist = parser.parse(('endcachedfragment',))
+    parser.delete_first_token()
+    return CachedFragmentNode(nodelist, name, sorted(set(labels)), vary_on, timeout)
@@ -8,4 +8,9 @@ def subtract(value, arg):
     try:
         return int(value) - int(arg)
     except (ValueError, TypeError):
-        return 0
\ No newline at end of file
+        return 0
+
+@register.filter
+def split(value, sep=','):
+    """Split a delimited string into stripped, non-empty parts"""
+    return [part.strip() for part in str(value or '').split(sep) if part.strip()]
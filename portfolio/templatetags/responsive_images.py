@@ -0,0 +1,40 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+register = template.Library()
+
+
+def _srcset(entries):
+    return ', '.join(f"{default_storage.url(entry['name'])} {entry['width']}w" for entry in entries)
+
+
+@register.simple_tag
+def responsive_image(image, variants=None, alt='', sizes='100vw', css_class='', loading='lazy'):
+    """
+    Render a <picture> with WebP and JPEG srcsets for an uploaded image.
+
+    Usage: {% responsive_image project.image project.image_variants alt=project.title sizes="(min-width: 768px) 50vw, 100vw" %}
+    Falls back to a plain <img> when the derivatives are missing or stale.
+    """
+    if not image:
+        return ''
+
+    if not variants or variants.get('source') != image.name or not variants.get('jpeg'):
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}" decoding="async">',
+            image.url, alt, css_class, loading,
+        )
+
+    largest = variants['jpeg'][-1]
+    sources = format_html_join(
+        '', '<source type="image/webp" srcset="{}" sizes="{}">',
+        [(_srcset(variants['webp']), sizes)] if variants.get('webp') else [],
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" '
+        'alt="{}" class="{}" loading="{}" decoding="async"></picture>',
+        sources,
+        default_storage.url(largest['name']), _srcset(variants['jpeg']), sizes,
+        largest['width'], largest['height'], alt, css_class, loading,
+    )
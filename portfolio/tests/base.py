@@ -0,0 +1,27 @@
+"""
+portfolio/tests/base.py
+
+Settings shared by the tests that render pages.
+"""
+from django.conf import settings
+from django.test import override_settings
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# Pages render without a collected static manifest, bundles, page-view
+# counting or a log line per request
+PAGE_SETTINGS = {
+    'CACHES': LOCMEM_CACHE,
+    'ANALYTICS_ENABLED': False,
+    'INSTRUMENTATION_ENABLED': False,
+    'ASSET_BUNDLES_ENABLED': False,
+    'STORAGES': {
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+}
+
+
+def render_pages(cls_or_func):
+    """Apply PAGE_SETTINGS to a test case or test method."""
+    return override_settings(**PAGE_SETTINGS)(cls_or_func)
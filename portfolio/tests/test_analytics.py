@@ -0,0 +1,181 @@
+from datetime import date
+from unittest import mock
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import analytics
+from ..analytics import DeltaBuffer, VISITOR_COOKIE
+from ..models import BlogPost, PortfolioAnalytics
+from .base import render_pages
+
+
+def page_view_buffer():
+    return DeltaBuffer(analytics._apply_page_views, flush_size=1000, flush_interval=60 * 60)
+
+
+class DeltaBufferTests(TestCase):
+    day = date(2024, 3, 1)
+
+    def test_hits_are_buffered_until_flushed(self):
+        buffer = page_view_buffer()
+        for _ in range(3):
+            buffer.add(self.day, page_views=1, unique_visitors=1)
+        buffer.add(self.day, page_views=1)
+
+        self.assertFalse(PortfolioAnalytics.objects.exists())
+        self.assertEqual(buffer.pending(), {self.day: {'page_views': 4, 'unique_visitors': 3}})
+        self.assertEqual(buffer.pending_for(self.day, 'page_views'), 4)
+
+        buffer.flush()
+        row = PortfolioAnalytics.objects.get(date=self.day)
+        self.assertEqual((row.page_views, row.unique_visitors), (4, 3))
+        self.assertEqual(buffer.pending(), {})
+
+    def test_flush_adds_to_the_stored_counts(self):
+        PortfolioAnalytics.objects.create(date=self.day, page_views=10, resume_downloads=2)
+        buffer = page_view_buffer()
+        buffer.add(self.day, page_views=5)
+        buffer.add(self.day, page_views=2)
+        buffer.add(date(2024, 3, 2), page_views=1)
+        buffer.flush()
+
+        row = PortfolioAnalytics.objects.get(date=self.day)
+        self.assertEqual((row.page_views, row.resume_downloads), (17, 2))
+        self.assertEqual(PortfolioAnalytics.objects.get(date=date(2024, 3, 2)).page_views, 1)
+
+    def test_flush_size_triggers_a_flush(self):
+        buffer = DeltaBuffer(analytics._apply_page_views, flush_size=3, flush_interval=60 * 60)
+        buffer.add(self.day, page_views=1)
+        buffer.add(self.day, page_views=1)
+        self.assertFalse(PortfolioAnalytics.objects.exists())
+        buffer.add(self.day, page_views=1)
+        self.assertEqual(PortfolioAnalytics.objects.get(date=self.day).page_views, 3)
+
+    def test_flush_interval_triggers_a_flush(self):
+        buffer = DeltaBuffer(analytics._apply_page_views, flush_size=1000, flush_interval=0)
+        buffer.add(self.day, page_views=1)
+        self.assertEqual(PortfolioAnalytics.objects.get(date=self.day).page_views, 1)
+
+    def test_failed_flush_keeps_the_deltas(self):
+        buffer = page_view_buffer()
+        buffer.add(self.day, page_views=2)
+        with mock.patch.object(PortfolioAnalytics, 'increment', side_effect=RuntimeError("down")), \
+                self.assertLogs('portfolio.analytics', 'ERROR'):
+            buffer.flush()
+        self.assertFalse(PortfolioAnalytics.objects.exists())
+        buffer.add(self.day, page_views=1)
+        buffer.flush()
+        self.assertEqual(PortfolioAnalytics.objects.get(date=self.day).page_views, 3)
+
+
+# Outermost, so it wins over PAGE_SETTINGS
+@override_settings(ANALYTICS_ENABLED=True)
+@render_pages
+class PageViewMiddlewareTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(analytics, 'page_views', page_view_buffer())
+        self.buffer = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.today = timezone.localdate()
+
+    def test_counts_views_and_unique_visitors_once_a_day(self):
+        first = self.client.get(reverse('portfolio:about'))
+        self.assertEqual(first.cookies[VISITOR_COOKIE].value, self.today.isoformat())
+        # The cookie-setting response must not be stored by a shared cache
+        self.assertIn('private', first['Cache-Control'])
+
+        second = self.client.get(reverse('portfolio:about'))
+        self.assertNotIn(VISITOR_COOKIE, second.cookies)
+        self.assertEqual(self.buffer.pending(), {self.today: {'page_views': 2, 'unique_visitors': 1}})
+
+    def test_skips_excluded_paths_errors_and_posts(self):
+        self.client.get(reverse('portfolio:admin-login'))
+        self.client.get('/no-such-page/')
+        self.client.post(reverse('portfolio:about'))
+        self.assertEqual(self.buffer.pending(), {})
+
+    @override_settings(ANALYTICS_ENABLED=False)
+    def test_can_be_switched_off(self):
+        response = self.client.get(reverse('portfolio:about'))
+        self.assertNotIn(VISITOR_COOKIE, response.cookies)
+        self.assertEqual(self.buffer.pending(), {})
+
+
+@override_settings(ANALYTICS_ENABLED=True)
+@render_pages
+class BlogViewCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.posts = [
+            BlogPost.objects.create(
+                title=f"Post {index}", slug=f"post-{index}", content="Text", status='published',
+                featured_image='blog/example.jpg', view_count=10,
+            )
+            for index in range(2)
+        ]
+
+    def setUp(self):
+        buffer = DeltaBuffer(analytics._apply_blog_views, flush_size=1000, flush_interval=60 * 60)
+        for name, value in (('blog_views', buffer), ('page_views', page_view_buffer())):
+            patcher = mock.patch.object(analytics, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.buffer = buffer
+
+    def test_views_are_buffered_not_written(self):
+        first, second = self.posts
+        for _ in range(3):
+            self.client.get(reverse('portfolio:blog_details', args=[first.pk]))
+        self.client.get(reverse('portfolio:blog_details', args=[second.pk]))
+
+        first.refresh_from_db()
+        self.assertEqual(first.view_count, 10)
+        self.assertEqual(analytics.live_view_count(first), 13)
+
+    def test_flush_updates_every_post_in_one_query(self):
+        first, second = self.posts
+        analytics.record_blog_view(first.pk)
+        analytics.record_blog_view(first.pk)
+        analytics.record_blog_view(second.pk)
+        with self.assertNumQueries(3):  # savepoint, one CASE UPDATE, release
+            self.buffer.flush()
+
+        self.assertEqual(
+            dict(BlogPost.objects.values_list('pk', 'view_count')), {first.pk: 12, second.pk: 11},
+        )
+        first.refresh_from_db()
+        self.assertEqual(analytics.live_view_count(first), 12)
+
+    def test_unpublished_and_missing_posts_are_not_counted(self):
+        draft = BlogPost.objects.create(title="Draft", slug='draft', content="Text", featured_image='blog/example.jpg')
+        self.assertEqual(self.client.get(reverse('portfolio:blog_details', args=[draft.pk])).status_code, 404)
+        self.assertEqual(self.buffer.pending(), {})
+
+
+class UniqueDateMigrationTests(TransactionTestCase):
+    before = [('portfolio', '0005_outboxemail')]
+    after = [('portfolio', '0006_portfolioanalytics_unique_date')]
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicate_dates_are_merged_before_the_unique_index(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        old_model = executor.loader.project_state(self.before).apps.get_model('portfolio', 'PortfolioAnalytics')
+        day = date(2024, 1, 1)
+        old_model.objects.create(date=day, page_views=3, unique_visitors=1)
+        old_model.objects.create(date=day, page_views=4, resume_downloads=2)
+        old_model.objects.create(date=date(2024, 1, 2), page_views=1)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        new_model = executor.loader.project_state(self.after).apps.get_model('portfolio', 'PortfolioAnalytics')
+        merged = new_model.objects.get(date=day)
+        self.assertEqual((merged.page_views, merged.unique_visitors, merged.resume_downloads), (7, 1, 2))
+        self.assertEqual(new_model.objects.count(), 2)
@@ -0,0 +1,122 @@
+import json
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..api import MAX_LIMIT
+from ..models import BlogPost, Project
+from .base import render_pages
+
+
+def api_url(resource):
+    return reverse('portfolio:api-collection', args=[resource])
+
+
+def ndjson(response):
+    return [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+
+
+@render_pages
+class CollectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        for index in range(7):
+            BlogPost.objects.create(
+                title=f"Post {index}", slug=f"post-{index}", content="Long body " * 50,
+                status='published', featured_image='blog/example.jpg',
+                published_date=now - timedelta(days=index // 2),
+            )
+        BlogPost.objects.create(title="Draft", slug='draft', content="Text", featured_image='blog/example.jpg')
+        cls.expected = list(
+            BlogPost.objects.filter(status='published').order_by('-published_date', '-pk')
+            .values_list('slug', flat=True)
+        )
+
+    def test_default_fields_leave_out_the_content(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(api_url('posts')).json()
+        self.assertEqual(
+            set(data['results'][0]), {'id', 'title', 'slug', 'excerpt', 'featured_image', 'read_time', 'published_date'},
+        )
+        self.assertTrue(data['results'][0]['featured_image'].endswith('/blog/example.jpg'))
+        self.assertFalse(any('"content"' in query['sql'] for query in queries.captured_queries))
+
+    def test_fields_select_columns(self):
+        data = self.client.get(api_url('posts'), {'fields': 'slug,content'}).json()
+        self.assertEqual(data['results'][0], {'slug': self.expected[0], 'content': "Long body " * 50})
+
+        response = self.client.get(api_url('posts'), {'fields': 'slug,view_count,secret'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'success': False, 'message': 'Unknown field(s): secret'})
+
+    def test_cursors_walk_the_collection(self):
+        seen, cursor = [], None
+        while True:
+            params = {'fields': 'slug', 'limit': 3, **({'cursor': cursor} if cursor else {})}
+            data = self.client.get(api_url('posts'), params).json()
+            seen += [row['slug'] for row in data['results']]
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.expected)
+
+        back = self.client.get(api_url('posts'), {'fields': 'slug', 'limit': 3, 'cursor': data['previous_cursor']})
+        self.assertEqual([row['slug'] for row in back.json()['results']], self.expected[3:6])
+
+    def test_limit_is_validated_and_clamped(self):
+        self.assertEqual(len(self.client.get(api_url('posts'), {'limit': 0}).json()['results']), 1)
+        self.assertEqual(len(self.client.get(api_url('posts'), {'limit': MAX_LIMIT + 1}).json()['results']), 7)
+        self.assertEqual(self.client.get(api_url('posts'), {'limit': 'ten'}).status_code, 400)
+
+    def test_pages_revalidate_with_their_etag(self):
+        response = self.client.get(api_url('posts'))
+        self.assertEqual(self.client.get(api_url('posts'), HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        BlogPost.objects.filter(slug=self.expected[0]).update(title="Renamed")
+        self.assertEqual(self.client.get(api_url('posts'), HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_unknown_resources_and_writes_are_refused(self):
+        self.assertEqual(self.client.get(api_url('users')).status_code, 404)
+        self.assertEqual(self.client.post(api_url('posts')).status_code, 405)
+
+    def test_ndjson_streams_every_row(self):
+        response = self.client.get(api_url('posts'), {'format': 'ndjson', 'fields': 'slug', 'limit': 2})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([row['slug'] for row in ndjson(response)], self.expected)
+
+        by_header = self.client.get(api_url('posts'), {'fields': 'slug'}, HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(len(ndjson(by_header)), len(self.expected))
+
+    async def test_ndjson_streams_asynchronously_under_asgi(self):
+        response = await self.async_client.get(api_url('posts'), {'format': 'ndjson', 'fields': 'slug'})
+        # An async iterator: the ASGI handler sends each chunk as it is read
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual([json.loads(line)['slug'] for line in body.decode().splitlines()], self.expected)
+
+    def test_ndjson_continues_from_a_cursor(self):
+        cursor = self.client.get(api_url('posts'), {'limit': 3}).json()['next_cursor']
+        response = self.client.get(api_url('posts'), {'format': 'ndjson', 'fields': 'slug', 'cursor': cursor})
+        self.assertEqual([row['slug'] for row in ndjson(response)], self.expected[3:])
+
+
+@render_pages
+class ProjectResourceTests(TestCase):
+    def test_projects_follow_the_curated_order(self):
+        now = timezone.now()
+        for index, display_order in enumerate((2, 1, 1, 0)):
+            Project.objects.create(
+                title=f"Project {index}", description="Description", technologies="Django",
+                image='projects/example.jpg', display_order=display_order,
+                created_at=now - timedelta(hours=index),
+            )
+        data = self.client.get(api_url('projects'), {'fields': 'title', 'limit': 3}).json()
+        self.assertEqual([row['title'] for row in data['results']], ["Project 3", "Project 1", "Project 2"])
+        rest = self.client.get(api_url('projects'), {'fields': 'title', 'cursor': data['next_cursor']}).json()
+        self.assertEqual([row['title'] for row in rest['results']], ["Project 0"])
@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import async_views
+from ..models import BlogPost, Project
+from .base import render_pages
+
+
+@render_pages
+class AsyncPageTests(TestCase):
+    """Rows are fetched with the async ORM, not lazily in the render thread."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(3):
+            Project.objects.create(
+                title=f"Project {index}", description="Description", technologies="Django",
+                image='projects/example.jpg', display_order=index,
+            )
+            BlogPost.objects.create(
+                title=f"Post {index}", slug=f"post-{index}", content="Text", status='published',
+                featured_image='blog/example.jpg', published_date=timezone.now(),
+            )
+        cls.user = User.objects.create_superuser('editor', 'editor@example.com', 'secret')
+
+    async def render_context(self, view, url, user=None):
+        request = AsyncRequestFactory().get(url)
+        if user is not None:
+            async def auser():
+                return user
+            request.auser = auser
+        rendered = mock.AsyncMock(return_value=HttpResponse())
+        with mock.patch.object(async_views, 'arender', rendered):
+            await view(request)
+        return rendered.await_args.args[2]
+
+    async def test_list_pages_are_loaded_before_rendering(self):
+        for view, url, key, expected in [
+            (async_views.projects_view, reverse('portfolio:projects'), 'projects', "Project 0"),
+            (async_views.blogs_view, reverse('portfolio:blogs'), 'posts', "Post 0"),
+        ]:
+            with self.subTest(url):
+                page = (await self.render_context(view, url))[key]
+                self.assertIn('_rows', vars(page))
+                self.assertEqual(len(page), 3)
+                self.assertIn(expected, [row.title for row in page])
+
+    async def test_dashboard_recent_projects_are_a_list(self):
+        context = await self.render_context(async_views.admin_dashboard, reverse('portfolio:admin-dashboard'), self.user)
+        self.assertIsInstance(context['recent_projects'], list)
+        self.assertEqual(len(context['recent_projects']), 3)
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Project
+from .base import render_pages
+
+
+@render_pages
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = Project.objects.create(
+            title="Project", description="Description", technologies="Django", image='projects/example.jpg',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('portfolio:projects')
+
+    def test_response_carries_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response)
+        self.assertIn('must-revalidate', response['Cache-Control'])
+
+    def test_matching_etag_gets_a_304_from_one_query(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_if_modified_since_gets_a_304(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_second_request_is_served_from_the_cache(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_edits_and_deletions_change_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        Project.objects.filter(pk=self.project.pk).update(updated_at=timezone.now() + timedelta(seconds=5))
+        edited = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(edited.status_code, 200)
+        self.assertNotEqual(edited['ETag'], etag)
+
+        Project.objects.all().delete()
+        deleted = self.client.get(self.url, HTTP_IF_NONE_MATCH=edited['ETag'])
+        self.assertEqual(deleted.status_code, 200)
+        self.assertNotContains(deleted, "Project</")
+
+    def test_query_string_is_part_of_the_etag(self):
+        plain = self.client.get(self.url)['ETag']
+        self.assertNotEqual(self.client.get(self.url, {'cursor': 'x'})['ETag'], plain)
+
+    def test_posts_are_not_cached(self):
+        self.client.get(reverse('portfolio:home'))
+        response = self.client.post(reverse('portfolio:home'))
+        self.assertNotIn('ETag', response)
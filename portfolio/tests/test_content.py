@@ -0,0 +1,101 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from ..content import make_excerpt, reading_time, render_markdown
+from ..models import BlogPost
+
+ARTICLE = """# Title
+
+Intro with a footnote.[^1]
+
+## Setup
+
+Install **it**.
+
+### Details
+
+<script>alert(1)</script>
+[bad](javascript:alert(1)) and [good](https://example.com).
+
+[^1]: The note.
+"""
+
+
+class RenderMarkdownTests(SimpleTestCase):
+    def test_renders_sanitised_html_with_a_toc(self):
+        html, toc = render_markdown(ARTICLE)
+
+        self.assertIn('<h2 id="setup">Setup</h2>', html)
+        self.assertIn('<strong>it</strong>', html)
+        self.assertNotIn('<script', html)
+        self.assertNotIn('javascript:', html)
+        self.assertIn('href="https://example.com" rel="noopener noreferrer"', html)
+        # Footnote references and notes keep the ids they link to each other with
+        self.assertRegex(html, r'<sup id="fnref:1"><a href="#fn:1"')
+        self.assertIn('<li id="fn:1">', html)
+
+        [setup] = toc  # toc_depth 2-4: the h1 title isn't listed
+        self.assertEqual((setup['level'], setup['id'], setup['title']), (2, 'setup', 'Setup'))
+        self.assertEqual([child['title'] for child in setup['children']], ['Details'])
+
+    def test_reading_time_is_at_least_a_minute(self):
+        self.assertEqual([reading_time(words) for words in (0, 200, 201, 450)], [1, 1, 2, 3])
+
+    def test_excerpt_is_plain_and_bounded(self):
+        html, _toc = render_markdown("**Bold** &amp; " + "word " * 100)
+        excerpt = make_excerpt(html)
+        self.assertTrue(excerpt.startswith("Bold & word"))
+        self.assertTrue(excerpt.endswith('…'))
+        self.assertLessEqual(len(excerpt), 300)
+        self.assertEqual(len(excerpt.split()), 40)
+
+
+class ProcessPostTests(TestCase):
+    def create(self, **fields):
+        return BlogPost.objects.create(**{
+            'title': "Post", 'slug': 'post', 'featured_image': 'blog/example.jpg', **fields,
+        })
+
+    def test_save_stores_the_derived_fields(self):
+        post = self.create(content="Some words here. " * 100)
+        post.refresh_from_db()
+        self.assertTrue(post.content_html.startswith('<p>Some words here.'))
+        self.assertEqual((post.word_count, post.read_time), (300, 2))
+        self.assertTrue(post.excerpt.startswith("Some words here."))
+
+    def test_generated_excerpt_follows_content_edits(self):
+        post = self.create(content="First version of the post.")
+        self.assertEqual(post.excerpt, "First version of the post.")
+
+        post = BlogPost.objects.get(pk=post.pk)
+        post.content = "Second version."
+        post.save(update_fields=['content'])
+        post.refresh_from_db()
+        self.assertEqual(post.excerpt, "Second version.")
+        self.assertEqual(post.content_html, "<p>Second version.</p>")
+
+    def test_written_excerpt_is_kept(self):
+        post = self.create(content="First version.", excerpt="Hand written.")
+        post.content = "Second version."
+        post.save()
+        post.refresh_from_db()
+        self.assertEqual(post.excerpt, "Hand written.")
+
+        # Clearing it asks for a generated one again
+        post.excerpt = ''
+        post.save()
+        self.assertEqual(post.excerpt, "Second version.")
+
+    def test_reprocess_posts_writes_only_changed_rows(self):
+        post = self.create(content="# Heading\n\nBody text.")
+        BlogPost.objects.filter(pk=post.pk).update(content_html='', word_count=0)
+        out = StringIO()
+        call_command('reprocess_posts', stdout=out)
+        self.assertIn("Reprocessed 1 posts, 1 changed.", out.getvalue())
+        post.refresh_from_db()
+        self.assertEqual(post.word_count, 3)
+
+        call_command('reprocess_posts', stdout=out)
+        self.assertIn("Reprocessed 1 posts, 0 changed.", out.getvalue())
@@ -0,0 +1,60 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.test import SimpleTestCase, override_settings
+
+ALIAS = 'file_backed'
+
+
+class FileBackedSQLiteTests(SimpleTestCase):
+    """The test database is in memory, where configure_sqlite applies nothing; use a real file."""
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("SQLite only")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = str(Path(directory.name) / 'db.sqlite3')
+
+    def connect(self, **options):
+        connections[ALIAS] = type(connections['default'])(
+            {**connection.settings_dict, 'NAME': self.path, 'OPTIONS': options}, alias=ALIAS,
+        )
+        self.addCleanup(connections[ALIAS].close)
+        self.addCleanup(connections.__delitem__, ALIAS)
+        connections[ALIAS].ensure_connection()
+        return connections[ALIAS]
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    @override_settings(SQLITE_PRAGMAS={'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'temp_store': 'MEMORY'})
+    def test_new_connections_get_the_pragmas(self):
+        wrapper = self.connect()
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(wrapper, 'synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma(wrapper, 'temp_store'), 2)  # MEMORY
+
+    def test_configured_pragmas_are_accepted(self):
+        wrapper = self.connect()
+        for name in settings.SQLITE_PRAGMAS:
+            with self.subTest(name):
+                self.assertIsNotNone(self.pragma(wrapper, name))
+
+    def test_immediate_transactions_take_the_write_lock_at_begin(self):
+        wrapper = self.connect(transaction_mode='IMMEDIATE')
+        self.assertEqual(wrapper.transaction_mode, 'IMMEDIATE')
+        other = sqlite3.connect(self.path, timeout=0)
+        self.addCleanup(other.close)
+
+        with transaction.atomic(using=ALIAS):
+            # Nothing written yet, but a second writer is already shut out
+            with self.assertRaisesMessage(sqlite3.OperationalError, 'locked'):
+                other.execute('BEGIN IMMEDIATE')
+        other.execute('BEGIN IMMEDIATE')
+        other.rollback()
@@ -0,0 +1,110 @@
+import gzip
+from datetime import timedelta
+from unittest import mock
+from xml.etree import ElementTree
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import feeds
+from ..models import BlogPost, Project
+from .base import render_pages
+
+SITEMAP = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+
+def locations(response):
+    return [element.text for element in ElementTree.fromstring(response.content).iter(f'{SITEMAP}loc')]
+
+
+@render_pages
+class FeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = Project.objects.create(
+            title="Shown", description="Description", technologies="Django", image='projects/a.jpg',
+        )
+        Project.objects.create(
+            title="Hidden", description="Description", technologies="Django", image='projects/b.jpg',
+            is_active=False,
+        )
+        cls.post = BlogPost.objects.create(
+            title="Published", slug='published', content="Text", status='published',
+            featured_image='blog/a.jpg', published_date=timezone.now(),
+        )
+        BlogPost.objects.create(title="Draft", slug='draft', content="Text", featured_image='blog/b.jpg')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_sitemap_lists_the_public_urls(self):
+        response = self.client.get(reverse('portfolio:sitemap'))
+
+        self.assertEqual(response['Content-Type'], 'application/xml; charset=utf-8')
+        paths = [url.removeprefix('http://testserver') for url in locations(response)]
+        self.assertEqual(paths, [
+            *(reverse(name) for name, _changefreq in feeds.STATIC_PAGES),
+            reverse('portfolio:project_details', args=[self.project.pk]),
+            reverse('portfolio:blog_details', args=[self.post.pk]),
+        ])
+
+    def test_atom_feed_lists_published_posts(self):
+        response = self.client.get(reverse('portfolio:atom-feed'))
+
+        self.assertEqual(response['Content-Type'], 'application/atom+xml; charset=utf-8')
+        titles = [entry.findtext(f'{ATOM}title') for entry in ElementTree.fromstring(response.content).iter(f'{ATOM}entry')]
+        self.assertEqual(titles, ["Published"])
+
+    def test_unchanged_documents_revalidate_and_edits_change_the_etag(self):
+        for days, url in enumerate((reverse('portfolio:sitemap'), reverse('portfolio:atom-feed')), start=1):
+            with self.subTest(url):
+                first = self.client.get(url)
+                self.assertIn('Last-Modified', first)
+                with mock.patch.object(feeds, 'build_sitemaps') as build, mock.patch.object(feeds, 'build_feed'):
+                    repeat = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+                self.assertEqual(repeat.status_code, 304)
+                build.assert_not_called()
+
+                # Shows up in both documents: the sitemap's lastmod and the feed's <updated>
+                BlogPost.objects.filter(pk=self.post.pk).update(updated_at=timezone.now() + timedelta(days=days))
+                changed = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+                self.assertEqual(changed.status_code, 200)
+                self.assertNotEqual(changed['ETag'], first['ETag'])
+
+    def test_documents_are_stored_compressed(self):
+        with mock.patch.object(feeds.cache, 'set_many', wraps=feeds.cache.set_many) as set_many:
+            response = self.client.get(reverse('portfolio:atom-feed'))
+
+        [stored] = [value for key, value in set_many.call_args.args[0].items() if key.endswith(':feed')]
+        compressed, etag, _timestamp = stored
+        self.assertEqual(gzip.decompress(compressed), response.content)
+        self.assertEqual(etag, response['ETag'])
+
+    @override_settings(SITEMAP_MAX_URLS=3)
+    def test_large_sitemaps_become_an_index_of_shards(self):
+        index = self.client.get(reverse('portfolio:sitemap'))
+        self.assertEqual(ElementTree.fromstring(index.content).tag, f'{SITEMAP}sitemapindex')
+        # Five static pages, a project and a post: three shards of at most three URLs
+        shards = locations(index)
+        self.assertEqual(
+            [url.removeprefix('http://testserver') for url in shards],
+            [reverse('portfolio:sitemap-section', args=[section]) for section in (1, 2, 3)],
+        )
+        urls = []
+        for shard in shards:
+            response = self.client.get(shard)
+            self.assertEqual(response.status_code, 200)
+            urls.extend(locations(response))
+        self.assertEqual(len(urls), len(feeds.STATIC_PAGES) + 2)
+
+        with mock.patch.object(feeds, 'build_sitemaps') as build:
+            missing = self.client.get(reverse('portfolio:sitemap-section', args=[4]))
+        self.assertEqual(missing.status_code, 404)
+        # Junk shard numbers don't trigger a rebuild
+        build.assert_not_called()
+
+    def test_writes_are_refused(self):
+        self.assertEqual(self.client.post(reverse('portfolio:sitemap')).status_code, 405)
@@ -0,0 +1,73 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.template import Context, Template, TemplateSyntaxError
+from django.test import TestCase, override_settings
+
+from .. import fragments
+from ..models import PortfolioAnalytics, Project, Skill
+from .base import LOCMEM_CACHE
+
+SKILLS = Template(
+    "{% load cached_fragments %}"
+    "{% cachedfragment skills Skill vary_on page %}{{ skills|join:',' }}{% endcachedfragment %}"
+)
+
+
+def render(page=1):
+    names = list(Skill.objects.order_by('name').values_list('name', flat=True))
+    return SKILLS.render(Context({'skills': names, 'page': page}))
+
+
+def generation(model):
+    return fragments.generations([fragments.model_label(model)])[0]
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CachedFragmentTests(TestCase):
+    def add_skill(self, name):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Skill.objects.create(name=name, category='programming', proficiency=50)
+
+    def test_fragment_is_served_until_a_dependency_changes(self):
+        skill = self.add_skill('Python')
+        self.assertEqual(render(), 'Python')
+
+        # Writes that skip signals are invisible until bump()
+        Skill.objects.filter(pk=skill.pk).update(name='Go')
+        self.assertEqual(render(), 'Python')
+        self.assertEqual(render(page=2), 'Go')
+
+        self.add_skill('Rust')
+        self.assertEqual(render(), 'Go,Rust')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.delete()
+        self.assertEqual(render(), 'Rust')
+
+    def test_untracked_writes_leave_the_counters_alone(self):
+        before = generation(PortfolioAnalytics)
+        with self.captureOnCommitCallbacks(execute=True):
+            PortfolioAnalytics.objects.create(page_views=1)
+
+        self.assertEqual(generation(PortfolioAnalytics), before)
+
+    def test_fragments_can_only_depend_on_tracked_models(self):
+        with self.assertRaisesMessage(TemplateSyntaxError, "aren't tracked"):
+            Template("{% load cached_fragments %}{% cachedfragment x PortfolioAnalytics %}{% endcachedfragment %}")
+        with self.assertRaisesMessage(TemplateSyntaxError, "unknown model"):
+            Template("{% load cached_fragments %}{% cachedfragment x Nope %}{% endcachedfragment %}")
+
+    def test_a_failed_bump_does_not_skip_the_other_models(self):
+        before = generation(Skill)
+        incr = fragments.cache.incr
+
+        def flaky_incr(key, *args, **kwargs):
+            if key == fragments.generation_key(fragments.model_label(Project)):
+                raise DatabaseError("no such table")
+            return incr(key, *args, **kwargs)
+
+        with mock.patch.object(fragments.cache, 'incr', flaky_incr):
+            fragments.bump(Project, Skill)
+
+        self.assertEqual(generation(Skill), before + 1)
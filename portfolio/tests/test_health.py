@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from .. import health
+from ..health import HealthCheckMiddleware
+
+
+@override_settings(ALLOWED_HOSTS=['example.com'], INSTRUMENTATION_ENABLED=False)
+class ProbeTests(TestCase):
+    def test_liveness_skips_host_validation_and_the_database(self):
+        # Probes come in with the container's address as Host
+        with self.assertNumQueries(0):
+            response = self.client.get('/healthz', HTTP_HOST='10.0.0.7:8080')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok'})
+        self.assertEqual(response['Cache-Control'], 'no-store')
+        self.assertNotIn('Set-Cookie', response)
+
+    def test_readiness_checks_the_database(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/readyz', HTTP_HOST='10.0.0.7:8080')
+        self.assertEqual(response.status_code, 200)
+
+    def test_readiness_fails_without_the_database(self):
+        with mock.patch.object(health.connection, 'cursor', side_effect=DatabaseError("connection refused")), \
+                self.assertLogs('portfolio.health', 'WARNING'):
+            response = self.client.get('/readyz', HTTP_HOST='10.0.0.7:8080')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['status'], 'error')
+        self.assertEqual(response['Cache-Control'], 'no-store')
+
+    def test_other_paths_still_validate_the_host(self):
+        self.assertEqual(self.client.get('/healthz/', HTTP_HOST='10.0.0.7:8080').status_code, 400)
+
+
+class MiddlewareTests(SimpleTestCase):
+    def test_only_probe_gets_are_answered(self):
+        middleware = HealthCheckMiddleware(lambda request: HttpResponse('app'))
+        factory = RequestFactory()
+
+        self.assertEqual(middleware(factory.get('/healthz')).status_code, 200)
+        self.assertEqual(middleware(factory.head('/healthz'))['Cache-Control'], 'no-store')
+        self.assertEqual(middleware(factory.post('/healthz')).content, b'app')
+        self.assertEqual(middleware(factory.get('/about/')).content, b'app')
+
+    async def test_async_stack(self):
+        async def get_response(request):
+            return HttpResponse('app')
+
+        middleware = HealthCheckMiddleware(get_response)
+        factory = RequestFactory()
+        self.assertEqual((await middleware(factory.get('/healthz'))).status_code, 200)
+        self.assertEqual((await middleware(factory.get('/about/'))).content, b'app')
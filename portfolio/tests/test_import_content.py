@@ -0,0 +1,96 @@
+import json
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+
+from ..models import AnalyticsRollup, BlogPost, PortfolioAnalytics, Skill
+
+SKILLS_CSV = """name,category,proficiency,is_featured
+Python,programming,90,yes
+Django,framework,85,
+Juggling,circus,50,no
+"""
+
+
+def ndjson(*rows):
+    return ''.join(json.dumps(row) + '\n' for row in rows)
+
+
+def post_row(slug, **fields):
+    return {'slug': slug, 'title': slug.title(), 'content': f"About {slug}.", 'featured_image': 'blog/a.jpg', **fields}
+
+
+class ImportContentTests(TestCase):
+    def run_import(self, model, data, *args, fmt='ndjson'):
+        stdout, stderr = StringIO(), StringIO()
+        with mock.patch('sys.stdin', StringIO(data)):
+            call_command('import_content', model, '-', '--format', fmt, *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_csv_rows_are_validated_and_invalid_ones_reported(self):
+        out, err = self.run_import('skill', SKILLS_CSV, fmt='csv')
+
+        self.assertEqual(
+            list(Skill.objects.order_by('name').values_list('name', 'is_featured')),
+            [('Django', False), ('Python', True)],
+        )
+        self.assertIn('Line 4: category:', err)
+        self.assertIn('2 skills imported, 1 invalid rows skipped.', out)
+
+    def test_strict_stops_at_the_first_invalid_row(self):
+        with self.assertRaisesMessage(CommandError, 'Line 4'):
+            self.run_import('skill', SKILLS_CSV, '--strict', fmt='csv')
+
+    def test_dry_run_writes_nothing(self):
+        out, _err = self.run_import('skill', SKILLS_CSV, '--dry-run', fmt='csv')
+
+        self.assertFalse(Skill.objects.exists())
+        self.assertIn('2 skills validated', out)
+
+    def test_posts_are_upserted_on_slug(self):
+        self.assert_posts_upserted()
+
+    def test_posts_are_upserted_without_a_conflict_target(self):
+        # MySQL / MariaDB: look up the existing rows, update them, insert the rest
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False):
+            self.assert_posts_upserted()
+
+    def assert_posts_upserted(self):
+        self.run_import('blogpost', ndjson(post_row('kept', title='Old'), post_row('counted')))
+        BlogPost.objects.filter(slug='kept').update(view_count=7)
+        stamped = BlogPost.objects.get(slug='kept').updated_at
+
+        self.run_import('blogpost', ndjson(
+            post_row('kept', title='New', content="Fresh **words**."),
+            post_row('added'),
+        ))
+
+        kept = BlogPost.objects.get(slug='kept')
+        self.assertEqual(kept.title, 'New')
+        self.assertIn('<strong>words</strong>', kept.content_html)
+        # Fields the input doesn't mention survive the re-import
+        self.assertEqual(kept.view_count, 7)
+        self.assertGreater(kept.updated_at, stamped)
+        self.assertEqual(sorted(BlogPost.objects.values_list('slug', flat=True)), ['added', 'counted', 'kept'])
+
+    def test_analytics_upsert_refreshes_the_rollups(self):
+        PortfolioAnalytics.objects.create(date=date(2026, 3, 2), page_views=1, resume_downloads=4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.run_import('analytics', ndjson(
+                {'date': '2026-03-02', 'page_views': 10},
+                {'date': '2026-03-03', 'page_views': 5},
+                {'date': '2026-03-03', 'page_views': 6},  # a later row for the same date wins
+            ))
+
+        self.assertEqual(
+            list(PortfolioAnalytics.objects.order_by('date').values_list('page_views', 'resume_downloads')),
+            [(10, 4), (6, 0)],
+        )
+        week = AnalyticsRollup.objects.get(granularity='week', period_start=date(2026, 3, 2))
+        self.assertEqual((week.days, week.page_views), (2, 16))
@@ -0,0 +1,124 @@
+import json
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import outbox
+from ..models import OutboxEmail
+from .base import render_pages
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    OUTBOX_MAX_ATTEMPTS=2,
+    OUTBOX_RETRY_BASE_SECONDS=30,
+)
+class OutboxTests(TestCase):
+    def enqueue(self, subject="Hello"):
+        return outbox.enqueue_mail(subject, "Body", "site@example.com", ["me@example.com"])
+
+    def make_due(self):
+        OutboxEmail.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+
+    def test_claim_leases_the_batch(self):
+        first, second = self.enqueue("One"), self.enqueue("Two")
+        before = timezone.now()
+        claimed = outbox.claim_batch(10)
+
+        self.assertEqual({email.pk for email in claimed}, {first.pk, second.pk})
+        for email in OutboxEmail.objects.all():
+            self.assertEqual(email.status, 'sending')
+            self.assertGreaterEqual(email.next_attempt_at, before + outbox.lease_duration(2))
+        # Leased rows are skipped until the lease runs out
+        self.assertEqual(outbox.claim_batch(10), [])
+
+        self.make_due()
+        self.assertEqual(len(outbox.claim_batch(10)), 2)
+
+    def test_claim_respects_batch_size_and_schedule(self):
+        self.enqueue("One")
+        self.enqueue("Two")
+        later = self.enqueue("Later")
+        OutboxEmail.objects.filter(pk=later.pk).update(next_attempt_at=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(len(outbox.claim_batch(1)), 1)
+        self.assertEqual(len(outbox.claim_batch(10)), 1)
+        self.assertEqual(outbox.claim_batch(10), [])
+
+    def test_deliver_sends_and_marks_sent(self):
+        email = self.enqueue()
+        self.assertEqual(outbox.deliver_batch(), (1, 0))
+
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('sent', 1))
+        self.assertIsNotNone(email.sent_at)
+        self.assertEqual([message.subject for message in mail.outbox], ["Hello"])
+
+    def test_failures_retry_with_backoff_then_give_up(self):
+        email = self.enqueue()
+        send = 'django.core.mail.backends.locmem.EmailBackend.send_messages'
+        with mock.patch(send, side_effect=SMTPException("relay said no")), self.assertLogs('portfolio.outbox'):
+            before = timezone.now()
+            self.assertEqual(outbox.deliver_batch(), (0, 1))
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts), ('pending', 1))
+            self.assertEqual(email.last_error, "relay said no")
+            self.assertGreaterEqual(email.next_attempt_at, before + timedelta(seconds=30))
+
+            # Not due yet
+            self.assertEqual(outbox.deliver_batch(), (0, 0))
+
+            self.make_due()
+            self.assertEqual(outbox.deliver_batch(), (0, 1))
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts), ('failed', 2))
+
+        self.make_due()
+        self.assertEqual(outbox.deliver_batch(), (0, 0))
+        self.assertEqual(mail.outbox, [])
+
+    def test_unreachable_relay_counts_an_attempt_for_the_batch(self):
+        self.enqueue("One")
+        self.enqueue("Two")
+        refused = mock.patch('django.core.mail.backends.locmem.EmailBackend.open', side_effect=OSError("refused"))
+        with refused, self.assertLogs('portfolio.outbox') as logs:
+            self.assertEqual(outbox.deliver_batch(), (0, 2))
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(list(OutboxEmail.objects.values_list('status', 'attempts')), [('pending', 1)] * 2)
+
+    def test_enqueue_truncates_the_subject(self):
+        email = self.enqueue("x" * 300)
+        self.assertEqual(len(email.subject), 255)
+
+
+@render_pages
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', RATE_LIMIT_ENABLED=False)
+class ContactQueueTests(TestCase):
+    def post(self, **data):
+        return self.client.post(
+            reverse('portfolio:contact'), json.dumps(data),
+            content_type='application/json', HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+
+    def test_contact_form_queues_instead_of_sending(self):
+        response = self.post(name="Ann", email="ann@example.com", subject="Hi", message="Hello")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(
+            sorted(OutboxEmail.objects.values_list('recipients', flat=True)),
+            [['ann@example.com'], ['jonasmwansa7@gmail.com']],
+        )
+
+        self.assertEqual(outbox.deliver_batch(), (2, 0))
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_invalid_posts_queue_nothing(self):
+        self.assertEqual(self.post(name="Ann").status_code, 400)
+        self.assertEqual(self.post(name="Ann", email="a@example.com", subject="Hi\nBcc: x", message="m").status_code, 400)
+        self.assertFalse(OutboxEmail.objects.exists())
@@ -0,0 +1,113 @@
+import re
+from datetime import timedelta
+from html import unescape
+
+from django.core import signing
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Project
+from ..pagination import KeysetPaginator
+from ..views import PUBLIC_PAGE_SIZE
+from .base import render_pages
+
+NEXT_LINK_RE = re.compile(r'href="(\?cursor=[^"]+)" rel="next"')
+
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        created = timezone.now()
+        for index in range(7):
+            # Pairs share a timestamp, so pages break across pk ties
+            Project.objects.create(
+                title=f"Project {index}",
+                description="Description",
+                technologies="Django",
+                image='projects/example.jpg',
+                created_at=created - timedelta(days=index // 2),
+            )
+
+    def setUp(self):
+        self.paginator = KeysetPaginator(Project.objects.all(), ['-created_at'], per_page=3)
+        self.expected = list(Project.objects.order_by('-created_at', '-pk').values_list('pk', flat=True))
+
+    def pks(self, page):
+        return [project.pk for project in page]
+
+    def test_next_cursors_walk_every_row_once(self):
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = self.paginator.page(cursor)
+            seen.extend(self.pks(page))
+            pages += 1
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(pages, 3)
+        self.assertIsNone(page.next_cursor)
+
+    def test_previous_cursor_returns_the_same_page(self):
+        first = self.paginator.page()
+        self.assertFalse(first.has_previous)
+        second = self.paginator.page(first.next_cursor)
+        third = self.paginator.page(second.next_cursor)
+
+        back = self.paginator.page(third.previous_cursor)
+        self.assertEqual(self.pks(back), self.pks(second))
+        self.assertTrue(back.has_next)
+        self.assertEqual(self.pks(self.paginator.page(back.previous_cursor)), self.pks(first))
+
+    def test_cursor_round_trips_the_sort_key(self):
+        project = Project.objects.get(pk=self.expected[2])
+        values, direction = self.paginator.decode_cursor(self.paginator.encode_cursor(project, 'previous'))
+        self.assertEqual(values, [project.created_at, project.pk])
+        self.assertEqual(direction, 'previous')
+
+    def test_tampered_cursors_fall_back_to_the_first_page(self):
+        cursor = self.paginator.page().next_cursor
+        forged = signing.dumps({'k': ['2000-01-01T00:00:00+00:00', 1], 'd': 'next'}, salt='other')
+        wrong_arity = signing.dumps({'k': [1], 'd': 'next'}, salt='portfolio.pagination')
+        for bad in (cursor[:-2] + 'xx', forged, wrong_arity, 'garbage'):
+            with self.subTest(cursor=bad):
+                self.assertEqual(self.paginator.decode_cursor(bad), (None, 'next'))
+                self.assertEqual(self.pks(self.paginator.page(bad)), self.expected[:3])
+
+
+@render_pages
+class PublicProjectListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        created = timezone.now()
+        for index in range(PUBLIC_PAGE_SIZE + 3):
+            Project.objects.create(
+                title=f"Project {index}",
+                description="Description",
+                technologies="Django",
+                image='projects/example.jpg',
+                # Curated order runs against creation order for half the rows
+                display_order=index % 2,
+                created_at=created - timedelta(hours=index),
+            )
+        Project.objects.create(
+            title="Hidden", description="Description", technologies="Django",
+            image='projects/example.jpg', is_active=False,
+        )
+
+    def titles(self, response):
+        return re.findall(r'<a href="/projects/\d+/">([^<]+)</a>', response.content.decode())
+
+    def test_pages_follow_the_curated_order(self):
+        expected = list(
+            Project.objects.filter(is_active=True).order_by('display_order', '-created_at', 'pk')
+            .values_list('title', flat=True)
+        )
+        first = self.client.get(reverse('portfolio:projects'))
+        self.assertEqual(self.titles(first), expected[:PUBLIC_PAGE_SIZE])
+
+        next_url = unescape(NEXT_LINK_RE.search(first.content.decode()).group(1))
+        second = self.client.get(reverse('portfolio:projects') + next_url)
+        self.assertEqual(self.titles(second), expected[PUBLIC_PAGE_SIZE:])
+        self.assertIsNone(NEXT_LINK_RE.search(second.content.decode()))
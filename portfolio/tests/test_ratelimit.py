@@ -0,0 +1,106 @@
+import json
+
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import OutboxEmail
+from ..ratelimit import Bucket, client_ip
+from .base import LOCMEM_CACHE, render_pages
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class BucketTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.bucket = Bucket('test', '2/m')
+
+    def test_take_refuses_once_the_bucket_is_empty(self):
+        self.assertEqual(self.bucket.take(120)[1], 0)
+        self.assertEqual(self.bucket.take(130)[1], 0)
+        key, wait = self.bucket.take(150)
+        # Half of this period's two tokens still count halfway into the next one
+        self.assertEqual(wait, 60)
+        self.assertEqual(key, 'test:2')
+
+    def test_refused_request_can_retry_after_the_wait(self):
+        self.bucket.take(120)
+        self.bucket.take(120)
+        key, wait = self.bucket.take(120)
+        self.assertEqual(wait, 90)
+        cache.decr(key)  # handed back, as ratelimit.check() does
+
+        key, early = self.bucket.take(120 + wait - 1)
+        self.assertGreater(early, 0)
+        cache.decr(key)
+        self.assertEqual(self.bucket.take(120 + wait)[1], 0)
+
+    def test_previous_period_drains(self):
+        for _ in range(2):
+            self.bucket.take(60)
+        # Early in the next period the previous two still weigh almost fully
+        key, wait = self.bucket.take(121)
+        self.assertGreater(wait, 0)
+        cache.decr(key)
+        self.assertEqual(self.bucket.take(150)[1], 0)
+
+    def test_retry_after(self):
+        bucket = Bucket('test', '10/m')
+        # Room left in this period once the previous one has drained enough
+        self.assertEqual(bucket.retry_after(elapsed=0.5, previous=10, used=5), 6)
+        # This period is full: wait for it to become the previous one and drain
+        self.assertEqual(bucket.retry_after(elapsed=0.5, previous=0, used=10), 36)
+        self.assertEqual(bucket.retry_after(elapsed=0.999, previous=10, used=0), 1)
+
+
+class ClientIpTests(SimpleTestCase):
+    def request(self, forwarded):
+        return RequestFactory().get('/', REMOTE_ADDR='10.0.0.2', HTTP_X_FORWARDED_FOR=forwarded)
+
+    def test_without_proxies_x_forwarded_for_is_ignored(self):
+        with self.settings(RATE_LIMIT_PROXY_COUNT=0):
+            self.assertEqual(client_ip(self.request('1.2.3.4')), '10.0.0.2')
+
+    def test_counts_trusted_proxies_from_the_right(self):
+        # The client can prepend whatever it likes; our proxy appended the last entry
+        with self.settings(RATE_LIMIT_PROXY_COUNT=1):
+            self.assertEqual(client_ip(self.request('6.6.6.6, 1.2.3.4')), '1.2.3.4')
+        with self.settings(RATE_LIMIT_PROXY_COUNT=2):
+            self.assertEqual(client_ip(self.request('6.6.6.6, 1.2.3.4, 10.0.0.1')), '1.2.3.4')
+            # Fewer entries than proxies: the header wasn't set by our chain
+            self.assertEqual(client_ip(self.request('1.2.3.4')), '10.0.0.2')
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHE,
+    INSTRUMENTATION_ENABLED=False,
+    RATE_LIMIT_ENABLED=True,
+    RATE_LIMITS={'contact': {'ip': '2/h', 'route': '60/h'}},
+)
+class ContactRateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def post(self, address='1.2.3.4'):
+        return self.client.post(
+            reverse('portfolio:contact'),
+            json.dumps({'name': "Ann", 'email': "ann@example.com", 'subject': "Hi", 'message': "Hello"}),
+            content_type='application/json', HTTP_X_REQUESTED_WITH='XMLHttpRequest', REMOTE_ADDR=address,
+        )
+
+    def test_posts_past_the_limit_get_a_429(self):
+        self.assertEqual([self.post().status_code for _ in range(2)], [200, 200])
+
+        refused = self.post()
+        self.assertEqual(refused.status_code, 429)
+        self.assertFalse(refused.json()['success'])
+        self.assertGreater(int(refused['Retry-After']), 0)
+        # Nothing was queued for the refused post, and other clients are unaffected
+        self.assertEqual(OutboxEmail.objects.count(), 4)
+        self.assertEqual(self.post(address='5.6.7.8').status_code, 200)
+
+    @render_pages
+    def test_get_is_not_limited(self):
+        for _ in range(3):
+            self.post()
+        self.assertEqual(self.client.get(reverse('portfolio:contact'), REMOTE_ADDR='1.2.3.4').status_code, 200)
@@ -0,0 +1,98 @@
+import json
+import re
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import Client, TestCase
+
+from ..management.commands import render_static
+from ..models import BlogPost, Project
+from ..views import PUBLIC_PAGE_SIZE
+from .base import render_pages
+
+
+class InlinePool:
+    """ProcessPoolExecutor stand-in: worker processes can't see the in-memory test database."""
+
+    def __init__(self, max_workers=None, initializer=None, initargs=()):
+        render_static._client = Client(HTTP_HOST=initargs[0])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def map(self, func, jobs, chunksize=1):
+        return map(func, jobs)
+
+
+@render_pages
+@mock.patch.object(render_static, 'ProcessPoolExecutor', InlinePool)
+class RenderStaticTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.projects = [
+            Project.objects.create(
+                title=f"Project {index}", description="Description", technologies="Django",
+                image='projects/example.jpg', display_order=index,
+            )
+            for index in range(PUBLIC_PAGE_SIZE * 2 + 1)
+        ]
+        cls.post = BlogPost.objects.create(
+            title="Post", slug='post', content="Text", status='published', featured_image='blog/example.jpg',
+        )
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def build(self, *args):
+        out = StringIO()
+        call_command('render_static', '--output', str(self.root), '--host', 'testserver', *args, stdout=out)
+        return out.getvalue()
+
+    def html(self, path):
+        return (self.root / path / 'index.html').read_text()
+
+    def titles(self, path):
+        return re.findall(r'<a href="/projects/\d+/">([^<]+)</a>', self.html(path))
+
+    def test_every_list_page_gets_its_own_path(self):
+        self.build()
+        self.assertEqual(self.titles('projects'), [f"Project {i}" for i in range(PUBLIC_PAGE_SIZE)])
+        self.assertEqual(
+            self.titles('projects/page/2'), [f"Project {i}" for i in range(PUBLIC_PAGE_SIZE, PUBLIC_PAGE_SIZE * 2)],
+        )
+        self.assertEqual(self.titles('projects/page/3'), [f"Project {PUBLIC_PAGE_SIZE * 2}"])
+
+        self.assertIn('href="/projects/page/2/" rel="next"', self.html('projects'))
+        self.assertIn('href="/projects/" rel="prev"', self.html('projects/page/2'))
+        self.assertIn('href="/projects/page/3/" rel="next"', self.html('projects/page/2'))
+        self.assertIn('href="/projects/page/2/" rel="prev"', self.html('projects/page/3'))
+        for page in self.root.rglob('index.html'):
+            self.assertNotIn('?cursor=', page.read_text(), page)
+
+        self.assertTrue((self.root / 'blogs' / 'index.html').exists())
+        self.assertTrue((self.root / 'blogs' / str(self.post.pk) / 'index.html').exists())
+        self.assertFalse((self.root / 'blogs' / 'page').exists())
+
+    def test_later_builds_render_only_what_changed(self):
+        self.build()
+        self.assertIn("Rendered 0 of", self.build())
+
+        BlogPost.objects.filter(pk=self.post.pk).update(status='draft')
+        Project.objects.filter(pk__in=[project.pk for project in self.projects[PUBLIC_PAGE_SIZE:]]).delete()
+        output = self.build()
+
+        # Two list pages, the deleted projects' pages and the unpublished post's
+        self.assertIn(f"{2 + PUBLIC_PAGE_SIZE + 1 + 1} removed", output)
+        self.assertFalse((self.root / 'projects' / 'page' / '2').exists())
+        self.assertFalse((self.root / 'blogs' / str(self.post.pk)).exists())
+        self.assertNotIn('rel="next"', self.html('projects'))
+        manifest = json.loads((self.root / render_static.MANIFEST_NAME).read_text())
+        self.assertNotIn('/projects/page/2/', manifest)
@@ -0,0 +1,110 @@
+import json
+from datetime import date, timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import analytics, rollups
+from ..analytics import DeltaBuffer
+from ..models import AnalyticsRollup, OutboxEmail, PortfolioAnalytics
+
+
+class RefreshBucketsTests(TestCase):
+    # 2024-01-01 is a Monday
+    monday = date(2024, 1, 1)
+
+    def rollup(self, granularity, start):
+        return AnalyticsRollup.objects.get(granularity=granularity, period_start=start)
+
+    def test_creates_updates_and_deletes_buckets(self):
+        days = [self.monday, self.monday + timedelta(days=1), self.monday + timedelta(days=7)]
+        for day, views in zip(days, (10, 5, 7)):
+            PortfolioAnalytics.objects.create(date=day, page_views=views, unique_visitors=1)
+        rollups.refresh_buckets(days)
+
+        week = self.rollup('week', self.monday)
+        self.assertEqual((week.page_views, week.unique_visitors, week.days), (15, 2, 2))
+        self.assertEqual(self.rollup('week', days[2]).page_views, 7)
+        month = self.rollup('month', self.monday)
+        self.assertEqual((month.page_views, month.days), (22, 3))
+
+        PortfolioAnalytics.objects.filter(date=days[1]).update(page_views=6)
+        PortfolioAnalytics.objects.filter(date=days[2]).delete()
+        rollups.refresh_buckets([days[1], days[2]])
+
+        self.assertEqual(self.rollup('week', self.monday).page_views, 16)
+        self.assertFalse(AnalyticsRollup.objects.filter(granularity='week', period_start=days[2]).exists())
+        month = self.rollup('month', self.monday)
+        self.assertEqual((month.page_views, month.days), (16, 2))
+
+    def test_only_touches_buckets_of_the_given_dates(self):
+        february = date(2024, 2, 5)
+        PortfolioAnalytics.objects.create(date=self.monday, page_views=3)
+        PortfolioAnalytics.objects.create(date=february, page_views=4)
+        rollups.refresh_buckets([february])
+
+        self.assertEqual(
+            set(AnalyticsRollup.objects.values_list('granularity', 'period_start')),
+            {('week', february), ('month', date(2024, 2, 1))},
+        )
+
+    def test_matches_a_full_rebuild(self):
+        days = [self.monday + timedelta(days=offset) for offset in range(0, 70, 3)]
+        for offset, day in enumerate(days):
+            PortfolioAnalytics.objects.create(date=day, page_views=offset, resume_downloads=1)
+        rollups.refresh_buckets(days)
+        refreshed = list(AnalyticsRollup.objects.values())
+
+        rollups.rebuild()
+        rebuilt = list(AnalyticsRollup.objects.values())
+        strip = lambda rows: [{k: v for k, v in row.items() if k != 'id'} for row in rows]  # noqa: E731
+        self.assertEqual(strip(refreshed), strip(rebuilt))
+
+
+class RefreshBucketsWithoutConflictTargetTests(RefreshBucketsTests):
+    """The same, through the lookup-and-update upsert MySQL and MariaDB use."""
+
+    def setUp(self):
+        patcher = mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+def failing_refresh(dates):
+    raise RuntimeError("rollup table is locked")
+
+
+@mock.patch.object(rollups, 'refresh_buckets', failing_refresh)
+class FailedRefreshTests(TransactionTestCase):
+    """A refresh runs after the daily rows commit; its failure must not undo or repeat them."""
+
+    day = date(2024, 3, 1)
+
+    def test_flush_does_not_buffer_committed_deltas_again(self):
+        buffer = DeltaBuffer(analytics._apply_page_views, flush_size=1000, flush_interval=60 * 60)
+        buffer.add(self.day, page_views=2)
+
+        with self.assertLogs('django.db.backends.base', 'ERROR'):
+            buffer.flush()
+        buffer.flush()
+
+        self.assertEqual(PortfolioAnalytics.objects.get(date=self.day).page_views, 2)
+        self.assertEqual(buffer.pending(), {})
+
+    @override_settings(INSTRUMENTATION_ENABLED=False)
+    def test_contact_submission_still_succeeds(self):
+        with self.assertLogs('django.db.backends.base', 'ERROR'):
+            response = self.client.post(
+                reverse('portfolio:contact'),
+                json.dumps({'name': "Ann", 'email': "ann@example.com", 'subject': "Hi", 'message': "Hello"}),
+                content_type='application/json', HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(OutboxEmail.objects.count(), 2)
+        today = PortfolioAnalytics.objects.get(date=timezone.now().date())
+        self.assertEqual(today.contact_form_submissions, 1)
@@ -0,0 +1,119 @@
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from .. import search
+from ..models import BlogPost, Project
+from .base import render_pages
+
+MARKDOWN = """# Caching pages
+
+Serving **rendered** pages from the cache with [conditional requests](https://example.com/etag).
+
+* Fewer queries
+* Smaller responses
+"""
+
+
+def post(**fields):
+    return BlogPost.objects.create(**{
+        'title': "Post", 'slug': fields.get('title', 'post').lower().replace(' ', '-'), 'content': "Text",
+        'status': 'published', 'featured_image': 'blog/example.jpg', **fields,
+    })
+
+
+def project(**fields):
+    return Project.objects.create(**{
+        'title': "Project", 'description': "Description", 'technologies': "Django",
+        'image': 'projects/example.jpg', **fields,
+    })
+
+
+class SearchTests(TestCase):
+    def titles(self, query):
+        return [result['title'] for result in search.search(query)]
+
+    def test_posts_are_indexed_as_plain_text(self):
+        post(title="Caching", content=MARKDOWN)
+        [result] = search.search("rendered")
+
+        self.assertEqual(result['type'], 'blog')
+        self.assertIn('<mark>rendered</mark> pages', result['snippet'])
+        for syntax in ('**', '](', '# ', '* '):
+            self.assertNotIn(syntax, result['snippet'])
+        self.assertEqual(search.search("example"), [])  # link targets aren't text
+
+    def test_unpublished_and_inactive_content_is_not_listed(self):
+        draft = post(title="Draft notes", status='draft')
+        hidden = project(title="Hidden notes", is_active=False)
+        self.assertEqual(search.search("notes"), [])
+
+        draft.status = 'published'
+        draft.save()
+        self.assertEqual(self.titles("notes"), ["Draft <mark>notes</mark>"])
+
+        draft.status = 'draft'
+        draft.save()
+        hidden.is_active = True
+        hidden.save()
+        self.assertEqual(self.titles("notes"), ["Hidden <mark>notes</mark>"])
+
+        hidden.delete()
+        self.assertEqual(search.search("notes"), [])
+
+    def test_title_matches_rank_first_and_terms_prefix_match(self):
+        post(title="Deploying Django", content="Notes on servers.")
+        project(title="Blog engine", description="Written with Django and deployed twice.")
+        self.assertEqual(
+            self.titles("deploy"), ["<mark>Deploying</mark> Django", "Blog engine"],
+        )
+        self.assertEqual(self.titles("django twice"), ["Blog engine"])
+
+    def test_results_are_escaped_and_operators_are_literal(self):
+        project(title="<b>Tags</b> & more", description="Markup in titles")
+        [result] = search.search('tags')
+        self.assertEqual(result['title'], '&lt;b&gt;<mark>Tags</mark>&lt;/b&gt; &amp; more')
+        self.assertEqual(search.search('"tags* ('), search.search('tags'))
+        self.assertEqual(search.search('!!!'), [])
+
+    def test_rebuild_matches_signal_maintained_index(self):
+        post(title="Caching", content=MARKDOWN)
+        project(title="Cache server")
+        before = search.search("cach")
+        search.clear_index()
+        self.assertEqual(search.search("cach"), [])
+
+        call_command('rebuild_search_index', stdout=mock.Mock())
+        self.assertEqual(search.search("cach"), before)
+
+
+class FallbackSearchTests(TestCase):
+    def test_icontains_fallback_ranks_and_quotes_plain_text(self):
+        post(title="Caching", content=MARKDOWN)
+        project(title="Rendered charts", description="Rendered server side.")
+
+        with mock.patch.object(search, 'is_supported', return_value=False), \
+                self.assertLogs('portfolio.search', 'WARNING'):
+            search._warn_unindexed.cache_clear()
+            results = search.search("rendered")
+
+        self.assertEqual([result['type'] for result in results], ['project', 'blog'])
+        self.assertIn('<mark>rendered</mark> pages', results[1]['snippet'])
+        self.assertNotIn('**', results[1]['snippet'])
+
+
+@render_pages
+class SearchViewTests(TestCase):
+    def test_returns_json_and_clamps_the_limit(self):
+        for index in range(3):
+            project(title=f"Widget {index}")
+        url = reverse('portfolio:search')
+
+        data = self.client.get(url, {'q': 'widget', 'limit': 2}).json()
+        self.assertEqual((data['query'], data['count']), ('widget', 2))
+        self.assertEqual(data['results'][0]['url'], reverse('portfolio:project_details', args=[data['results'][0]['id']]))
+
+        self.assertEqual(self.client.get(url, {'q': 'widget', 'limit': 'x'}).json()['count'], 3)
+        self.assertEqual(self.client.get(url).json(), {'query': '', 'count': 0, 'results': []})
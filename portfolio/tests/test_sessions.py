@@ -0,0 +1,76 @@
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from ..sessions import AuthenticationMiddleware, MessageMiddleware, SessionMiddleware
+from .base import render_pages
+
+
+def session_stack(get_response):
+    return SessionMiddleware(AuthenticationMiddleware(MessageMiddleware(get_response)))
+
+
+class PathScopedMiddlewareTests(SimpleTestCase):
+    def test_public_paths_get_an_anonymous_user_and_no_session(self):
+        seen = {}
+
+        def view(request):
+            seen['request'] = request
+            return HttpResponse()
+
+        response = session_stack(view)(RequestFactory().get('/about/', HTTP_COOKIE='sessionid=abc'))
+
+        request = seen['request']
+        self.assertFalse(hasattr(request, 'session'))
+        self.assertFalse(hasattr(request, '_messages'))
+        self.assertFalse(request.user.is_authenticated)
+        self.assertFalse(response.has_header('Vary'))
+        self.assertFalse(response.cookies)
+
+    async def test_async_stack_passes_public_requests_straight_through(self):
+        async def view(request):
+            user = await request.auser()
+            return HttpResponse(str(user.is_authenticated))
+
+        response = await session_stack(view)(RequestFactory().get('/blogs/'))
+        self.assertEqual(response.content, b'False')
+
+    def test_dashboard_paths_load_the_session(self):
+        with self.settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies'):
+            def view(request):
+                request.session['seen'] = True
+                return HttpResponse()
+
+            response = session_stack(view)(RequestFactory().get('/dashboard/'))
+        self.assertIn('sessionid', response.cookies)
+
+
+@render_pages
+class DashboardLoginTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('editor', 'editor@example.com', 'secret')
+
+    def test_login_reaches_the_dashboard(self):
+        self.assertRedirects(
+            self.client.get(reverse('portfolio:admin-dashboard')),
+            f"{reverse('portfolio:admin-login')}?next={reverse('portfolio:admin-dashboard')}",
+        )
+        response = self.client.post(
+            reverse('portfolio:admin-login'), {'username': 'editor', 'password': 'secret'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+        self.assertEqual(response.json()['status'], 'success')
+        self.assertIn('sessionid', response.cookies)
+        self.assertEqual(self.client.get(reverse('portfolio:admin-dashboard')).status_code, 200)
+
+    def test_public_pages_ignore_the_login(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('portfolio:about'))
+
+        self.assertEqual(response.status_code, 200)
+        # Cached and shared between visitors: nothing here may vary on the session
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+        self.assertNotIn('sessionid', response.cookies)
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
@@ -0,0 +1,64 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from .. import models
+from ..models import SITE_SETTINGS_VERSION_KEY, SiteSettings
+
+
+@override_settings(SITE_SETTINGS_CHECK_INTERVAL=5)
+class GetSoloTests(TestCase):
+    """Runs on the default (database) cache, where a version check is a query."""
+
+    def setUp(self):
+        models._site_settings_cache[:] = [None, None, 0.0]
+        self.addCleanup(models._site_settings_cache.__setitem__, slice(None), [None, None, 0.0])
+        cache.delete(SITE_SETTINGS_VERSION_KEY)
+        SiteSettings.objects.create(site_name="First")
+        clock = mock.patch.object(models.time, 'monotonic', return_value=1000.0)
+        self.clock = clock.start()
+        self.addCleanup(clock.stop)
+
+    def edit_elsewhere(self, name):
+        """Another worker's save: the row and the stamp change, this process's copy doesn't."""
+        SiteSettings.objects.update(site_name=name)
+        cache.set(SITE_SETTINGS_VERSION_KEY, name, None)
+
+    def test_repeat_calls_run_no_queries_within_the_interval(self):
+        self.assertEqual(SiteSettings.get_solo().site_name, "First")
+        self.clock.return_value += 4
+        with self.assertNumQueries(0):
+            self.assertEqual(SiteSettings.get_solo().site_name, "First")
+
+    def test_unchanged_stamp_is_rechecked_without_reloading(self):
+        first = SiteSettings.get_solo()
+        self.clock.return_value += 6
+        with self.assertNumQueries(1):  # the stamp, not the row
+            self.assertIs(SiteSettings.get_solo(), first)
+
+    def test_other_workers_edits_show_after_the_interval(self):
+        SiteSettings.get_solo()
+        self.edit_elsewhere("Second")
+        self.assertEqual(SiteSettings.get_solo().site_name, "First")
+        self.clock.return_value += 6
+        self.assertEqual(SiteSettings.get_solo().site_name, "Second")
+
+    def test_own_saves_show_at_once(self):
+        settings_row = SiteSettings.get_solo()
+        with self.captureOnCommitCallbacks(execute=True):
+            settings_row.site_name = "Saved"
+            settings_row.save()
+        self.assertEqual(SiteSettings.get_solo().site_name, "Saved")
+
+    def test_deleting_falls_back_to_defaults(self):
+        SiteSettings.get_solo()
+        with self.captureOnCommitCallbacks(execute=True):
+            SiteSettings.objects.get().delete()
+        default = SiteSettings.get_solo()
+        self.assertIsNone(default.pk)
+        self.assertEqual(default.site_name, "Jonas Portfolio")
+
+    def test_save_keeps_a_single_row(self):
+        SiteSettings(site_name="Duplicate").save()
+        self.assertEqual(list(SiteSettings.objects.values_list('site_name', flat=True)), ["Duplicate"])
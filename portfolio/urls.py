@@ -4,31 +4,53 @@ portfolio/urls.py
 URL configuration for portfolio application.
 
 """
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import views, async_views, api, health, feeds
 
 # Define the app namespace
 app_name = 'portfolio'
 
-urlpatterns = [
-    # Main pages
-    path('', views.home_view, name='home'),
-    path('about/', views.about_view, name='about'),
-    path('projects/', views.projects_view, name='projects'),
-    path('blogs/', views.blogs_view, name='blogs'),
-    path('contact/', views.contact_view, name='contact'),
-    
-    # Detail pages (placeholders for now)
-    path('projects/<int:pk>/', views.project_details_view, name='project_details'),
-    path('blogs/<int:pk>/', views.blog_details_view, name='blog_details'),
-    
-    # Admin Dashboard URLs
-    path('dashboard/', views.admin_dashboard, name='admin-dashboard'),
-    path('dashboard/login/', views.admin_login, name='admin-login'),
-    path('dashboard/logout/', views.admin_logout, name='admin-logout'),
-    path('dashboard/projects/', views.manage_projects, name='manage-projects'),
-    path('dashboard/skills/', views.manage_skills, name='manage-skills'),
-    path('dashboard/blog/', views.manage_blog, name='manage-blog'),
-    path('dashboard/about/', views.manage_about, name='manage-about'),
-    path('dashboard/certifications/', views.manage_certifications, name='manage-certifications'),
-]
\ No newline at end of file
+
+def build_urlpatterns(pages):
+    """The app's routes, with the public pages, contact and dashboard views taken from ``pages``."""
+    return [
+        # Main pages
+        path('', pages.home_view, name='home'),
+        path('about/', pages.about_view, name='about'),
+        path('projects/', pages.projects_view, name='projects'),
+        path('blogs/', pages.blogs_view, name='blogs'),
+        path('contact/', pages.contact_view, name='contact'),
+        path('search/', pages.search_view, name='search'),
+
+        # Detail pages (placeholders for now)
+        path('projects/<int:pk>/', pages.project_details_view, name='project_details'),
+        path('blogs/<int:pk>/', pages.blog_details_view, name='blog_details'),
+
+        # Crawlers: sitemap (an index of sitemap-<n>.xml shards past 50k URLs) and blog feed
+        path('sitemap.xml', feeds.sitemap_view, name='sitemap'),
+        path('sitemap-<int:section>.xml', feeds.sitemap_view, name='sitemap-section'),
+        path('feed.atom', feeds.atom_feed_view, name='atom-feed'),
+
+        # Orchestrator probes (normally answered by HealthCheckMiddleware)
+        path('healthz', health.healthz, name='healthz'),
+        path('readyz', health.readyz, name='readyz'),
+
+        # Read-only content API
+        path('api/v1/<slug:resource_name>/', api.collection_view, name='api-collection'),
+
+        # Admin Dashboard URLs
+        path('dashboard/', pages.admin_dashboard, name='admin-dashboard'),
+        path('dashboard/login/', views.admin_login, name='admin-login'),
+        path('dashboard/logout/', views.admin_logout, name='admin-logout'),
+        path('dashboard/projects/', views.manage_projects, name='manage-projects'),
+        path('dashboard/skills/', views.manage_skills, name='manage-skills'),
+        path('dashboard/blog/', views.manage_blog, name='manage-blog'),
+        path('dashboard/about/', views.manage_about, name='manage-about'),
+        path('dashboard/certifications/', views.manage_certifications, name='manage-certifications'),
+        path('dashboard/analytics/series/', views.analytics_series, name='analytics-series'),
+    ]
+
+
+# Under ASGI (PORTFOLIO_ASYNC_VIEWS) those come from async_views instead
+urlpatterns = build_urlpatterns(async_views if settings.PORTFOLIO_ASYNC_VIEWS else views)
@@ -1,6 +1,6 @@
-from django.shortcuts import render, redirect
-from django.http import HttpResponse 
-from django.core.mail import send_mail, BadHeaderError
+from django.shortcuts import render, redirect, get_object_or_404
+from django.core.mail import BadHeaderError
+from django.db import transaction
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 import json
@@ -14,29 +14,77 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
-from .models import Project, Skill, BlogPost, Certification, About
+from datetime import date, timedelta
+from .models import Project, Skill, BlogPost, Certification, About, PortfolioAnalytics
+from .stats import get_content_stats, portfolio_score
+from .caching import cached_public_page
+from .db import replica_reads
+from .outbox import enqueue_mail
+from .analytics import record_blog_view
+from . import search
+from .pagination import KeysetPaginator
+from .ratelimit import rate_limit
+from . import rollups
+
+# Rows per page for the keyset-paginated lists
+DASHBOARD_PAGE_SIZE = 25
+PUBLIC_PAGE_SIZE = 12
+# Public project order: the curated Project.Meta.ordering, pk breaking ties
+PROJECT_ORDERING = ['display_order', '-created_at', 'pk']
+# Longest range analytics_series accepts (monthly points beyond this aren't a chart)
+ANALYTICS_SERIES_MAX_DAYS = 366 * 50
+
+def public_projects_paginator():
+    """Pages of the public projects list (shared with async_views and render_static)."""
+    return KeysetPaginator(Project.objects.filter(is_active=True), PROJECT_ORDERING, per_page=PUBLIC_PAGE_SIZE)
+
+def public_posts_paginator():
+    """Pages of the public blog index (shared with async_views and render_static)."""
+    return KeysetPaginator(BlogPost.objects.filter(status='published'), ['-published_date'], per_page=PUBLIC_PAGE_SIZE)
 
 # --- Main Page Views ---
 
+@replica_reads
+@cached_public_page
 def home_view(request):
     """The main landing page view (Hero and teasers)."""
     # Later, you will fetch teaser data here.
     return render(request, 'portfolio/index.html')
 
+@replica_reads
+@cached_public_page
 def about_view(request):
     """The dedicated About Me and Skills page."""
     # Later, you can pass specific profile data here.
     return render(request, 'portfolio/about.html')
 
+@replica_reads
+@cached_public_page
 def projects_view(request):
     """The dedicated Projects list page."""
-    # Later, you will fetch all projects here.
-    return render(request, 'portfolio/projects.html')
+    # Rows are only fetched if the template iterates the page
+    page = public_projects_paginator().page(request.GET.get('cursor'))
+    return render(request, 'portfolio/projects.html', {'projects': page, 'page': page})
 
+@replica_reads
+@cached_public_page
 def blogs_view(request):
     """The dedicated Blogs index page."""
-    # Later, you will fetch blog previews here.
-    return render(request, 'portfolio/blogs.html')
+    # Rows are only fetched if the template iterates the page
+    page = public_posts_paginator().page(request.GET.get('cursor'))
+    return render(request, 'portfolio/blogs.html', {'posts': page, 'page': page})
+
+@replica_reads
+def search_view(request):
+    """Ranked, highlighted full-text search over blog posts and projects."""
+    query = request.GET.get('q', '').strip()[:200]
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 20)), 50))
+    except ValueError:
+        limit = 20
+
+    results = search.search(query, limit=limit) if query else []
+    return JsonResponse({'query': query, 'count': len(results), 'results': results})
 
 # def contact_view(request):
 #     """The dedicated Contact form page (handles GET and POST)."""
@@ -57,39 +105,42 @@ def blogs_view(request):
 
 # --- Detail Views (Placeholders) ---
 
+@replica_reads
 def project_details_view(request, pk):
     """Detail page for a specific project."""
-    # Logic to fetch project by PK
-    return render(request, 'portfolio/project_details.html', {'project_id': pk})
+    project = get_object_or_404(Project, pk=pk, is_active=True)
+    return render(request, 'portfolio/project_details.html', {'project_id': pk, 'project': project})
 
+@replica_reads
 def blog_details_view(request, pk):
     """Detail page for a specific blog post."""
-    # Logic to fetch blog post by PK
-    return HttpResponse(f"Blog Post Details for ID: {pk}") 
-    # Replace HttpResponse with render(request, 'portfolio/blog_details.html', ...) later
+    # The HTML was rendered from Markdown on save; the source isn't needed here
+    post = get_object_or_404(BlogPost.objects.defer('content'), pk=pk, status='published')
+    # Views are buffered and written in batches, never per request
+    if request.method == 'GET':
+        record_blog_view(pk)
+    return render(request, 'portfolio/blog_details.html', {'post': post})
     
 
-def contact_view(request):
-    if request.method == 'POST':
-        # Check if it's an AJAX request
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            try:
-                data = json.loads(request.body)
-                name = data.get('name')
-                email = data.get('email')
-                subject = data.get('subject')
-                message = data.get('message')
-                
-                # Validate required fields
-                if not all([name, email, subject, message]):
-                    return JsonResponse({
-                        'success': False,
-                        'message': 'Please fill in all required fields.'
-                    }, status=400)
-                
-                # Email to you (the site owner)
-                owner_subject = f"Portfolio Contact: {subject}"
-                owner_message = f"""
+def contact_submission(request):
+    """Validate an AJAX contact form post and queue its emails; returns the JSON response."""
+    try:
+        data = json.loads(request.body)
+        name = data.get('name')
+        email = data.get('email')
+        subject = data.get('subject')
+        message = data.get('message')
+        
+        # Validate required fields
+        if not all([name, email, subject, message]):
+            return JsonResponse({
+                'success': False,
+                'message': 'Please fill in all required fields.'
+            }, status=400)
+        
+        # Email to you (the site owner)
+        owner_subject = f"Portfolio Contact: {subject}"
+        owner_message = f"""
                 New contact form submission:
 
                 Name: {name}
@@ -102,18 +153,10 @@ def contact_view(request):
                 ---
                 Sent from your portfolio website.
                 """
-                
-                send_mail(
-                    owner_subject,
-                    owner_message,
-                    email,  
-                    ['jonasmwansa7@gmail.com'], 
-                    fail_silently=False,
-                )
-                
-                # Optional: Send confirmation email to the user
-                user_subject = "Thank you for contacting Jonas"
-                user_message = f"""
+        
+        # Optional: Send confirmation email to the user
+        user_subject = "Thank you for contacting Jonas"
+        user_message = f"""
                 Hi {name},
 
                 Thank you for reaching out! I've received your message and will get back to you as soon as possible.
@@ -129,30 +172,53 @@ def contact_view(request):
                 ---
                 This is an automated response.
                 """
-                
-                send_mail(
-                    user_subject,
-                    user_message,
-                    'noreply@jonasmwansa.dev',  # From email
-                    [email],  # User's email
-                    fail_silently=False,
-                )
-                
-                return JsonResponse({
-                    'success': True,
-                    'message': 'Your message has been sent successfully! I will get back to you soon.'
-                })
-                
-            except BadHeaderError:
-                return JsonResponse({
-                    'success': False,
-                    'message': 'Invalid header found. Please try again.'
-                }, status=400)
-            except Exception as e:
-                return JsonResponse({
-                    'success': False,
-                    'message': f'There was an error sending your message. Please try again later.'
-                }, status=500)
+        
+        # Queue both emails; the process_outbox worker delivers them
+        with transaction.atomic():
+            enqueue_mail(
+                owner_subject,
+                owner_message,
+                email,  
+                ['jonasmwansa7@gmail.com'], 
+            )
+            enqueue_mail(
+                user_subject,
+                user_message,
+                'noreply@jonasmwansa.dev',  # From email
+                [email],  # User's email
+            )
+            PortfolioAnalytics.increment(contact_form_submissions=1)
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Your message has been sent successfully! I will get back to you soon.'
+        })
+        
+    except BadHeaderError:
+        return JsonResponse({
+            'success': False,
+            'message': 'Invalid header found. Please try again.'
+        }, status=400)
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'There was an error sending your message. Please try again later.'
+        }, status=500)
+
+
+def contact_rate_limited(request):
+    return JsonResponse({
+        'success': False,
+        'message': 'Too many messages have been sent. Please try again later.'
+    })
+
+
+@rate_limit('contact', response=contact_rate_limited)
+def contact_view(request):
+    if request.method == 'POST':
+        # Check if it's an AJAX request
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return contact_submission(request)
         
         # Regular form submission (fallback)
         else:
@@ -166,6 +232,16 @@ def contact_view(request):
 # =============================================================================
 
 
+def login_rate_limited(request):
+    message = "Too many login attempts. Please wait a moment and try again."
+    if request.headers.get("X-Requested-With") == "XMLHttpRequest":
+        return JsonResponse({"status": "error", "message": message})
+    messages.error(request, message)
+    return render(request, "admin/login.html", {"next": request.POST.get("next", "")})
+
+
+# Throttled before authenticate(): every attempt costs a full password hash
+@rate_limit('admin-login', response=login_rate_limited)
 def admin_login(request):
     """Custom admin login with AJAX support"""
     if request.user.is_authenticated:
@@ -211,35 +287,16 @@ def admin_logout(request):
     messages.success(request, 'You have been logged out successfully.')
     return redirect('portfolio:home')
 
-@login_required
-def admin_dashboard(request):
-    """Admin dashboard overview with meaningful metrics"""
-    
-    # Basic counts
-    projects_count = Project.objects.count()
-    blog_count = BlogPost.objects.count()
-    skills_count = Skill.objects.count()
-    certifications_count = Certification.objects.count()
-    
-    # Initialize variables with default values
-    last_project = None
-    days_since_update = 999
-    last_update_date = timezone.now()
-    featured_projects_count = projects_count  # Fallback
-    skills_categories_count = 1  # Fallback
-    about_complete = False
-    skill_categories = []
-    
-    # Handle missing fields gracefully
-    try:
-        featured_projects_count = Project.objects.filter(is_featured=True).count()
-    except:
-        featured_projects_count = projects_count  # Fallback
-    
-    try:
-        skills_categories_count = Skill.objects.values('category').distinct().count()
-    except:
-        skills_categories_count = 1  # Fallback
+
+def dashboard_context(stats):
+    """Dashboard overview context from get_content_stats() figures; the querysets stay lazy."""
+    projects_count = stats['projects_count']
+    blog_count = stats['blog_count']
+    skills_count = stats['skills_count']
+    certifications_count = stats['certifications_count']
+    featured_projects_count = stats['featured_projects_count']
+    about_complete = stats['about_complete']
+    category_counts = stats['skill_category_counts']
     
     # Content health calculations
     total_sections = 5  # projects, blog, skills, certs, about
@@ -249,55 +306,26 @@ def admin_dashboard(request):
     if skills_count >= 1: completed_sections += 1
     if certifications_count >= 1: completed_sections += 1
     
-    # Check About completeness
-    try:
-        from .models import About  # Import here to avoid circular imports
-        about_exists = About.objects.exists()
-        if about_exists:
-            about = About.objects.first()
-            about_complete = about.is_complete
-        else:
-            about_complete = False
-    except:
-        about_complete = False
-    
     # Days since last update
-    try:
-        last_project = Project.objects.order_by('-updated_at').first()
-        if last_project:
-            days_since_update = (timezone.now() - last_project.updated_at).days
-            last_update_date = last_project.updated_at
-        else:
-            days_since_update = 999
-            last_update_date = timezone.now()
-    except:
+    last_update_date = stats['last_update']
+    if last_update_date:
+        days_since_update = (timezone.now() - last_update_date).days
+    else:
         days_since_update = 999
         last_update_date = timezone.now()
     
     # Skill categories with counts
     category_colors = ['#4361ee', '#4cc9f0', '#f72585', '#7209b7', '#3a0ca3', '#4361ee']
-    
-    try:
-        for i, (category_value, category_name) in enumerate(Skill.CATEGORY_CHOICES):
-            count = Skill.objects.filter(category=category_value).count()
-            if count > 0:
-                skill_categories.append({
-                    'name': category_name,
-                    'count': count,
-                    'color': category_colors[i % len(category_colors)]
-                })
-    except:
-        # If categories don't exist yet
-        skill_categories = []
-    
-    # Portfolio score (0-100)
-    portfolio_score = min(100, (
-        (min(projects_count, 5) / 5 * 25) +  # Projects weight: 25%
-        (min(blog_count, 3) / 3 * 20) +      # Blog weight: 20%
-        (min(skills_count, 10) / 10 * 20) +  # Skills weight: 20%
-        (min(certifications_count, 3) / 3 * 15) +  # Certs weight: 15%
-        (1 if about_complete else 0) * 20    # About weight: 20%
-    ))
+    skill_categories = []
+    for i, (category_value, category_name) in enumerate(Skill.CATEGORY_CHOICES):
+        count = category_counts.get(category_value, 0)
+        if count > 0:
+            skill_categories.append({
+                'name': category_name,
+                'count': count,
+                'color': category_colors[i % len(category_colors)]
+            })
+    skills_categories_count = len(skill_categories)
     
     # Get recent projects
     recent_projects = Project.objects.all().order_by('-updated_at')[:5]
@@ -319,42 +347,63 @@ def admin_dashboard(request):
         'skill_categories': skill_categories,
         'total_content_items': projects_count + blog_count + skills_count + certifications_count,
         'featured_items_count': featured_projects_count,
-        'portfolio_score': int(portfolio_score),
+        'portfolio_score': portfolio_score(stats),
         'last_update_date': last_update_date,
         
         # Recent activity
         'recent_projects': recent_projects,
         'recent_posts': BlogPost.objects.all().order_by('-published_date')[:3],
     }
-    return render(request, 'admin/dashboard.html', context)
+    return context
+
+
+@login_required
+def admin_dashboard(request):
+    """Admin dashboard overview with meaningful metrics"""
+    # All counts come from one query (or the ContentStats snapshot row)
+    return render(request, 'admin/dashboard.html', dashboard_context(get_content_stats()))
+
+
+@login_required
+def analytics_series(request):
+    """Page views, visitors, contacts and downloads over a date range, for dashboard charts."""
+    today = timezone.localdate()
+    try:
+        end = date.fromisoformat(request.GET['end']) if request.GET.get('end') else today
+        start = date.fromisoformat(request.GET['start']) if request.GET.get('start') else end - timedelta(days=29)
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'Dates must be YYYY-MM-DD.'}, status=400)
+    if start > end:
+        return JsonResponse({'success': False, 'message': 'start must not be after end.'}, status=400)
+    if (end - start).days > ANALYTICS_SERIES_MAX_DAYS:
+        return JsonResponse({'success': False, 'message': 'Date range is too long.'}, status=400)
+
+    return JsonResponse(rollups.time_series(start, end))
 
 
 @login_required
 def manage_projects(request):
     """Manage projects page"""
-    try:
-        projects = Project.objects.all().order_by('-created_at')
-    except:
-        projects = []
-    return render(request, 'admin/manage_projects.html', {'projects': projects})
+    page = KeysetPaginator(
+        Project.objects.all(), ['-created_at'], per_page=DASHBOARD_PAGE_SIZE
+    ).page(request.GET.get('cursor'))
+    return render(request, 'admin/manage_projects.html', {'projects': page, 'page': page})
 
 @login_required
 def manage_skills(request):
     """Manage skills page"""
-    try:
-        skills = Skill.objects.all().order_by('category', 'name')
-    except:
-        skills = []
-    return render(request, 'admin/manage_skills.html', {'skills': skills})
+    page = KeysetPaginator(
+        Skill.objects.all(), ['category', 'name'], per_page=DASHBOARD_PAGE_SIZE
+    ).page(request.GET.get('cursor'))
+    return render(request, 'admin/manage_skills.html', {'skills': page, 'page': page})
 
 @login_required
 def manage_blog(request):
     """Manage blog posts page"""
-    try:
-        posts = BlogPost.objects.all().order_by('-published_date')
-    except:
-        posts = []
-    return render(request, 'admin/manage_blog.html', {'posts': posts})
+    page = KeysetPaginator(
+        BlogPost.objects.all(), ['-published_date'], per_page=DASHBOARD_PAGE_SIZE
+    ).page(request.GET.get('cursor'))
+    return render(request, 'admin/manage_blog.html', {'posts': page, 'page': page})
 
 @login_required
 def manage_about(request):
@@ -364,9 +413,8 @@ def manage_about(request):
 @login_required
 def manage_certifications(request):
     """Manage certifications page"""
-    try:
-        certifications = Certification.objects.all().order_by('-issue_date')
-    except:
-        certifications = []
-    return render(request, 'admin/manage_certifications.html', {'certifications': certifications})
+    page = KeysetPaginator(
+        Certification.objects.all(), ['-issue_date'], per_page=DASHBOARD_PAGE_SIZE
+    ).page(request.GET.get('cursor'))
+    return render(request, 'admin/manage_certifications.html', {'certifications': page, 'page': page})
 
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolioproject.settings')
+# Serve the async versions of the public pages, contact and dashboard views
+os.environ.setdefault('PORTFOLIO_ASYNC_VIEWS', 'True')
 
 application = get_asgi_application()
@@ -21,27 +21,38 @@ INSTALLED_APPS = [
 
 # --- MIDDLEWARE ---
 MIDDLEWARE = [
+    # /healthz and /readyz are answered here, before host validation and sessions
+    'portfolio.health.HealthCheckMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'portfolio.instrumentation.InstrumentationMiddleware',
+    # Django's session, auth and messages middleware, skipped outside SESSION_PATH_PREFIXES
+    'portfolio.sessions.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'portfolio.sessions.AuthenticationMiddleware',
+    'portfolio.sessions.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'portfolio.analytics.PageViewMiddleware',
+    'portfolio.assets.PreloadLinkMiddleware',
 ]
 
 # WhiteNoise only in production
 if not DEBUG:
-    MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
+    MIDDLEWARE.insert(MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+                      'whitenoise.middleware.WhiteNoiseMiddleware')
 
-# --- URL & WSGI ---
+# --- URL & WSGI / ASGI ---
 ROOT_URLCONF = 'portfolioproject.urls'
 WSGI_APPLICATION = 'portfolioproject.wsgi.application'
+ASGI_APPLICATION = 'portfolioproject.asgi.application'
+# Route public pages, contact and the dashboard to portfolio.async_views (on by default in asgi.py)
+PORTFOLIO_ASYNC_VIEWS = config('PORTFOLIO_ASYNC_VIEWS', default=False, cast=bool)
 
 # --- TEMPLATES ---
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates plus per-request render timing (portfolio.instrumentation)
+        'BACKEND': 'portfolio.instrumentation.InstrumentedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -50,25 +61,100 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'portfolio.context_processors.site_settings',
             ],
         },
     },
 ]
 
 # --- DATABASE ---
+DB_ENGINE = config('DB_ENGINE', 'django.db.backends.sqlite3')
+if 'mysql' in DB_ENGINE:
+    DB_OPTIONS = {'init_command': "SET sql_mode='STRICT_TRANS_TABLES'"}
+elif 'sqlite' in DB_ENGINE:
+    # Take the write lock when a transaction starts, so under WAL a read that
+    # turns into a write waits for the lock instead of failing with "database is locked"
+    DB_OPTIONS = {'transaction_mode': 'IMMEDIATE'}
+else:
+    DB_OPTIONS = {}
 DATABASES = {
     'default': {
-        'ENGINE': config('DB_ENGINE', 'django.db.backends.sqlite3'),
+        'ENGINE': DB_ENGINE,
         'NAME': config('DB_NAME', BASE_DIR / 'db.sqlite3'),
         'USER': config('DB_USER', ''),
         'PASSWORD': config('DB_PASSWORD', ''),
         'HOST': config('DB_HOST', ''),
         'PORT': config('DB_PORT', ''),
-        'OPTIONS': {
-            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
-        } if 'mysql' in config('DB_ENGINE', '') else {},
+        # Keep connections open between requests, checked before reuse. Under ASGI
+        # each request may run in a new thread, so persistent connections would
+        # pile up: the default there is 0 (use the database's own pooling instead)
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=0 if PORTFOLIO_ASYNC_VIEWS else 60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': DB_OPTIONS,
+    }
+}
+# Optional read replica for the public pages (portfolio.db.ReplicaRouter); same
+# credentials as the primary unless overridden
+if config('DB_REPLICA_HOST', ''):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': config('DB_REPLICA_HOST'),
+        'PORT': config('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'USER': config('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': config('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['portfolio.db.ReplicaRouter']
+# Applied to every new SQLite connection (portfolio.db). WAL lets readers run alongside
+# a writer; NORMAL sync is durable across app crashes, only not across power loss.
+# WAL is recorded in the file itself, so the repository's own db.sqlite3 keeps its
+# rollback journal and stays unmodified; point DB_NAME at a data volume to get WAL
+SQLITE_JOURNAL_MODE = config('SQLITE_JOURNAL_MODE', default=(
+    'DELETE' if Path(DATABASES['default']['NAME']) == BASE_DIR / 'db.sqlite3' else 'WAL'
+))
+SQLITE_PRAGMAS = {
+    'journal_mode': SQLITE_JOURNAL_MODE,
+    'synchronous': 'NORMAL',
+    'mmap_size': config('SQLITE_MMAP_SIZE', default=128 * 1024 * 1024, cast=int),
+    'cache_size': -config('SQLITE_CACHE_KIB', default=32 * 1024, cast=int),  # negative: KiB, not pages
+    'temp_store': 'MEMORY',
+}
+# The partial "featured" indexes are SQLite-only; MySQL skips them (models.W037)
+# and falls back to the composite indexes. Check plans with `manage.py explain_queries`.
+SILENCED_SYSTEM_CHECKS = ['models.W037']
+
+# --- CACHE ---
+# Workers share page and fragment generations, SiteSettings version stamps and
+# rate-limit counters through the default cache, so outside DEBUG it defaults to
+# the database (table created by `python manage.py createcachetable`, which the
+# image runs on start). Redis or Memcached via CACHE_BACKEND/CACHE_LOCATION are faster
+CACHE_BACKEND = config('CACHE_BACKEND', (
+    'django.core.cache.backends.locmem.LocMemCache' if DEBUG
+    else 'django.core.cache.backends.db.DatabaseCache'
+))
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': config('CACHE_LOCATION', (
+            'portfolio_cache' if CACHE_BACKEND.endswith('DatabaseCache') else 'portfolio'
+        )),
     }
 }
+if CACHE_BACKEND.endswith('DatabaseCache'):
+    # Room for cached pages and fragments as well as rate-limit counters
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=10000, cast=int)}
+
+# --- SESSIONS ---
+# With Redis or Memcached, sessions are read from the cache and written through to
+# the database. A process-local or database cache would only add queries, so then
+# they are plain database sessions. 'django.contrib.sessions.backends.signed_cookies'
+# avoids the database entirely, but then logging out can't revoke a copied cookie
+SESSION_ENGINE = config('SESSION_ENGINE', (
+    'django.contrib.sessions.backends.db' if CACHE_BACKEND.endswith(('LocMemCache', 'DatabaseCache'))
+    else 'django.contrib.sessions.backends.cached_db'
+))
+# Only these paths load sessions, users and messages (portfolio.sessions)
+SESSION_PATH_PREFIXES = ['/dashboard/']
 
 # --- PASSWORD VALIDATORS ---
 AUTH_PASSWORD_VALIDATORS = [
@@ -92,11 +178,34 @@ STATICFILES_DIRS = [BASE_DIR / 'portfolio' / 'static']  # Dev static files
 STATIC_ROOT = BASE_DIR / 'staticfiles'                  # Collected static files
 MEDIA_ROOT = BASE_DIR / 'media'
 
-# Use WhiteNoise for production
-STATICFILES_STORAGE = (
-    'whitenoise.storage.CompressedManifestStaticFilesStorage' if not DEBUG 
-    else 'django.contrib.staticfiles.storage.StaticFilesStorage'
-)
+# Use WhiteNoise for production (fingerprinted names plus .gz/.br variants)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'whitenoise.storage.CompressedManifestStaticFilesStorage' if not DEBUG
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
+# Pre-rendered public pages (python manage.py render_static). With SERVE_STATIC_SITE
+# WhiteNoise serves them directly; it indexes the tree at startup, so restart after a build.
+STATIC_SITE_ROOT = BASE_DIR / 'build' / 'site'
+if config('SERVE_STATIC_SITE', default=False, cast=bool):
+    WHITENOISE_ROOT = STATIC_SITE_ROOT
+    WHITENOISE_INDEX_FILE = True
+
+# CSS/JS bundles built into portfolio/static/bundles/ by `python manage.py build_assets`
+ASSET_BUNDLES = {
+    'public.css': ['css/style.css'],
+    'public.js': ['js/main.js'],
+    'dashboard.css': ['css/dashboard.css'],
+    'dashboard.js': ['js/dashboard.js'],
+}
+ASSET_BUNDLES_ENABLED = config('ASSET_BUNDLES_ENABLED', default=not DEBUG, cast=bool)
 
 # --- SECURITY / HOSTS ---
 ALLOWED_HOSTS = [
@@ -114,6 +223,77 @@ EMAIL_USE_TLS = config('EMAIL_USE_TLS', 'True').lower() == 'true'
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER)
+# Seconds per SMTP operation; also sizes the outbox worker's lease on a batch
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=30, cast=int)
+
+# Outbox worker (python manage.py process_outbox)
+OUTBOX_MAX_ATTEMPTS = config('OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+OUTBOX_RETRY_BASE_SECONDS = config('OUTBOX_RETRY_BASE_SECONDS', default=30, cast=int)
+OUTBOX_RETRY_MAX_SECONDS = config('OUTBOX_RETRY_MAX_SECONDS', default=3600, cast=int)
+
+# --- PORTFOLIO ---
+# Serve dashboard stats from the signal-maintained ContentStats row
+PORTFOLIO_STATS_SNAPSHOT = config('PORTFOLIO_STATS_SNAPSHOT', default=True, cast=bool)
+# Rendered public pages are keyed on content freshness; this only bounds memory
+PORTFOLIO_PAGE_CACHE_TIMEOUT = config('PORTFOLIO_PAGE_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+# Default lifetime of {% cachedfragment %} blocks; edits invalidate them regardless
+PORTFOLIO_FRAGMENT_CACHE_TIMEOUT = config('PORTFOLIO_FRAGMENT_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+# Seconds a worker serves its in-memory SiteSettings before re-checking the shared version stamp
+SITE_SETTINGS_CHECK_INTERVAL = config('SITE_SETTINGS_CHECK_INTERVAL', default=5, cast=float)
+
+# Token buckets for expensive POSTs (portfolio.ratelimit), per client IP and per
+# route, as "<tokens>/<period>": logins hash a password, contact posts send two emails
+RATE_LIMIT_ENABLED = config('RATE_LIMIT_ENABLED', default=True, cast=bool)
+RATE_LIMITS = {
+    'admin-login': {'ip': '10/5m', 'route': '60/m'},
+    'contact': {'ip': '5/h', 'route': '60/h'},
+}
+# Proxies in front of the app that append to X-Forwarded-For (0: use REMOTE_ADDR;
+# production defaults to 1, below)
+RATE_LIMIT_PROXY_COUNT = config('RATE_LIMIT_PROXY_COUNT', default=0, cast=int)
+
+# URLs per sitemap.xml before it becomes an index of shards (the protocol allows 50,000)
+SITEMAP_MAX_URLS = config('SITEMAP_MAX_URLS', default=50000, cast=int)
+
+# Page views are buffered per worker and flushed on whichever threshold hits first
+ANALYTICS_FLUSH_SIZE = config('ANALYTICS_FLUSH_SIZE', default=100, cast=int)
+ANALYTICS_FLUSH_INTERVAL = config('ANALYTICS_FLUSH_INTERVAL', default=30, cast=int)
+ANALYTICS_EXCLUDED_PREFIXES = ['/static/', '/media/', '/dashboard/', '/api/', '/search/', '/favicon.ico',
+                               '/sitemap', '/feed.atom']
+# Dashboard charts switch from daily to weekly to monthly rollups to stay under this many points
+ANALYTICS_SERIES_MAX_POINTS = config('ANALYTICS_SERIES_MAX_POINTS', default=62, cast=int)
+
+# Responsive derivatives generated for uploaded images (python manage.py build_image_derivatives)
+IMAGE_DERIVATIVE_WIDTHS = [320, 640, 960, 1280, 1920]
+IMAGE_DERIVATIVE_QUALITY = config('IMAGE_DERIVATIVE_QUALITY', default=80, cast=int)
+# Build them in a background thread after the save commits (False: inline, after commit)
+IMAGE_DERIVATIVES_IN_BACKGROUND = config('IMAGE_DERIVATIVES_IN_BACKGROUND', default=True, cast=bool)
+
+# Per-request Server-Timing header and JSON log line (portfolio.instrumentation)
+INSTRUMENTATION_ENABLED = config('INSTRUMENTATION_ENABLED', default=True, cast=bool)
+INSTRUMENTATION_SERVER_TIMING = config('INSTRUMENTATION_SERVER_TIMING', default=True, cast=bool)
+# Profiling is opt-in: sampled, or per request with ?_profile=<python manage.py profile_token>
+INSTRUMENTATION_PROFILING = config('INSTRUMENTATION_PROFILING', default=False, cast=bool)
+INSTRUMENTATION_PROFILE_SAMPLE_RATE = config('INSTRUMENTATION_PROFILE_SAMPLE_RATE', default=0.0, cast=float)
+INSTRUMENTATION_PROFILER = config('INSTRUMENTATION_PROFILER', default='cprofile')  # or 'pyinstrument'
+INSTRUMENTATION_PROFILE_DIR = config('INSTRUMENTATION_PROFILE_DIR', default=str(BASE_DIR / 'profiles'))
+INSTRUMENTATION_PROFILE_TOKEN_MAX_AGE = config('INSTRUMENTATION_PROFILE_TOKEN_MAX_AGE', default=60 * 60, cast=int)
+
+# --- LOGGING ---
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'portfolio.instrumentation': {
+            'handlers': ['console'],
+            'level': config('INSTRUMENTATION_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
 
 # --- DEFAULTS ---
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -124,6 +304,8 @@ if not DEBUG:
     SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
+    # Behind the platform's load balancer, which appends the client to X-Forwarded-For
+    RATE_LIMIT_PROXY_COUNT = config('RATE_LIMIT_PROXY_COUNT', default=1, cast=int)
 
 if DEBUG:
     from django.conf.urls.static import static